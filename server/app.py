@@ -14,8 +14,11 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# "threading" for the Werkzeug dev server; serve.py uses "gevent"
+SOCKETIO_ASYNC_MODE = os.getenv("SOCKETIO_ASYNC_MODE", "threading")
 
-def create_app() -> Flask:
+
+def create_app(async_mode: str = SOCKETIO_ASYNC_MODE) -> Flask:
     app = Flask(__name__)
     CORS(app)
 
@@ -75,7 +78,7 @@ def create_app() -> Flask:
     setup_auth_routes(app, auth0)
 
     # Setup SocketIO
-    socketio = SocketIO(app, cors_allowed_origins="*", async_mode="threading")
+    socketio = SocketIO(app, cors_allowed_origins="*", async_mode=async_mode)
     setup_socketio(app, socketio)
 
     # Store socketio instance on app for access in other modules
@@ -88,4 +91,4 @@ if __name__ == "__main__":
     app = create_app()
     app.socketio.run(
         app, debug=True, host="0.0.0.0", port=5000, allow_unsafe_werkzeug=True
-    )  # nosec B201 - Development only
+    )  # nosec B201 - Development only; use serve.py in production
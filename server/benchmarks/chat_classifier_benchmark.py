@@ -0,0 +1,117 @@
+"""Measure chat classification throughput on a synthetic chat corpus.
+
+Usage (from the server directory):
+    python -m benchmarks.chat_classifier_benchmark --messages 50000
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from client.chat_classifier import ChatClassifier
+
+CHAT_LINES = [
+    "Hello!",
+    "How are you?",
+    "Great stream!",
+    "What time is it?",
+    "You look amazing!",
+    "😍",
+    "Thanks for the show!",
+    "Keep up the good work!",
+    "When is the next stream?",
+    "Love your content!",
+    "hey everyone, first time here",
+    "lol that was so funny",
+    "!tip 50",
+    "can you say hi to my friend?",
+    "this song is a vibe",
+]
+SPAM_LINES = [
+    "FREE TOKENS at http://spam.example http://spam.example http://spam.example",
+    "follow follow follow follow follow follow follow follow",
+    "check out my cam-site.example profile",
+]
+
+
+def build_corpus(messages: int, seed: int) -> List[str]:
+    """Build a chat corpus with roughly 5% spam."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(messages):
+        if rng.random() < 0.05:
+            corpus.append(rng.choice(SPAM_LINES))
+        else:
+            corpus.append(" ".join(rng.choices(CHAT_LINES, k=rng.randint(1, 3))))
+    return corpus
+
+
+def build_blocklist(terms: int, seed: int) -> List[str]:
+    """Build a blocklist of made-up terms plus the spam phrases above."""
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    blocklist = ["free tokens", "cam-site.example"]
+    while len(blocklist) < terms:
+        blocklist.append("".join(rng.choices(alphabet, k=rng.randint(6, 12))))
+    return blocklist
+
+
+def legacy_classify(message: str, blocklist: List[str]) -> bool:
+    """The original per-message checks, extended with a naive blocklist scan."""
+    lowered = message.lower()
+    spam = (
+        len(message) > 500
+        or message.count("http") > 2
+        or len(set(message.lower().split())) < len(message.split()) * 0.3
+        or any(term in lowered for term in blocklist)
+    )
+    if not spam and not message.startswith("!"):
+        any(word in message.lower() for word in ["hello", "hi", "hey"])
+    return spam
+
+
+def measure(corpus: List[str], run: Callable[[List[str]], None]) -> float:
+    start = time.perf_counter()
+    run(corpus)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50_000)
+    parser.add_argument("--blocklist", type=int, default=2_000)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.messages, args.seed)
+    blocklist = build_blocklist(args.blocklist, args.seed)
+    classifier = ChatClassifier(blocklist=blocklist)
+
+    def batched(messages: List[str]) -> None:
+        for start in range(0, len(messages), args.batch):
+            classifier.classify_batch(messages[start : start + args.batch])
+
+    results = [
+        (
+            f"legacy checks + {len(blocklist)}-term scan",
+            measure(
+                corpus,
+                lambda messages: [legacy_classify(m, blocklist) for m in messages],
+            ),
+        ),
+        (
+            "ChatClassifier.classify",
+            measure(
+                corpus, lambda messages: [classifier.classify(m) for m in messages]
+            ),
+        ),
+        (f"ChatClassifier.classify_batch ({args.batch})", measure(corpus, batched)),
+    ]
+    for name, rate in results:
+        print(f"{name:<44} {rate:>12,.0f} messages/sec")
+
+
+if __name__ == "__main__":
+    main()
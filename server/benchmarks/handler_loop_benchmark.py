@@ -0,0 +1,85 @@
+"""Compare per-event thread/loop dispatch with the shared HandlerLoop.
+
+Usage (from the server directory):
+    python -m benchmarks.handler_loop_benchmark --events 5000
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from typing import Callable, List
+
+from client.handler_loop import HandlerLoop
+
+
+async def simulated_handler(counter: List[int]) -> None:
+    """Stand-in for a handler: yield once, then do a little work."""
+    await asyncio.sleep(0)
+    counter[0] += 1
+
+
+def run_thread_per_event(events: int) -> float:
+    """Legacy dispatch: a new thread and event loop for every event."""
+    counter = [0]
+    threads = []
+
+    def run(coro):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    start = time.perf_counter()
+    for _ in range(events):
+        thread = threading.Thread(
+            target=run, args=(simulated_handler(counter),), daemon=True
+        )
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    assert counter[0] == events
+    return events / elapsed
+
+
+def run_handler_loop(events: int, rooms: int = 1) -> float:
+    """Shared dispatch: one long-lived loop with per-room ordering."""
+    counter = [0]
+    handler_loop = HandlerLoop(max_pending=1000)
+    handler_loop.start()
+
+    start = time.perf_counter()
+    for index in range(events):
+        handler_loop.submit(simulated_handler(counter), room=f"room-{index % rooms}")
+    handler_loop.stop(drain=True, timeout=60.0)
+    elapsed = time.perf_counter() - start
+
+    assert counter[0] == events
+    return events / elapsed
+
+
+def report(name: str, runner: Callable[[], float]) -> None:
+    print(f"{name:<32} {runner():>12,.0f} events/sec")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--rooms", type=int, default=4)
+    args = parser.parse_args()
+
+    report("thread + loop per event", lambda: run_thread_per_event(args.events))
+    report("HandlerLoop (1 room)", lambda: run_handler_loop(args.events))
+    report(
+        f"HandlerLoop ({args.rooms} rooms)",
+        lambda: run_handler_loop(args.events, args.rooms),
+    )
+
+
+if __name__ == "__main__":
+    main()
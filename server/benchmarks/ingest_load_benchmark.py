@@ -0,0 +1,129 @@
+r"""Drive synthetic Chaturbate events through the ingest path and report capacity.
+
+Usage (from the server directory):
+    python -m benchmarks.ingest_load_benchmark --rate 20000 --duration 10 \
+        --sink pipeline
+    python -m benchmarks.ingest_load_benchmark --rate 5000 --burst-interval 5 \
+        --burst-multiplier 4
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from typing import Any, Optional
+
+from client.chaturbate_client_event_handler import ChaturbateClientEventHandler
+from client.load_generator import (
+    LoadGenerator,
+    LoadProfile,
+    EventSink,
+    handler_sink,
+    noop_sink,
+)
+from services.message_search_index import MessageSearchIndex
+
+
+class NullSocketIO:
+    """Stand-in for Flask-SocketIO that discards emits."""
+
+    def emit(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+class InfluxStandIn:
+    """Local stand-in for InfluxDBClient that serialises and counts writes.
+
+    Points are rendered to line protocol, so the client-side cost of a write
+    is measured without a database.
+    """
+
+    bucket = "replay"
+    org = "replay"
+
+    def __init__(self) -> None:
+        self.points = 0
+        self.bytes = 0
+
+    @property
+    def write_api(self) -> "InfluxStandIn":
+        return self
+
+    def write(self, bucket: str, org: str, record: Any) -> None:
+        self.points += 1
+        self.bytes += len(record.to_line_protocol())
+
+
+def build_sink(name: str, influx: Optional[InfluxStandIn] = None) -> EventSink:
+    """Build the sink selected on the command line.
+
+    The pipeline sink writes to ``influx`` (a fresh stand-in by default)
+    instead of a real InfluxDB, and indexes into an in-memory search index
+    instead of the server's saved one.
+    """
+    if name == "noop":
+        return noop_sink
+    if name == "handler":
+        return handler_sink(ChaturbateClientEventHandler(enable_logging=False))
+
+    # Full socket pipeline: validate, dedup, enrich, persist, broadcast
+    from routes.chaturbate_route import WebSocketEventHandler
+
+    handler = WebSocketEventHandler(
+        NullSocketIO(), search_index=MessageSearchIndex(path=None)
+    )
+    handler.influx_client = influx or InfluxStandIn()
+    return handler_sink(handler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=10_000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--events", type=int, default=None)
+    parser.add_argument(
+        "--sink", choices=("noop", "handler", "pipeline"), default="pipeline"
+    )
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument(
+        "--mix",
+        default="tip=70,chatMessage=29,privateMessage=1",
+        help="Comma-separated method=weight pairs",
+    )
+    parser.add_argument("--burst-interval", type=float, default=0.0)
+    parser.add_argument("--burst-duration", type=float, default=1.0)
+    parser.add_argument("--burst-multiplier", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    # Per-event handler logging would dominate the measurement
+    logging.disable(logging.WARNING)
+
+    mix = {
+        method: float(weight)
+        for method, weight in (pair.split("=") for pair in args.mix.split(","))
+    }
+    profile = LoadProfile(
+        rate=args.rate,
+        mix=mix,
+        users=args.users,
+        zipf_exponent=args.zipf,
+        burst_interval=args.burst_interval,
+        burst_duration=args.burst_duration,
+        burst_multiplier=args.burst_multiplier,
+        seed=args.seed,
+    )
+    generator = LoadGenerator(profile)
+    report = asyncio.run(
+        generator.run(
+            build_sink(args.sink),
+            events=args.events,
+            duration=None if args.events else args.duration,
+        )
+    )
+    print(json.dumps({"sink": args.sink, **report.to_dict()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
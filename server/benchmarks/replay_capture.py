@@ -0,0 +1,55 @@
+r"""Replay a captured event log through the ingest path.
+
+Capture a log by starting the server with CHATURBATE_CAPTURE_PATH set, then
+(from the server directory):
+    python -m benchmarks.replay_capture data/capture.ndjson.gz --speed 10
+    python -m benchmarks.replay_capture data/capture.ndjson.gz --speed max \
+        --sink handler
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+
+from benchmarks.ingest_load_benchmark import InfluxStandIn, build_sink
+from client.event_capture import replay_capture
+
+
+def parse_speed(value: str) -> float:
+    """Parse "1", "10", "2.5" or "max" (as fast as possible)."""
+    return 0.0 if value == "max" else float(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--speed", type=parse_speed, default=1.0)
+    parser.add_argument(
+        "--sink", choices=("noop", "handler", "pipeline"), default="pipeline"
+    )
+    args = parser.parse_args()
+
+    # Per-event handler logging would dominate the measurement
+    logging.disable(logging.WARNING)
+
+    influx = InfluxStandIn()
+    report = asyncio.run(
+        replay_capture(args.path, build_sink(args.sink, influx), speed=args.speed)
+    )
+    print(
+        json.dumps(
+            {
+                "sink": args.sink,
+                "speed": args.speed or "max",
+                **report.to_dict(),
+                "influx_points": influx.points,
+                "influx_bytes": influx.bytes,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Open thousands of concurrent /chaturbate connections against a running server.
+
+Start the server with ``python serve.py`` (and a raised ``ulimit -n`` on the
+client side), then (from the server directory):
+    python -m benchmarks.socket_connections_benchmark --clients 5000 --hold 30
+    python -m benchmarks.socket_connections_benchmark --url http://localhost:5000 \
+        --clients 2000 --ramp 200 --batch
+
+Each client connects over WebSocket, waits for its connection status and
+then counts the events it receives while every connection is held open. The
+demo generator starts with the first connection, so every client should see
+the same trickle of events. Requires python-socketio's asyncio client,
+which runs on aiohttp (``pip install python-socketio aiohttp``).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import socketio
+
+from client.handler_pipeline import LatencyHistogram
+
+
+class BenchmarkClient:
+    """One /chaturbate connection and what it received."""
+
+    def __init__(self, url: str, batch: bool) -> None:
+        self.url = url
+        self.auth = {"batch": True} if batch else {}
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.connected = asyncio.Event()
+        self.events = 0
+        self.delivery = LatencyHistogram()
+        self.error: Optional[str] = None
+
+        self.sio.on("connection_status", self._on_status, namespace="/chaturbate")
+        self.sio.on("chaturbate_event", self._on_event, namespace="/chaturbate")
+        self.sio.on("chaturbate_events", self._on_events, namespace="/chaturbate")
+
+    async def _on_status(self, data: Dict[str, Any]) -> None:
+        self.connected.set()
+
+    async def _on_event(self, data: Dict[str, Any]) -> None:
+        self.events += 1
+        timestamp = data.get("timestamp")
+        if timestamp:
+            self.delivery.observe(max(time.time() - timestamp, 0.0))
+
+    async def _on_events(self, frame: List[Dict[str, Any]]) -> None:
+        for data in frame:
+            await self._on_event(data)
+
+    async def connect(self, timeout: float) -> float:
+        """Connect and wait for the status message; returns the seconds taken."""
+        started = time.perf_counter()
+        try:
+            await self.sio.connect(
+                self.url,
+                namespaces=["/chaturbate"],
+                transports=["websocket"],
+                auth=self.auth,
+                wait_timeout=timeout,
+            )
+            await asyncio.wait_for(self.connected.wait(), timeout)
+        except Exception as e:
+            self.error = type(e).__name__
+        return time.perf_counter() - started
+
+    async def close(self) -> None:
+        if self.sio.connected:
+            await self.sio.disconnect()
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    clients = [BenchmarkClient(args.url, args.batch) for _ in range(args.clients)]
+    connect_latency = LatencyHistogram()
+
+    started = time.perf_counter()
+    for offset in range(0, len(clients), args.ramp):
+        wave = clients[offset : offset + args.ramp]
+        for seconds in await asyncio.gather(
+            *(client.connect(args.timeout) for client in wave)
+        ):
+            connect_latency.observe(seconds)
+        logging.info(f"{offset + len(wave)} / {len(clients)} connections attempted")
+    ramp_seconds = time.perf_counter() - started
+
+    connected = [client for client in clients if client.error is None]
+    await asyncio.sleep(args.hold)
+    still_connected = sum(1 for client in connected if client.sio.connected)
+
+    delivery = LatencyHistogram()
+    for client in connected:
+        delivery.merge(client.delivery)
+    received = [client.events for client in connected]
+    errors: Dict[str, int] = {}
+    for client in clients:
+        if client.error:
+            errors[client.error] = errors.get(client.error, 0) + 1
+
+    await asyncio.gather(*(client.close() for client in clients))
+    return {
+        "clients": len(clients),
+        "connected": len(connected),
+        "still_connected_after_hold": still_connected,
+        "errors": errors,
+        "ramp_seconds": round(ramp_seconds, 2),
+        "connect": connect_latency.to_dict(),
+        "events_per_client": {
+            "min": min(received, default=0),
+            "max": max(received, default=0),
+            "mean": round(sum(received) / len(received), 2) if received else 0.0,
+        },
+        "delivery": delivery.to_dict(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--ramp", type=int, default=250, help="connections per wave")
+    parser.add_argument("--hold", type=float, default=20.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--batch", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
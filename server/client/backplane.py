@@ -0,0 +1,250 @@
+import itertools
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, Any]
+MessageCallback = Callable[[Message], None]
+
+# Hash holding the state each worker reports
+WORKER_STATE_KEY = "chaturbate:workers"
+# Counter numbering the messages of publish_numbered across workers
+SEQUENCE_KEY = "chaturbate:seq"
+
+# Numbers and publishes in one atomic step, so every subscriber receives the
+# numbers in ascending order whichever worker published them
+_PUBLISH_NUMBERED_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+redis.call('PUBLISH', ARGV[1], '{"seq":' .. seq .. ',' .. string.sub(ARGV[2], 2))
+return seq
+"""
+
+
+class Backplane(ABC):
+    """Pub/sub and shared state connecting the server's worker processes.
+
+    Messages are JSON-compatible dictionaries published on named channels;
+    every subscriber of a channel, in every process, receives each message
+    in publish order. ``publish_numbered`` stamps messages with a sequence
+    number drawn from one counter shared by every worker. Workers also
+    report a small state dictionary under their ID, which any worker can
+    read; states not refreshed within ``state_ttl`` seconds are treated as
+    gone.
+
+    Attributes:
+        state_ttl: Seconds after which an unrefreshed worker state expires
+        stats: Counters for published and received messages and callback
+            errors
+    """
+
+    def __init__(self, state_ttl: float = 15.0) -> None:
+        self.state_ttl = state_ttl
+        self._subscribers: Dict[str, List[MessageCallback]] = {}
+        self.stats: Dict[str, int] = {"published": 0, "received": 0, "errors": 0}
+
+    def subscribe(self, channel: str, callback: MessageCallback) -> None:
+        """Call ``callback`` with every message published on ``channel``.
+
+        Subscribe before ``start``; callbacks of remote backplanes run on the
+        backplane's listener thread.
+        """
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    def _dispatch(self, channel: str, message: Message) -> None:
+        self.stats["received"] += 1
+        for callback in self._subscribers.get(channel, ()):
+            try:
+                callback(message)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Backplane subscriber on '{channel}' failed: {e}")
+
+    def start(self) -> None:
+        """Start delivering messages to subscribers."""
+
+    def close(self) -> None:
+        """Stop delivering messages and release connections."""
+
+    @abstractmethod
+    def publish(self, channel: str, message: Message) -> None:
+        """Publish a message to every subscriber of a channel."""
+
+    @abstractmethod
+    def publish_numbered(self, channel: str, message: Message) -> int:
+        """Publish a message stamped with the next shared sequence number.
+
+        The number is stored under the message's ``seq`` key. Numbers are
+        assigned in publish order, so subscribers see them ascending.
+
+        Args:
+            channel: The channel to publish on
+            message: A non-empty message without a ``seq`` key
+
+        Returns:
+            The message's sequence number
+        """
+
+    @abstractmethod
+    def _write_state(self, worker_id: str, encoded: str) -> None:
+        """Store a worker's encoded state."""
+
+    @abstractmethod
+    def _read_states(self) -> Dict[str, str]:
+        """Get every worker's encoded state."""
+
+    @abstractmethod
+    def delete_state(self, worker_id: str) -> None:
+        """Remove a worker's state, e.g. on shutdown."""
+
+    def set_state(self, worker_id: str, state: Dict[str, Any]) -> None:
+        """Report a worker's state, stamped with the current time."""
+        self._write_state(worker_id, json.dumps({**state, "updated_at": time.time()}))
+
+    def get_states(self) -> Dict[str, Dict[str, Any]]:
+        """Get the unexpired state of every worker, by worker ID."""
+        oldest = time.time() - self.state_ttl
+        states = {}
+        for worker_id, encoded in self._read_states().items():
+            state = json.loads(encoded)
+            if state.get("updated_at", 0) >= oldest:
+                states[worker_id] = state
+        return states
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get message counters and the backplane type."""
+        return {"type": type(self).__name__, **self.stats}
+
+
+class LocalBackplane(Backplane):
+    """In-process backplane for a single worker and for tests.
+
+    ``publish`` calls the subscribers synchronously with the message object
+    itself, so a single-process server pays nothing for the indirection.
+    """
+
+    def __init__(self, state_ttl: float = 15.0) -> None:
+        super().__init__(state_ttl)
+        self._states: Dict[str, str] = {}
+        self._seq = itertools.count(1)
+        self._publish_lock = threading.RLock()
+
+    def publish(self, channel: str, message: Message) -> None:
+        self.stats["published"] += 1
+        self._dispatch(channel, message)
+
+    def publish_numbered(self, channel: str, message: Message) -> int:
+        with self._publish_lock:
+            message["seq"] = seq = next(self._seq)
+            self.publish(channel, message)
+        return seq
+
+    def _write_state(self, worker_id: str, encoded: str) -> None:
+        self._states[worker_id] = encoded
+
+    def _read_states(self) -> Dict[str, str]:
+        return dict(self._states)
+
+    def delete_state(self, worker_id: str) -> None:
+        self._states.pop(worker_id, None)
+
+
+class RedisBackplane(Backplane):
+    """Backplane over a Redis-compatible server (Redis, Valkey, KeyDB...).
+
+    Channels map to Redis pub/sub channels carrying JSON, and worker states
+    live in one hash. Subscribed messages are dispatched from a listener
+    thread started by ``start``. Requires the optional ``redis`` package.
+    """
+
+    def __init__(self, url: str, state_ttl: float = 15.0) -> None:
+        """Connect to the server.
+
+        Args:
+            url: Connection URL, e.g. redis://localhost:6379/0
+            state_ttl: Seconds after which an unrefreshed worker state expires
+
+        Raises:
+            ImportError: If the redis package is not installed
+        """
+        super().__init__(state_ttl)
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError(
+                "The redis package is required for a redis:// backplane"
+            ) from e
+
+        self.url = url
+        self._redis = redis.Redis.from_url(url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._publish_numbered = self._redis.register_script(_PUBLISH_NUMBERED_SCRIPT)
+        self._listener: Optional[threading.Thread] = None
+
+    def subscribe(self, channel: str, callback: MessageCallback) -> None:
+        if channel not in self._subscribers:
+            self._pubsub.subscribe(**{channel: self._on_message})
+        super().subscribe(channel, callback)
+
+    def _on_message(self, raw: Dict[str, Any]) -> None:
+        channel = raw["channel"]
+        if isinstance(channel, bytes):
+            channel = channel.decode("utf-8")
+        self._dispatch(channel, json.loads(raw["data"]))
+
+    def start(self) -> None:
+        if self._listener is None and self._subscribers:
+            self._listener = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def close(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        self._pubsub.close()
+        self._redis.close()
+
+    def publish(self, channel: str, message: Message) -> None:
+        self._redis.publish(channel, json.dumps(message, separators=(",", ":")))
+        self.stats["published"] += 1
+
+    def publish_numbered(self, channel: str, message: Message) -> int:
+        encoded = json.dumps(message, separators=(",", ":"))
+        seq = self._publish_numbered(keys=[SEQUENCE_KEY], args=[channel, encoded])
+        self.stats["published"] += 1
+        return int(seq)
+
+    def _write_state(self, worker_id: str, encoded: str) -> None:
+        self._redis.hset(WORKER_STATE_KEY, worker_id, encoded)
+
+    def _read_states(self) -> Dict[str, str]:
+        return {
+            key.decode("utf-8"): value.decode("utf-8")
+            for key, value in self._redis.hgetall(WORKER_STATE_KEY).items()
+        }
+
+    def delete_state(self, worker_id: str) -> None:
+        self._redis.hdel(WORKER_STATE_KEY, worker_id)
+
+
+def create_backplane(url: Optional[str] = None) -> Backplane:
+    """Create the backplane for a URL.
+
+    Args:
+        url: redis:// or rediss:// for a shared server; None, "" or
+            "local://" for an in-process backplane
+
+    Returns:
+        The backplane
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    if not url or url.startswith("local://"):
+        return LocalBackplane()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackplane(url)
+    raise ValueError(f"Unsupported backplane URL '{url}'")
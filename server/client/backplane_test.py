@@ -0,0 +1,81 @@
+import pytest
+
+from server.client import backplane as backplane_module
+from server.client.backplane import LocalBackplane, RedisBackplane, create_backplane
+
+
+def test_local_backplane_delivers_to_channel_subscribers():
+    backplane = LocalBackplane()
+    events, control = [], []
+    backplane.subscribe("events", events.append)
+    backplane.subscribe("control", control.append)
+
+    message = {"name": "chaturbate_event", "payload": {"seq": 1}}
+    backplane.publish("events", message)
+
+    assert events == [message]
+    assert control == []
+    assert backplane.get_stats() == {
+        "type": "LocalBackplane",
+        "published": 1,
+        "received": 1,
+        "errors": 0,
+    }
+
+
+def test_numbered_messages_share_one_ascending_counter():
+    backplane = LocalBackplane()
+    received = []
+    backplane.subscribe("events", received.append)
+
+    assert backplane.publish_numbered("events", {"name": "a"}) == 1
+    backplane.publish("events", {"name": "unnumbered"})
+    assert backplane.publish_numbered("events", {"name": "b"}) == 2
+
+    assert [m.get("seq") for m in received] == [1, None, 2]
+
+
+def test_failing_subscriber_does_not_stop_the_others():
+    backplane = LocalBackplane()
+    received = []
+
+    def fail(message):
+        raise RuntimeError("boom")
+
+    backplane.subscribe("events", fail)
+    backplane.subscribe("events", received.append)
+    backplane.publish("events", {"n": 1})
+
+    assert received == [{"n": 1}]
+    assert backplane.stats["errors"] == 1
+
+
+def test_worker_states_expire_unless_refreshed(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(backplane_module.time, "time", lambda: now[0])
+    backplane = LocalBackplane(state_ttl=10)
+    backplane.set_state("a", {"connected_clients": 2})
+    now[0] += 8
+    backplane.set_state("b", {"connected_clients": 3})
+    now[0] += 5
+
+    states = backplane.get_states()
+    assert list(states) == ["b"]
+    assert states["b"]["connected_clients"] == 3
+
+    backplane.delete_state("b")
+    assert backplane.get_states() == {}
+
+
+def test_create_backplane_picks_the_implementation_by_url():
+    assert isinstance(create_backplane(None), LocalBackplane)
+    assert isinstance(create_backplane("local://"), LocalBackplane)
+    with pytest.raises(ValueError):
+        create_backplane("amqp://localhost")
+
+
+def test_redis_urls_create_a_redis_backplane():
+    pytest.importorskip("redis")
+    backplane = create_backplane("redis://localhost:6379/0")
+    assert isinstance(backplane, RedisBackplane)
+    backplane.close()
@@ -0,0 +1,267 @@
+import logging
+import os
+import re
+import threading
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GREETINGS: Tuple[str, ...] = ("hello", "hi", "hey")
+
+_URL_RE = re.compile(r"https?://|www\.", re.IGNORECASE)
+_WORD_RE = re.compile(r"\S+")
+# Never part of a chat message, so batched matches cannot span two messages
+_BATCH_SEPARATOR = "\x00"
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton for finding many keywords in one pass.
+
+    Matching costs O(len(text) + matches) regardless of how many keywords
+    are loaded, so blocklists with thousands of terms are as cheap to apply
+    as a handful. Keywords and text are compared as given; callers lowercase
+    both for case-insensitive matching.
+
+    Attributes:
+        keywords: The loaded keywords, indexed by match results
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        """Build the automaton.
+
+        Args:
+            keywords: Keywords to search for (empty strings are ignored)
+        """
+        self.keywords: List[str] = list(dict.fromkeys(k for k in keywords if k))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] += (index,)
+
+        # Breadth-first: fail links point at the longest proper suffix state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Find every keyword occurrence in a text.
+
+        Args:
+            text: The text to search
+
+        Yields:
+            Tuples of (start offset, keyword index)
+        """
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                yield position - len(keywords[index]) + 1, index
+
+
+@dataclass(frozen=True)
+class ChatClassification:
+    """Result of classifying one chat message.
+
+    Attributes:
+        is_spam: Whether the message should be filtered
+        reasons: Which spam rules matched
+        is_command: Whether the message is a ``!command``
+        is_greeting: Whether the message contains a greeting word
+        blocked_terms: Blocklist terms found in the message
+    """
+
+    is_spam: bool
+    reasons: Tuple[str, ...] = ()
+    is_command: bool = False
+    is_greeting: bool = False
+    blocked_terms: Tuple[str, ...] = ()
+
+
+def _is_word_boundary(text: str, start: int, end: int) -> bool:
+    return (start == 0 or not text[start - 1].isalnum()) and (
+        end >= len(text) or not text[end].isalnum()
+    )
+
+
+class ChatClassifier:
+    """Precompiled spam, command and greeting classifier for chat messages.
+
+    A message is spam if it is too long, contains too many links, is too
+    repetitive or contains a blocklisted term. Greetings match whole words
+    only, so "this" is not a greeting. Each message is lowercased once and
+    all keyword lists are matched in a single automaton pass;
+    ``classify_batch`` runs one pass over a whole micro-batch.
+
+    Attributes:
+        max_length: Messages longer than this are spam
+        max_urls: Messages with more links than this are spam
+        repetition_ratio: Messages whose unique-word ratio is below this are
+            spam
+    """
+
+    def __init__(
+        self,
+        blocklist: Iterable[str] = (),
+        greetings: Iterable[str] = DEFAULT_GREETINGS,
+        max_length: int = 500,
+        max_urls: int = 2,
+        repetition_ratio: float = 0.3,
+    ) -> None:
+        """Initialize the classifier.
+
+        Args:
+            blocklist: Terms that mark a message as spam (case-insensitive
+                substrings)
+            greetings: Greeting words (case-insensitive whole words)
+            max_length: Messages longer than this are spam
+            max_urls: Messages with more links than this are spam
+            repetition_ratio: Messages whose unique-word ratio is below this
+                are spam
+        """
+        blocklist = [term.lower() for term in blocklist]
+        greetings = [word.lower() for word in greetings]
+        self._blocklist_size = len(set(blocklist))
+        # One automaton for both lists; indexes below _blocklist_size are blocked
+        self._automaton = KeywordAutomaton(list(dict.fromkeys(blocklist)) + greetings)
+        self.max_length = max_length
+        self.max_urls = max_urls
+        self.repetition_ratio = repetition_ratio
+
+    def classify(self, message: str) -> ChatClassification:
+        """Classify one chat message.
+
+        Args:
+            message: The message content
+
+        Returns:
+            The classification
+        """
+        return self.classify_batch([message])[0]
+
+    def classify_batch(self, messages: Sequence[str]) -> List[ChatClassification]:
+        """Classify a micro-batch of chat messages in one pass.
+
+        Args:
+            messages: Message contents
+
+        Returns:
+            One classification per message, in order
+        """
+        lowered = [message.lower() for message in messages]
+        text = _BATCH_SEPARATOR.join(lowered)
+        starts = []
+        offset = 0
+        for message in lowered:
+            starts.append(offset)
+            offset += len(message) + 1
+
+        blocked: List[List[str]] = [[] for _ in messages]
+        greeting = [False] * len(messages)
+        keywords = self._automaton.keywords
+        for start, index in self._automaton.iter_matches(text):
+            slot = bisect_right(starts, start) - 1
+            if index < self._blocklist_size:
+                blocked[slot].append(keywords[index])
+            elif not greeting[slot] and _is_word_boundary(
+                text, start, start + len(keywords[index])
+            ):
+                greeting[slot] = True
+
+        url_counts = [0] * len(messages)
+        for match in _URL_RE.finditer(text):
+            url_counts[bisect_right(starts, match.start()) - 1] += 1
+
+        results = []
+        for slot, message in enumerate(lowered):
+            reasons = []
+            if len(message) > self.max_length:
+                reasons.append("too_long")
+            if url_counts[slot] > self.max_urls:
+                reasons.append("too_many_links")
+            words = _WORD_RE.findall(message)
+            if len(set(words)) < len(words) * self.repetition_ratio:
+                reasons.append("repetitive")
+            if blocked[slot]:
+                reasons.append("blocked_term")
+            results.append(
+                ChatClassification(
+                    is_spam=bool(reasons),
+                    reasons=tuple(reasons),
+                    is_command=message.startswith("!"),
+                    is_greeting=greeting[slot],
+                    blocked_terms=tuple(dict.fromkeys(blocked[slot])),
+                )
+            )
+        return results
+
+
+def load_terms(path: str) -> List[str]:
+    """Load keyword terms from a file with one term per line.
+
+    Blank lines and lines starting with ``#`` are ignored.
+
+    Args:
+        path: Path of the terms file
+
+    Returns:
+        The terms
+    """
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+_classifier: Optional[ChatClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_chat_classifier() -> ChatClassifier:
+    """Get the process-wide chat classifier.
+
+    The blocklist and greetings are read from the files named by the
+    CHAT_BLOCKLIST_PATH and CHAT_GREETINGS_PATH environment variables, if set.
+    """
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                blocklist_path = os.getenv("CHAT_BLOCKLIST_PATH")
+                greetings_path = os.getenv("CHAT_GREETINGS_PATH")
+                blocklist = load_terms(blocklist_path) if blocklist_path else []
+                greetings = (
+                    load_terms(greetings_path) if greetings_path else DEFAULT_GREETINGS
+                )
+                _classifier = ChatClassifier(blocklist=blocklist, greetings=greetings)
+                logger.info(
+                    f"Loaded chat classifier with {len(blocklist)} blocked terms"
+                )
+    return _classifier
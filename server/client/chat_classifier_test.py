@@ -0,0 +1,62 @@
+from server.client.chat_classifier import ChatClassifier, KeywordAutomaton
+
+
+def test_automaton_finds_overlapping_keywords() -> None:
+    automaton = KeywordAutomaton(["he", "she", "his", "hers"])
+
+    matches = sorted(
+        (start, automaton.keywords[index])
+        for start, index in automaton.iter_matches("ushers")
+    )
+
+    assert matches == [(1, "she"), (2, "he"), (2, "hers")]
+
+
+def test_spam_rules() -> None:
+    classifier = ChatClassifier(blocklist=["Free Tokens", "cam-site.example"])
+
+    assert not classifier.classify("Great stream!").is_spam
+    assert classifier.classify("x" * 501).reasons == ("too_long",)
+    assert classifier.classify(
+        "http://a.example https://b.example www.c.example"
+    ).reasons == ("too_many_links",)
+    assert classifier.classify("buy buy buy buy buy buy buy buy").reasons == (
+        "repetitive",
+    )
+
+    blocked = classifier.classify("get FREE TOKENS at cam-site.example now")
+    assert blocked.reasons == ("blocked_term",)
+    assert blocked.blocked_terms == ("free tokens", "cam-site.example")
+
+
+def test_greetings_match_whole_words_only() -> None:
+    classifier = ChatClassifier()
+
+    assert classifier.classify("Hey there!").is_greeting
+    assert classifier.classify("well, hi :)").is_greeting
+    assert not classifier.classify("this is great").is_greeting
+    assert not classifier.classify("they said so").is_greeting
+
+
+def test_batch_matches_single_classification() -> None:
+    classifier = ChatClassifier(blocklist=["spamword"])
+    messages = [
+        "hello",
+        "spamword here",
+        "!roll 20",
+        "",
+        "hi spam word",
+        "no greeting",
+    ]
+
+    assert classifier.classify_batch(messages) == [
+        classifier.classify(message) for message in messages
+    ]
+    assert [result.is_command for result in classifier.classify_batch(messages)] == [
+        False,
+        False,
+        True,
+        False,
+        False,
+        False,
+    ]
@@ -0,0 +1,454 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Parameter types accepted in command usage strings, e.g. "amount:int"
+_PARAM_TYPES: Dict[str, Callable[[str], Any]] = {
+    "str": str,
+    "int": int,
+    "float": float,
+}
+
+
+@dataclass(frozen=True)
+class CommandParam:
+    """One parameter of a chat command.
+
+    Attributes:
+        name: Parameter name
+        kind: "str", "int", "float" or "rest" (the remainder of the message)
+        optional: Whether the parameter may be omitted
+    """
+
+    name: str
+    kind: str = "str"
+    optional: bool = False
+
+
+def parse_usage(usage: str) -> Tuple[CommandParam, ...]:
+    """Parse a usage string such as ``"amount:int note:rest?"``.
+
+    Args:
+        usage: Space-separated ``name[:type][?]`` parameter specs
+
+    Returns:
+        The parameters
+
+    Raises:
+        ValueError: If a type is unknown or "rest" is not the last parameter
+    """
+    params = []
+    for spec in usage.split():
+        optional = spec.endswith("?")
+        name, _, kind = spec.rstrip("?").partition(":")
+        kind = kind or "str"
+        if kind != "rest" and kind not in _PARAM_TYPES:
+            raise ValueError(f"Unknown parameter type '{kind}' in '{usage}'")
+        if params and params[-1].kind == "rest":
+            raise ValueError(f"'rest' must be the last parameter in '{usage}'")
+        params.append(CommandParam(name=name, kind=kind, optional=optional))
+    return tuple(params)
+
+
+@dataclass
+class CommandContext:
+    """What a command handler receives.
+
+    Attributes:
+        username: The user who sent the command
+        command: The resolved command name
+        args: Parsed arguments by parameter name
+        raw: The full chat message
+    """
+
+    username: str
+    command: str
+    args: Dict[str, Any]
+    raw: str
+
+
+CommandHandler = Callable[[CommandContext], Awaitable[Optional[str]]]
+
+
+@dataclass(frozen=True)
+class Command:
+    """A registered chat command.
+
+    Attributes:
+        name: Canonical command name
+        handler: Coroutine function returning an optional reply
+        params: Parsed parameters
+        usage: The usage string the parameters were parsed from
+        description: Help text
+    """
+
+    name: str
+    handler: CommandHandler
+    params: Tuple[CommandParam, ...] = ()
+    usage: str = ""
+    description: str = ""
+
+
+@dataclass
+class CommandResult:
+    """Outcome of handling a chat message as a command.
+
+    Attributes:
+        status: "accepted", "unknown", "ambiguous", "rate_limited",
+            "invalid_args" or "error"
+        command: The resolved command name, if any
+        reply: The handler's reply or an explanation for the user
+    """
+
+    status: str
+    command: Optional[str] = None
+    reply: Optional[str] = None
+
+    @property
+    def accepted(self) -> bool:
+        """Whether the command was run successfully."""
+        return self.status == "accepted"
+
+
+class _TrieNode:
+    __slots__ = ("children", "command", "unique")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.command: Optional[Command] = None
+        # The only command below this node, or None if there are several
+        self.unique: Optional[Command] = None
+
+
+class CommandTrie:
+    """Character trie of command names with unique-prefix matching.
+
+    ``lookup`` walks at most ``len(name)`` nodes: an exact name wins,
+    otherwise a prefix resolves if exactly one command starts with it.
+    """
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+        self._names: Dict[str, Command] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def insert(self, name: str, command: Command) -> None:
+        """Register a command under a name.
+
+        Args:
+            name: Name or alias (case-insensitive)
+            command: The command
+
+        Raises:
+            ValueError: If the name is already registered
+        """
+        name = name.lower()
+        if name in self._names:
+            raise ValueError(f"Command '{name}' is already registered")
+        self._names[name] = command
+
+        path = [self._root]
+        for char in name:
+            path.append(path[-1].children.setdefault(char, _TrieNode()))
+        path[-1].command = command
+
+        # Only nodes on the inserted path can change their unique command
+        for node in reversed(path):
+            commands = {child.unique for child in node.children.values()}
+            if node.command is not None:
+                commands.add(node.command)
+            node.unique = commands.pop() if len(commands) == 1 else None
+
+    def lookup(self, name: str) -> Tuple[Optional[Command], bool]:
+        """Resolve a typed command name.
+
+        Args:
+            name: The typed name or prefix (lowercase)
+
+        Returns:
+            (command, ambiguous): the resolved command or None, and whether
+            the prefix matched several commands
+        """
+        node = self._root
+        for char in name:
+            node = node.children.get(char)
+            if node is None:
+                return None, False
+        if node.command is not None:
+            return node.command, False
+        if node.unique is not None:
+            return node.unique, False
+        return None, bool(node.children)
+
+    def commands(self) -> List[Command]:
+        """Get the registered commands, without aliases, sorted by name."""
+        return sorted(
+            {id(command): command for command in self._names.values()}.values(),
+            key=lambda command: command.name,
+        )
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets kept as two floats per active key.
+
+    A key that has been idle long enough to refill completely is equivalent
+    to having no bucket, so such keys are purged once the table grows past
+    ``max_keys``.
+
+    Attributes:
+        rate: Tokens added per second
+        burst: Bucket capacity
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_keys: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+            max_keys: Table size that triggers purging of idle keys
+            clock: Monotonic time source
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def allow(self, key: str, cost: float = 1.0) -> bool:
+        """Take tokens from a key's bucket if it has enough.
+
+        Args:
+            key: Bucket key, e.g. a username
+            cost: Tokens required
+
+        Returns:
+            True if the tokens were taken
+        """
+        now = self._clock()
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens < cost:
+            self._buckets[key] = (tokens, now)
+            return False
+        self._buckets[key] = (tokens - cost, now)
+        if len(self._buckets) > self.max_keys:
+            self._purge(now)
+        return True
+
+    def refund(self, key: str, cost: float = 1.0) -> None:
+        """Return tokens taken by ``allow`` for work that did not happen."""
+        if key in self._buckets:
+            tokens, updated = self._buckets[key]
+            self._buckets[key] = (min(self.burst, tokens + cost), updated)
+
+    def _purge(self, now: float) -> None:
+        self._buckets = {
+            key: (tokens, updated)
+            for key, (tokens, updated) in self._buckets.items()
+            if tokens + (now - updated) * self.rate < self.burst
+        }
+
+
+class CommandEngine:
+    """Parses, rate-limits and runs ``!commands`` from chat.
+
+    Handling a message costs O(len(message)) before a command runs: the
+    name is resolved through a trie, then the sender's and the room's token
+    buckets are checked, then arguments are parsed. Messages rejected at any
+    step never reach the command handler.
+
+    Attributes:
+        prefix: Character that starts a command
+        user_limiter: Per-user rate limit
+        global_limiter: Rate limit shared by all users
+        stats: Counters per result status
+    """
+
+    def __init__(
+        self,
+        prefix: str = "!",
+        user_rate: float = 0.2,
+        user_burst: float = 3,
+        global_rate: float = 5.0,
+        global_burst: float = 20,
+    ) -> None:
+        """Initialize the engine with the built-in help command.
+
+        Args:
+            prefix: Character that starts a command
+            user_rate: Commands per second allowed per user
+            user_burst: Commands a user may send in a burst
+            global_rate: Commands per second allowed across all users
+            global_burst: Commands all users may send in a burst
+        """
+        self.prefix = prefix
+        self.user_limiter = TokenBucketLimiter(user_rate, user_burst)
+        self.global_limiter = TokenBucketLimiter(global_rate, global_burst)
+        self._trie = CommandTrie()
+        self.stats: Dict[str, int] = {}
+        self.register("help", self._help, usage="command?", description="List commands")
+
+    def register(
+        self,
+        name: str,
+        handler: CommandHandler,
+        usage: str = "",
+        description: str = "",
+        aliases: Sequence[str] = (),
+    ) -> Command:
+        """Register a command.
+
+        Args:
+            name: Command name
+            handler: Coroutine function called with a CommandContext; its
+                return value is used as the reply
+            usage: Parameter spec, e.g. ``"amount:int note:rest?"``
+            description: Help text
+            aliases: Additional names for the command
+
+        Returns:
+            The registered command
+
+        Raises:
+            ValueError: If a name is taken or the usage string is invalid
+        """
+        command = Command(
+            name=name.lower(),
+            handler=handler,
+            params=parse_usage(usage),
+            usage=usage,
+            description=description,
+        )
+        for alias in (name, *aliases):
+            self._trie.insert(alias, command)
+        return command
+
+    def command(
+        self, name: str, usage: str = "", description: str = "", aliases=()
+    ) -> Callable[[CommandHandler], CommandHandler]:
+        """Decorator form of ``register``."""
+
+        def decorator(handler: CommandHandler) -> CommandHandler:
+            self.register(name, handler, usage, description, aliases)
+            return handler
+
+        return decorator
+
+    def is_command(self, message: str) -> bool:
+        """Whether a chat message should be handled as a command.
+
+        The prefix must be followed by a letter or digit, so messages like
+        "!!!" are ordinary chat.
+        """
+        return (
+            message.startswith(self.prefix)
+            and message[len(self.prefix) : len(self.prefix) + 1].isalnum()
+        )
+
+    def _parse_args(self, command: Command, text: str) -> Dict[str, Any]:
+        args: Dict[str, Any] = {}
+        rest = text
+        for param in command.params:
+            rest = rest.lstrip()
+            if not rest:
+                if not param.optional:
+                    raise ValueError(f"missing <{param.name}>")
+                args[param.name] = None
+                continue
+            if param.kind == "rest":
+                args[param.name] = rest
+                rest = ""
+                continue
+            value, _, rest = rest.partition(" ")
+            try:
+                args[param.name] = _PARAM_TYPES[param.kind](value)
+            except ValueError:
+                raise ValueError(f"<{param.name}> must be {param.kind}") from None
+        if rest.strip():
+            raise ValueError("too many arguments")
+        return args
+
+    def _usage(self, command: Command) -> str:
+        return f"{self.prefix}{command.name} {command.usage}".strip()
+
+    def _finish(self, result: CommandResult) -> CommandResult:
+        self.stats[result.status] = self.stats.get(result.status, 0) + 1
+        return result
+
+    async def handle(self, username: str, message: str) -> CommandResult:
+        """Handle a chat message as a command.
+
+        Args:
+            username: The sender
+            message: The chat message, starting with the prefix
+
+        Returns:
+            The result; only "accepted" results ran a handler
+        """
+        name, _, text = message[len(self.prefix) :].partition(" ")
+        command, ambiguous = self._trie.lookup(name.lower())
+        if command is None:
+            return self._finish(
+                CommandResult("ambiguous" if ambiguous else "unknown", reply=None)
+            )
+
+        if not self.user_limiter.allow(username):
+            return self._finish(CommandResult("rate_limited", command.name))
+        if not self.global_limiter.allow("*"):
+            self.user_limiter.refund(username)
+            return self._finish(CommandResult("rate_limited", command.name))
+
+        try:
+            args = self._parse_args(command, text)
+        except ValueError as e:
+            return self._finish(
+                CommandResult(
+                    "invalid_args",
+                    command.name,
+                    reply=f"{e}. Usage: {self._usage(command)}",
+                )
+            )
+
+        context = CommandContext(
+            username=username, command=command.name, args=args, raw=message
+        )
+        try:
+            reply = await command.handler(context)
+        except Exception as e:
+            logger.error(f"Command '{command.name}' from {username} failed: {e}")
+            return self._finish(CommandResult("error", command.name))
+        return self._finish(CommandResult("accepted", command.name, reply))
+
+    async def _help(self, context: CommandContext) -> str:
+        name = context.args["command"]
+        if name:
+            command, _ = self._trie.lookup(name.lower().lstrip(self.prefix))
+            if command is None:
+                return f"Unknown command: {name}"
+            return f"{self._usage(command)} - {command.description}".rstrip(" -")
+        return "Commands: " + ", ".join(
+            f"{self.prefix}{command.name}" for command in self._trie.commands()
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get result counters and rate limiter table sizes."""
+        return {
+            **self.stats,
+            "commands": len(self._trie.commands()),
+            "tracked_users": len(self.user_limiter),
+        }
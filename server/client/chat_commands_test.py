@@ -0,0 +1,111 @@
+import pytest
+
+from server.client.chat_commands import (
+    Command,
+    CommandEngine,
+    CommandTrie,
+    TokenBucketLimiter,
+    parse_usage,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def noop(context):
+    return None
+
+
+def test_trie_resolves_exact_names_and_unique_prefixes() -> None:
+    trie = CommandTrie()
+    roll, rules, tip = (Command(name, noop) for name in ("roll", "rules", "tip"))
+    for command in (roll, rules, tip):
+        trie.insert(command.name, command)
+
+    assert trie.lookup("roll") == (roll, False)
+    assert trie.lookup("rol") == (roll, False)
+    assert trie.lookup("t") == (tip, False)
+    assert trie.lookup("r") == (None, True)
+    assert trie.lookup("x") == (None, False)
+    with pytest.raises(ValueError):
+        trie.insert("tip", tip)
+
+
+def test_exact_name_wins_over_longer_command() -> None:
+    trie = CommandTrie()
+    go, goal = Command("go", noop), Command("goal", noop)
+    trie.insert("go", go)
+    trie.insert("goal", goal)
+
+    assert trie.lookup("go") == (go, False)
+    assert trie.lookup("goa") == (goal, False)
+
+
+def test_parse_usage() -> None:
+    params = parse_usage("amount:int target? note:rest?")
+
+    assert [(p.name, p.kind, p.optional) for p in params] == [
+        ("amount", "int", False),
+        ("target", "str", True),
+        ("note", "rest", True),
+    ]
+    with pytest.raises(ValueError):
+        parse_usage("note:rest amount:int")
+    with pytest.raises(ValueError):
+        parse_usage("amount:decimal")
+
+
+def test_token_bucket_refills_and_purges_idle_keys() -> None:
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=1.0, burst=2, max_keys=2, clock=clock)
+
+    assert limiter.allow("alice")
+    assert limiter.allow("alice")
+    assert not limiter.allow("alice")
+    clock.now = 1.0
+    assert limiter.allow("alice")
+
+    clock.now = 10.0
+    limiter.allow("bob")
+    limiter.allow("carol")
+    assert len(limiter) == 2  # alice had refilled and was purged
+
+
+@pytest.mark.asyncio
+async def test_engine_parses_arguments_and_runs_handler() -> None:
+    engine = CommandEngine()
+    calls = []
+
+    @engine.command("roll", usage="sides:int label:rest?", aliases=["dice"])
+    async def roll(context):
+        calls.append((context.username, context.args))
+        return f"rolled d{context.args['sides']}"
+
+    result = await engine.handle("alice", "!dice 20 for the win")
+    assert result.accepted
+    assert result.reply == "rolled d20"
+    assert calls == [("alice", {"sides": 20, "label": "for the win"})]
+
+    result = await engine.handle("alice", "!roll twenty")
+    assert result.status == "invalid_args"
+    assert "Usage: !roll sides:int label:rest?" in result.reply
+
+    assert (await engine.handle("alice", "!nope")).status == "unknown"
+    assert not engine.is_command("!!! wow")
+
+
+@pytest.mark.asyncio
+async def test_engine_rate_limits_per_user_and_globally() -> None:
+    engine = CommandEngine(user_rate=0, user_burst=2, global_rate=0, global_burst=3)
+
+    statuses = [(await engine.handle("spammer", "!help")).status for _ in range(3)]
+    assert statuses == ["accepted", "accepted", "rate_limited"]
+
+    assert (await engine.handle("alice", "!help")).accepted
+    assert (await engine.handle("bob", "!help")).status == "rate_limited"
+    assert engine.get_stats()["rate_limited"] == 2
@@ -1,6 +1,6 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Tuple
 
 try:
     from chaturbate_poller.models import Event, Message, Tip, User
@@ -8,6 +8,23 @@ except ImportError:
     # Use mock models for demo mode
     from client.models import Event, Message, Tip, User
 
+try:
+    from server.client.chat_classifier import (
+        ChatClassification,
+        ChatClassifier,
+        get_chat_classifier,
+    )
+    from server.client.chat_commands import CommandEngine, CommandResult
+    from server.client.rolling_stats import RollingStats
+except ImportError:
+    # Imported from the server directory (Flask app)
+    from client.chat_classifier import (
+        ChatClassification,
+        ChatClassifier,
+        get_chat_classifier,
+    )
+    from client.chat_commands import CommandEngine, CommandResult
+    from client.rolling_stats import RollingStats
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +42,12 @@ class BaseEventHandler(ABC):
         pass
 
     @abstractmethod
-    async def handle_chat(self, event: Message) -> None:
-        """Handle chat message events."""
+    async def handle_chat(self, event: Message) -> bool:
+        """Handle chat message events.
+
+        Returns:
+            Whether the message should be stored and broadcast
+        """
         pass
 
     @abstractmethod
@@ -43,14 +64,27 @@ class ChaturbateClientEventHandler(BaseEventHandler):
 
     Attributes:
         event_stats: Dictionary tracking event counts by type
+        rolling_stats: Event rates, handler latency and queue depth over
+            1m/5m/15m windows; dispatchers report latency through
+            ``rolling_stats.observe_latency``
         enable_logging: Whether to log events (default: True)
+        chat_classifier: Spam, command and greeting classifier for chat
+        commands: Engine running ``!commands`` sent in chat
     """
 
-    def __init__(self, enable_logging: bool = True) -> None:
+    def __init__(
+        self,
+        enable_logging: bool = True,
+        chat_classifier: Optional[ChatClassifier] = None,
+        command_engine: Optional[CommandEngine] = None,
+    ) -> None:
         """Initialize the event handler.
 
         Args:
             enable_logging: Whether to enable event logging
+            chat_classifier: Chat classifier (uses the shared one if None)
+            command_engine: Chat command engine (creates one with the
+                built-in commands if None)
         """
         self.event_stats: Dict[str, int] = {
             "tips": 0,
@@ -58,9 +92,16 @@ class ChaturbateClientEventHandler(BaseEventHandler):
             "private_messages": 0,
             "media_purchases": 0,
             "user_events": 0,
+            "room_events": 0,
+            "spam_filtered": 0,
+            "commands_accepted": 0,
+            "commands_rejected": 0,
             "errors": 0,
         }
+        self.rolling_stats = RollingStats()
         self.enable_logging = enable_logging
+        self.chat_classifier = chat_classifier or get_chat_classifier()
+        self.commands = command_engine or CommandEngine()
 
         logger.info("Initialized Chaturbate event handler")
 
@@ -85,6 +126,7 @@ class ChaturbateClientEventHandler(BaseEventHandler):
                 return
 
             self.event_stats["tips"] += 1
+            self.rolling_stats.record_event(tokens=amount)
 
             if self.enable_logging:
                 logger.info(f"💰 Tip received: {amount} tokens from '{username}'")
@@ -116,29 +158,64 @@ class ChaturbateClientEventHandler(BaseEventHandler):
 
         # Additional custom logic can be added here
 
-    async def handle_chat(self, event: Message) -> None:
+    async def handle_chat(self, event: Message) -> bool:
         """Process chat message events with filtering and moderation.
 
+        Registered commands are run by the command engine and everything
+        else, including unregistered "!words", is classified as chat;
+        rejected commands and spam are dropped here so they never reach
+        storage or broadcasting in subclasses.
+
         Args:
             event: The chat message event to process
+
+        Returns:
+            Whether the message should be stored and broadcast
+        """
+        keep, _ = await self._filter_chat(event)
+        return keep
+
+    async def _filter_chat(
+        self, event: Message
+    ) -> Tuple[bool, Optional[CommandResult]]:
+        """Filter a chat message and run it if it is a registered command.
+
+        Args:
+            event: The chat message event to process
+
+        Returns:
+            Whether the message should be stored and broadcast, and the
+            command result if the message invoked a registered command (its
+            reply is for the subclass to deliver)
         """
         try:
             if not event or not event.object or not event.object.user:
                 logger.warning("Received invalid chat message event")
-                return
+                return False, None
 
             username = event.object.user.username or "Anonymous"
             message = event.object.message or ""
 
             if not message.strip():
-                return  # Ignore empty messages
+                return False, None  # Ignore empty messages
 
             self.event_stats["chat_messages"] += 1
+            self.rolling_stats.record_event()
 
-            # Basic message filtering
-            if await self._is_spam_message(message):
-                logger.debug(f"Filtered spam message from {username}")
-                return
+            if self.commands.is_command(message):
+                result = await self._handle_command(username, message)
+                if result.command is not None:
+                    # Rate-limited or invalid invocations are not chat
+                    return result.accepted, result
+
+            classification = self.chat_classifier.classify(message)
+            if classification.is_spam:
+                self.event_stats["spam_filtered"] += 1
+                logger.debug(
+                    f"Filtered spam message from {username}: "
+                    f"{', '.join(classification.reasons)}"
+                )
+                return False, None
 
             if self.enable_logging:
                 logger.debug(
@@ -146,11 +223,13 @@ class ChaturbateClientEventHandler(BaseEventHandler):
                 )
 
             # Process message based on content
-            await self._process_chat_message(username, message)
+            await self._process_chat_message(username, message, classification)
+            return True, None
 
         except Exception as e:
             self.event_stats["errors"] += 1
             logger.error(f"Error processing chat message: {e}")
+            return False, None
 
     async def _is_spam_message(self, message: str) -> bool:
         """Check if a message appears to be spam.
@@ -161,61 +240,62 @@ class ChaturbateClientEventHandler(BaseEventHandler):
         Returns:
             True if message appears to be spam
         """
-        # Basic spam detection logic
-        spam_indicators = [
-            len(message) > 500,  # Very long messages
-            message.count("http") > 2,  # Multiple URLs
-            len(set(message.lower().split()))
-            < len(message.split()) * 0.3,  # Too repetitive
-        ]
-        return any(spam_indicators)
-
-    async def _process_chat_message(self, username: str, message: str) -> None:
+        return self.chat_classifier.classify(message).is_spam
+
+    async def _process_chat_message(
+        self,
+        username: str,
+        message: str,
+        classification: Optional[ChatClassification] = None,
+    ) -> None:
         """Process chat message with custom logic.
 
         Args:
             username: The sender's username
             message: The message content
+            classification: The message's classification (computed if None)
         """
-        # Check for commands or special messages
-        if message.startswith("!"):
-            await self._handle_command(username, message)
-        elif any(word in message.lower() for word in ["hello", "hi", "hey"]):
+        classification = classification or self.chat_classifier.classify(message)
+
+        if classification.is_greeting:
             logger.debug(f"Greeting detected from {username}")
             # Handle greetings
 
-    async def _handle_command(self, username: str, command: str) -> None:
+    async def _handle_command(self, username: str, command: str) -> CommandResult:
         """Handle chat commands.
 
         Args:
             username: The user who sent the command
             command: The command string
+
+        Returns:
+            The command engine's result
         """
-        logger.debug(f"Command received from {username}: {command}")
-        # Implement command handling logic here
+        result = await self.commands.handle(username, command)
+        if result.accepted:
+            self.event_stats["commands_accepted"] += 1
+        elif result.command is not None:
+            self.event_stats["commands_rejected"] += 1
+        logger.debug(
+            f"Command from {username}: {result.command or command[:32]} "
+            f"-> {result.status}"
+        )
+        return result
 
     async def handle_message(self, event: Event) -> None:
-        """Process generic message events with type detection.
+        """Process generic events that have no dedicated route.
+
+        Events are routed to their specific handlers by method (see
+        ``client.event_dispatch.EVENT_ROUTES``), so this is only a fallback
+        for custom routes and unknown event types.
 
         Args:
             event: The event to process
         """
-        try:
-            if not event:
-                logger.warning("Received null event")
-                return
-
-            # Route event based on type
-            if is_chat_message(event):
-                await self.handle_chat(event)
-            elif is_private_message(event):
-                await self.handle_private_message(event)
-            else:
-                logger.debug(f"Unhandled message event type: {type(event)}")
-
-        except Exception as e:
-            self.event_stats["errors"] += 1
-            logger.error(f"Error processing message event: {e}")
+        if not event:
+            logger.warning("Received null event")
+            return
+        logger.debug(f"Unhandled message event type: {type(event)}")
 
     async def handle_private_message(self, event: Message) -> None:
         """Process private message events with privacy considerations.
@@ -235,6 +315,7 @@ class ChaturbateClientEventHandler(BaseEventHandler):
                 return
 
             self.event_stats["private_messages"] += 1
+            self.rolling_stats.record_event()
 
             # Log private messages with privacy protection
             if self.enable_logging:
@@ -284,6 +365,7 @@ class ChaturbateClientEventHandler(BaseEventHandler):
             tokens = getattr(media, "tokens", 0)
 
             self.event_stats["media_purchases"] += 1
+            self.rolling_stats.record_event(tokens=tokens or 0)
 
             if self.enable_logging:
                 logger.info(
@@ -324,6 +406,7 @@ class ChaturbateClientEventHandler(BaseEventHandler):
 
             username = user.username
             self.event_stats["user_events"] += 1
+            self.rolling_stats.record_event()
 
             if self.enable_logging:
                 logger.info(f"👤 User event: {username}")
@@ -335,6 +418,32 @@ class ChaturbateClientEventHandler(BaseEventHandler):
             self.event_stats["errors"] += 1
             logger.error(f"Error processing user event: {e}")
 
+    async def handle_user_event(self, event: Event) -> None:
+        """Process follow, fanclub and room presence events.
+
+        Args:
+            event: The user event to process
+        """
+        if not event or not event.object:
+            logger.warning("Received invalid user event")
+            return
+        await self.handle_user(event.object.user)
+
+    async def handle_room_event(self, event: Event) -> None:
+        """Process broadcast start/stop and room subject change events.
+
+        Args:
+            event: The room event to process
+        """
+        if not event:
+            logger.warning("Received invalid room event")
+            return
+
+        self.event_stats["room_events"] += 1
+        self.rolling_stats.record_event()
+        if self.enable_logging:
+            logger.info(f"📺 Room event: {getattr(event, 'method', 'unknown')}")
+
     async def _process_user_event(self, user: User) -> None:
         """Process user event with custom logic.
 
@@ -344,68 +453,22 @@ class ChaturbateClientEventHandler(BaseEventHandler):
         # Implement user event handling logic
         logger.debug(f"Processing user event for {user.username}")
 
-    def get_stats(self) -> Dict[str, int]:
+    def get_stats(self) -> Dict[str, Any]:
         """Get event processing statistics.
 
         Returns:
-            Dictionary of event counts by type
+            Dictionary of lifetime event counts by type, plus windowed
+            rates and latencies under "rolling"
         """
-        return self.event_stats.copy()
+        return {**self.event_stats, "rolling": self.rolling_stats.snapshot()}
 
     def reset_stats(self) -> None:
         """Reset event statistics counters."""
         for key in self.event_stats:
             self.event_stats[key] = 0
+        self.rolling_stats.reset()
         logger.info("Event statistics reset")
 
 
-def is_private_message(event: Union[Event, Message]) -> bool:
-    """Determine if the event represents a private message.
-
-    Args:
-        event: The event or message to check
-
-    Returns:
-        True if this is a private message, False otherwise
-    """
-    try:
-        if isinstance(event, Message):
-            return (
-                hasattr(event, "from_user")
-                and event.from_user is not None
-                and hasattr(event, "to_user")
-                and event.to_user is not None
-            )
-        elif hasattr(event, "object") and hasattr(event.object, "from_user"):
-            return (
-                event.object.from_user is not None
-                and hasattr(event.object, "to_user")
-                and event.object.to_user is not None
-            )
-        return False
-    except Exception:
-        return False
-
-
-def is_chat_message(event: Union[Event, Message]) -> bool:
-    """Determine if the event represents a public chat message.
-
-    Args:
-        event: The event or message to check
-
-    Returns:
-        True if this is a public chat message, False otherwise
-    """
-    try:
-        if isinstance(event, Message):
-            # Public chat messages typically don't have private routing
-            return not is_private_message(event)
-        elif hasattr(event, "object") and hasattr(event.object, "message"):
-            return not is_private_message(event)
-        return False
-    except Exception:
-        return False
-
-
 # Backward compatibility alias
 ChaturbateClientHandle = ChaturbateClientEventHandler
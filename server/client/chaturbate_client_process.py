@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import logging
 import os
 import signal
@@ -8,6 +9,15 @@ from typing import Any, Callable, Dict, Optional
 from chaturbate_poller.chaturbate_client import ChaturbateClient  # type: ignore
 
 from server.client.chaturbate_client_event_handler import ChaturbateClientEventHandler
+from server.client.event_dedup import EventDeduplicator
+from server.client.event_dispatch import EventRouter
+from server.client.event_queue import EventWorkQueue, OverflowPolicy
+from server.client.reconnect import (
+    CursorStore,
+    ReconnectBackoff,
+    is_expired_cursor_error,
+    is_retryable_error,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +27,22 @@ class ChaturbateClientProcess:
 
     This class manages the lifecycle of a Chaturbate client connection,
     including automatic reconnection, graceful shutdown, and comprehensive
-    error handling.
+    error handling. Reconnects use jittered exponential backoff and continue
+    from the last fetched ``nextUrl``. The persisted cursor only advances
+    past a page once all of its events have been handled, so a new process
+    resumes without a gap; events handled but not yet covered by the cursor
+    are fetched again and dropped by the deduplicator.
 
     Attributes:
         username: Chaturbate account username
         token: Authentication token
         client: The underlying Chaturbate client instance
         event_handler: Handler for processing events
+        router: Routing table from event method to handler chain
+        work_queue: Bounded queue and worker pool between poller and handlers
+        backoff: Delay policy between reconnect attempts
+        cursor: Store for the poller's resume cursor
+        dedup: Filter dropping events redelivered after reconnects
         is_running: Whether the process is currently running
     """
 
@@ -32,6 +51,12 @@ class ChaturbateClientProcess:
         username: Optional[str] = None,
         token: Optional[str] = None,
         event_handler: Optional[ChaturbateClientEventHandler] = None,
+        workers: int = 4,
+        queue_size: int = 1000,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        spill_path: Optional[str] = None,
+        backoff: Optional[ReconnectBackoff] = None,
+        cursor_store: Optional[CursorStore] = None,
     ) -> None:
         """Initialize the Chaturbate client process.
 
@@ -39,6 +64,12 @@ class ChaturbateClientProcess:
             username: Chaturbate username (or uses CHATURBATE_USERNAME env var)
             token: Authentication token (or uses CHATURBATE_TOKEN env var)
             event_handler: Custom event handler (creates default if None)
+            workers: Number of concurrent handler workers
+            queue_size: Maximum number of events buffered between poller and handlers
+            overflow_policy: What to do with new events when the queue is full
+            spill_path: File used by the spill_to_disk overflow policy
+            backoff: Reconnect delay policy (full-jitter exponential by default)
+            cursor_store: Resume cursor store (one file per account by default)
 
         Raises:
             ValueError: If required credentials are missing
@@ -56,16 +87,42 @@ class ChaturbateClientProcess:
         self.event_handler = event_handler or ChaturbateClientEventHandler()
         self.is_running = False
         self._shutdown_event = asyncio.Event()
-
-        # Build event handler mapping
-        self.handlers: Dict[str, Callable] = {
-            "tip": self.event_handler.handle_tip,
-            "chatMessage": self.event_handler.handle_chat,
-            "chatMessage": self.event_handler.handle_message,
-        }
+        self.backoff = backoff or ReconnectBackoff()
+        self.cursor = cursor_store or CursorStore.for_account(self.username)
+        self.dedup = EventDeduplicator()
+        self.reconnects = 0
+        self.last_error: Optional[str] = None
+
+        # Where the next session fetches from, and the newest cursor whose
+        # pages have been fully handled, written by a background task
+        self._resume_url: Optional[str] = None
+        self._handled_url: Optional[str] = None
+        self._cursor_generation = 0
+        self._cursor_dirty = asyncio.Event()
+        self._cursor_closed = False
+        self._cursor_writer: Optional[asyncio.Task] = None
+
+        # Route every event method to its handler; more subscribers can be
+        # added with self.router.subscribe()
+        self.router = EventRouter.from_handler(self.event_handler)
+        self.handlers: Dict[str, Callable] = self.router.chains
+
+        # The poller only enqueues; workers run the handlers above
+        self.work_queue = EventWorkQueue(
+            self.handlers,
+            workers=workers,
+            maxsize=queue_size,
+            policy=overflow_policy,
+            spill_path=spill_path,
+            on_handled=self._observe_handled,
+        )
+        self.client_handlers = self.work_queue.enqueue_handlers()
 
         logger.info(f"Initialized Chaturbate client process for user '{self.username}'")
 
+    def _observe_handled(self, method: str, seconds: float, depth: int) -> None:
+        self.event_handler.rolling_stats.observe_latency(seconds, queue_depth=depth)
+
     async def start(self) -> None:
         """Start the client process with automatic reconnection.
 
@@ -74,28 +131,83 @@ class ChaturbateClientProcess:
 
         Raises:
             RuntimeError: If the process is already running
+            Exception: The session error, if it is not retryable
         """
         if self.is_running:
             raise RuntimeError("Client process is already running")
 
         self.is_running = True
         logger.info("Starting Chaturbate client process")
+        self._resume_url = self._handled_url = self.cursor.load()
+        self._cursor_closed = False
+        await self.work_queue.start()
+        self._cursor_writer = asyncio.create_task(self._write_cursor())
 
         try:
             while self.is_running and not self._shutdown_event.is_set():
                 try:
                     await self._run_client_session()
                 except Exception as e:
-                    logger.error(f"Client session failed: {e}")
-                    if self.is_running:
-                        logger.info("Attempting to reconnect in 5 seconds...")
-                        await asyncio.sleep(5)
-                    else:
+                    self.last_error = str(e)
+                    if not self.is_running:
                         break
+                    if not is_retryable_error(e):
+                        if self._resume_url is None or not is_expired_cursor_error(e):
+                            # Keep the cursor so a later run resumes without a gap
+                            logger.error(f"Client session failed permanently: {e}")
+                            raise
+                        # The cursor expired; retry from the live edge and
+                        # ignore checkpoints of pages fetched with it
+                        logger.warning(f"Discarding expired resume cursor: {e}")
+                        self._resume_url = None
+                        self._cursor_generation += 1
+                        self._commit_cursor(self._cursor_generation, None)
+                    delay = self.backoff.next_delay()
+                    self.reconnects += 1
+                    logger.info(
+                        f"Client session failed: {e}; reconnecting in {delay:.1f}s"
+                    )
+                    try:
+                        await asyncio.wait_for(
+                            self._shutdown_event.wait(), timeout=delay
+                        )
+                    except asyncio.TimeoutError:
+                        pass
         finally:
             self.is_running = False
+            await self.work_queue.stop(drain=True)
+            await self._close_cursor_writer()
             logger.info("Chaturbate client process stopped")
 
+    def _commit_cursor(self, generation: int, url: Optional[str]) -> None:
+        """Mark a cursor as safe to resume from once its pages are handled."""
+        if generation != self._cursor_generation:
+            return
+        self._handled_url = url
+        self._cursor_dirty.set()
+
+    async def _write_cursor(self) -> None:
+        """Persist the newest committed cursor from a worker thread.
+
+        Commits arriving while a write is in flight are coalesced into the
+        next write, so the event loop never waits for the file system.
+        """
+        while True:
+            await self._cursor_dirty.wait()
+            self._cursor_dirty.clear()
+            await asyncio.to_thread(self.cursor.save, self._handled_url)
+            if self._cursor_closed:
+                return
+
+    async def _close_cursor_writer(self) -> None:
+        """Write the last committed cursor and stop the writer task."""
+        if self._cursor_writer is None:
+            return
+        self._cursor_closed = True
+        self._cursor_dirty.set()
+        await self._cursor_writer
+        self._cursor_writer = None
+
     async def _run_client_session(self) -> None:
         """Run a single client session.
 
@@ -104,16 +216,12 @@ class ChaturbateClientProcess:
         """
         logger.debug("Starting new client session")
 
-        self.client = ChaturbateClient(
-            username=self.username,
-            token=self.token,
-            event_handlers=self.handlers,
-        )
+        self.client = ChaturbateClient(username=self.username, token=self.token)
 
         try:
             async with self.client as client:
                 # Run until shutdown is requested
-                poll_task = asyncio.create_task(client.poll_events())
+                poll_task = asyncio.create_task(self._poll_events(client))
                 shutdown_task = asyncio.create_task(self._shutdown_event.wait())
 
                 done, pending = await asyncio.wait(
@@ -143,6 +251,34 @@ class ChaturbateClientProcess:
             self.client = None
             logger.debug("Client session ended")
 
+    async def _poll_events(self, client: ChaturbateClient) -> None:
+        """Fetch events from the resume cursor onwards and queue them.
+
+        After each response the next session continues from its ``nextUrl``,
+        while the persisted cursor is committed through a work queue
+        checkpoint: only once every event queued so far has been handled.
+
+        Args:
+            client: The connected Chaturbate client
+        """
+        url = self._resume_url
+        generation = self._cursor_generation
+        if url:
+            logger.info(f"Resuming event polling for '{self.username}'")
+
+        while True:
+            response = await client.fetch_events(url=url)
+            self.backoff.reset()
+            for event in response.events:
+                method = getattr(event.method, "value", event.method)
+                callback = self.client_handlers.get(method)
+                if callback is not None and not self.dedup.is_duplicate(method, event):
+                    await callback(event)
+            url = self._resume_url = response.next_url
+            self.work_queue.checkpoint(
+                functools.partial(self._commit_cursor, generation, url)
+            )
+
     async def stop(self) -> None:
         """Gracefully stop the client process.
 
@@ -191,6 +327,22 @@ class ChaturbateClientProcess:
             except asyncio.CancelledError:
                 pass
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Get event handler, work queue, dedup and reconnect statistics.
+
+        Returns:
+            Dictionary with handler event counts, queue metrics, dedup
+            counters and reconnect state
+        """
+        return {
+            "events": self.event_handler.get_stats(),
+            "queue": self.work_queue.get_stats(),
+            "dedup": self.dedup.get_stats(),
+            "reconnects": self.reconnects,
+            "backoff_attempt": self.backoff.attempt,
+            "last_error": self.last_error,
+        }
+
     def __repr__(self) -> str:
         """String representation of the process."""
         status = "running" if self.is_running else "stopped"
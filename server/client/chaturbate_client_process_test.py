@@ -1,11 +1,15 @@
 import asyncio
 import os
+import threading
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
 from server.client.chaturbate_client_event_handler import ChaturbateClientEventHandler
 from server.client.chaturbate_client_process import ChaturbateClientProcess
+from server.client.event_dispatch import EVENT_ROUTES
+from server.client.reconnect import CursorStore
+from server.client.rolling_stats import RollingStats
 
 
 @pytest.fixture
@@ -21,8 +25,11 @@ def mock_chaturbate_client():
         mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
         mock_instance.__aexit__ = AsyncMock(return_value=None)
 
-        # Mock polling method
-        mock_instance.poll_events = AsyncMock()
+        # Mock event fetching; by default the long poll never returns
+        async def wait_forever(url=None):
+            await asyncio.Event().wait()
+
+        mock_instance.fetch_events = AsyncMock(side_effect=wait_forever)
 
         yield mock_class, mock_instance
 
@@ -34,6 +41,7 @@ def mock_event_handler():
     handler.handle_tip = AsyncMock()
     handler.handle_chat = AsyncMock()
     handler.handle_message = AsyncMock()
+    handler.rolling_stats = RollingStats()
     return handler
 
 
@@ -123,10 +131,6 @@ class TestChaturbateClientProcessLifecycle:
         """Test starting the process and stopping it immediately."""
         mock_class, mock_instance = mock_chaturbate_client
 
-        # Make poll_events block until cancelled
-        event = asyncio.Event()
-        mock_instance.poll_events.side_effect = lambda: event.wait()
-
         process = ChaturbateClientProcess(username="test_username", token="test_token")
 
         # Start the process in background
@@ -153,7 +157,6 @@ class TestChaturbateClientProcessLifecycle:
         mock_class.assert_called_with(
             username="test_username",
             token="test_token",
-            event_handlers=process.handlers,
         )
 
     @pytest.mark.asyncio
@@ -206,7 +209,7 @@ class TestChaturbateClientProcessErrorHandling:
         # Simulate connection failure then success
         call_count = 0
 
-        async def failing_poll():
+        async def failing_fetch(url=None):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
@@ -215,15 +218,19 @@ class TestChaturbateClientProcessErrorHandling:
                 # Block on second call to simulate continuous running
                 await asyncio.Event().wait()
 
-        mock_instance.poll_events.side_effect = failing_poll
+        mock_instance.fetch_events.side_effect = failing_fetch
 
-        process = ChaturbateClientProcess(username="test_username", token="test_token")
+        process = ChaturbateClientProcess(
+            username="test_username",
+            token="test_token",
+            cursor_store=CursorStore(),
+        )
 
         # Start process in background
         start_task = asyncio.create_task(process.start())
 
-        # Wait for retry logic to execute
-        await asyncio.sleep(6)  # Should be enough for retry delay
+        # The first retry waits at most backoff.base seconds
+        await asyncio.sleep(1.5)
 
         # Verify multiple attempts were made
         assert mock_class.call_count >= 2
@@ -238,14 +245,149 @@ class TestChaturbateClientProcessErrorHandling:
         except asyncio.CancelledError:
             pass
 
+    @pytest.mark.asyncio
+    async def test_reconnect_resumes_from_cursor(
+        self, mock_chaturbate_client, mock_event_handler, tmp_path, clean_env
+    ):
+        """Test that a new session continues from the last nextUrl."""
+        mock_class, mock_instance = mock_chaturbate_client
+        tip = Mock(method="tip")
+        requested = []
+
+        async def fetch(url=None):
+            requested.append(url)
+            if len(requested) == 1:
+                return Mock(events=[tip], next_url="https://events/next-1")
+            if len(requested) == 2:
+                raise ConnectionError("Connection reset")
+            await asyncio.Event().wait()
+
+        mock_instance.fetch_events.side_effect = fetch
+        cursor_path = str(tmp_path / "cursor.json")
+
+        process = ChaturbateClientProcess(
+            username="test_username",
+            token="test_token",
+            event_handler=mock_event_handler,
+            cursor_store=CursorStore(cursor_path),
+        )
+        async with process.run_context():
+            await asyncio.sleep(1.5)
+
+        assert requested[:3] == [None, "https://events/next-1", "https://events/next-1"]
+        assert process.reconnects == 1
+        assert CursorStore(cursor_path).load() == "https://events/next-1"
+        mock_event_handler.handle_tip.assert_awaited_once_with(tip)
+
+    @pytest.mark.asyncio
+    async def test_cursor_advances_only_after_events_are_handled(
+        self, mock_chaturbate_client, mock_event_handler, tmp_path, clean_env
+    ):
+        """Test that the saved cursor waits for handlers and is written off-loop."""
+        mock_class, mock_instance = mock_chaturbate_client
+        tip = Mock(method="tip")
+        gate = asyncio.Event()
+
+        async def handle_tip(event):
+            await gate.wait()
+
+        mock_event_handler.handle_tip.side_effect = handle_tip
+
+        async def fetch(url=None):
+            if url is None:
+                return Mock(events=[tip], next_url="https://events/next-1")
+            await asyncio.Event().wait()
+
+        mock_instance.fetch_events.side_effect = fetch
+        cursor_path = str(tmp_path / "cursor.json")
+        cursor_store = CursorStore(cursor_path)
+        writers = []
+        save = cursor_store.save
+
+        def recording_save(cursor):
+            writers.append(threading.current_thread())
+            save(cursor)
+
+        cursor_store.save = recording_save
+
+        process = ChaturbateClientProcess(
+            username="test_username",
+            token="test_token",
+            event_handler=mock_event_handler,
+            cursor_store=cursor_store,
+        )
+        async with process.run_context():
+            await asyncio.sleep(0.3)
+            assert CursorStore(cursor_path).load() is None
+            gate.set()
+            await asyncio.sleep(0.3)
+            assert CursorStore(cursor_path).load() == "https://events/next-1"
+
+        assert writers
+        assert threading.main_thread() not in writers
+
+    @pytest.mark.asyncio
+    async def test_fatal_error_keeps_the_resume_cursor(
+        self, mock_chaturbate_client, tmp_path, clean_env
+    ):
+        """Test that only an expired cursor is discarded on a fatal error."""
+        mock_class, mock_instance = mock_chaturbate_client
+
+        class TokenRevoked(Exception):
+            status_code = 401
+
+        mock_instance.fetch_events.side_effect = TokenRevoked("token revoked")
+        cursor_path = str(tmp_path / "cursor.json")
+        CursorStore(cursor_path).save("https://events/next-7")
+
+        process = ChaturbateClientProcess(
+            username="test_username",
+            token="test_token",
+            cursor_store=CursorStore(cursor_path),
+        )
+        with pytest.raises(TokenRevoked):
+            await asyncio.wait_for(process.start(), timeout=5)
+
+        assert CursorStore(cursor_path).load() == "https://events/next-7"
+        assert process.reconnects == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_cursor_restarts_from_the_live_edge(
+        self, mock_chaturbate_client, tmp_path, clean_env
+    ):
+        """Test that a 404 for the saved cursor resumes from the live edge."""
+        mock_class, mock_instance = mock_chaturbate_client
+        requested = []
+
+        class CursorNotFound(Exception):
+            status_code = 404
+
+        async def fetch(url=None):
+            requested.append(url)
+            if url is not None:
+                raise CursorNotFound("unknown nextUrl")
+            await asyncio.Event().wait()
+
+        mock_instance.fetch_events.side_effect = fetch
+        cursor_path = str(tmp_path / "cursor.json")
+        CursorStore(cursor_path).save("https://events/stale")
+
+        process = ChaturbateClientProcess(
+            username="test_username",
+            token="test_token",
+            cursor_store=CursorStore(cursor_path),
+        )
+        async with process.run_context():
+            await asyncio.sleep(1.5)
+
+        assert requested[:2] == ["https://events/stale", None]
+        assert CursorStore(cursor_path).load() is None
+
     @pytest.mark.asyncio
     async def test_graceful_shutdown_timeout(self, mock_chaturbate_client, clean_env):
         """Test that shutdown handles timeouts gracefully."""
         mock_class, mock_instance = mock_chaturbate_client
 
-        # Make poll_events block indefinitely
-        mock_instance.poll_events.side_effect = lambda: asyncio.Event().wait()
-
         process = ChaturbateClientProcess(username="test_username", token="test_token")
 
         # Start process
@@ -281,6 +423,7 @@ class TestChaturbateClientProcessEventHandling:
         assert "chatMessage" in process.handlers
         assert process.handlers["tip"] == mock_event_handler.handle_tip
         assert process.handlers["chatMessage"] == mock_event_handler.handle_chat
+        assert set(process.handlers) == set(EVENT_ROUTES)
 
     def test_default_event_handler_creation(self, clean_env):
         """Test that default event handler is created when none provided."""
@@ -302,14 +445,14 @@ class TestChaturbateClientProcessIntegration:
         """Test complete lifecycle with event processing."""
         mock_class, mock_instance = mock_chaturbate_client
 
-        # Track if poll_events was called
-        poll_events_called = asyncio.Event()
+        # Track if fetch_events was called
+        fetch_events_called = asyncio.Event()
 
-        async def mock_poll():
-            poll_events_called.set()
-            await asyncio.sleep(0.1)  # Simulate some processing
+        async def mock_fetch(url=None):
+            fetch_events_called.set()
+            await asyncio.Event().wait()
 
-        mock_instance.poll_events.side_effect = mock_poll
+        mock_instance.fetch_events.side_effect = mock_fetch
 
         process = ChaturbateClientProcess(
             username="test_username",
@@ -319,8 +462,8 @@ class TestChaturbateClientProcessIntegration:
 
         # Use context manager for automatic cleanup
         async with process.run_context():
-            # Wait for poll_events to be called
-            await asyncio.wait_for(poll_events_called.wait(), timeout=1.0)
+            # Wait for fetch_events to be called
+            await asyncio.wait_for(fetch_events_called.wait(), timeout=1.0)
 
             # Verify the process is running
             assert process.is_running
@@ -329,7 +472,6 @@ class TestChaturbateClientProcessIntegration:
             mock_class.assert_called_with(
                 username="test_username",
                 token="test_token",
-                event_handlers=process.handlers,
             )
 
         # After context exit, process should be stopped
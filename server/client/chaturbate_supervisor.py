@@ -0,0 +1,622 @@
+import asyncio
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from influxdb_client import Point
+
+from server.client.chaturbate_client_event_handler import ChaturbateClientEventHandler
+from server.client.chaturbate_client_process import ChaturbateClientProcess
+from server.client.influx_batch_writer import BatchedInfluxWriter
+from server.client.influx_client import InfluxDBClient
+from server.client.reconnect import ReconnectBackoff
+
+logger = logging.getLogger(__name__)
+
+
+def shard_for(username: str, shards: int) -> int:
+    """Pick the worker shard for an account.
+
+    The mapping is stable across restarts, so an account always lands on the
+    same shard for a given shard count.
+
+    Args:
+        username: Chaturbate account username
+        shards: Number of worker shards
+
+    Returns:
+        The shard index
+    """
+    return zlib.crc32(username.lower().encode("utf-8")) % shards
+
+
+class AccountEventHandler(ChaturbateClientEventHandler):
+    """Event handler for one supervised account.
+
+    Tips and chat messages are written through the shared batched writer and
+    tagged with the broadcaster they were received for.
+    """
+
+    def __init__(
+        self, broadcaster: str, writer: Optional[BatchedInfluxWriter] = None
+    ) -> None:
+        """Initialize the handler.
+
+        Args:
+            broadcaster: The account the events belong to
+            writer: Shared writer for InfluxDB points (events are not stored
+                if None)
+        """
+        super().__init__(enable_logging=False)
+        self.broadcaster = broadcaster
+        self.writer = writer
+
+    def _write(self, point: Point) -> None:
+        if self.writer is not None:
+            self.writer.write(point.tag("broadcaster", self.broadcaster))
+
+    async def handle_tip(self, event) -> None:
+        """Handle a tip event and store it."""
+        await super().handle_tip(event)
+        if event.object.tip and (event.object.tip.tokens or 0) > 0:
+            username = event.object.user.username or "Anonymous"
+            self._write(
+                Point("chaturbate_events")
+                .tag("method", "tip")
+                .tag("username", username)
+                .field("object.tip.tokens", event.object.tip.tokens or 0)
+                .field("object.user.username", username)
+                .field("object.tip.message", getattr(event.object.tip, "message", ""))
+                .time(event.timestamp)
+            )
+
+    async def handle_chat(self, event) -> None:
+        """Handle a chat event and store it."""
+        if await super().handle_chat(event):
+            username = event.object.user.username or "Anonymous"
+            self._write(
+                Point("chaturbate_events")
+                .tag("method", "chatMessage")
+                .tag("username", username)
+                .field("object.user.username", username)
+                .field("object.message", event.object.message or "")
+                .time(event.timestamp)
+            )
+
+
+@dataclass
+class AccountState:
+    """Supervision state of one account.
+
+    Attributes:
+        username: Chaturbate account username
+        process: The client process polling the account
+        status: One of "starting", "running", "failed" or "stopped"
+        last_error: Message of the error that failed the account
+        started_at: Wall-clock time the account was added
+        task: The task supervising the process
+        removed: Whether the account has been removed
+    """
+
+    username: str
+    process: ChaturbateClientProcess
+    status: str = "starting"
+    last_error: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    task: Optional[asyncio.Task] = None
+    removed: bool = False
+
+    @property
+    def restarts(self) -> int:
+        """Number of times the process reconnected after a failed session."""
+        return self.process.reconnects
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the state for status reports."""
+        return {
+            "username": self.username,
+            "status": self.status,
+            "restarts": self.restarts,
+            "last_error": self.last_error,
+            "started_at": self.started_at,
+            "stats": self.process.get_stats(),
+        }
+
+
+class AccountSupervisor:
+    """Runs many Chaturbate accounts on one asyncio event loop.
+
+    Each account gets its own ``ChaturbateClientProcess`` and supervising
+    task. The process reconnects after retryable errors by itself, using the
+    backoff configured here; accounts with fatal errors (e.g. a revoked
+    token) are left in the "failed" state. Healthy accounts are unaffected.
+    All accounts share one batched InfluxDB writer.
+
+    Attributes:
+        writer: Shared batched InfluxDB writer
+        accounts: Supervised accounts by username
+        restart_delay: Upper bound of the first reconnect delay
+        max_restart_delay: Upper bound on the reconnect delay
+    """
+
+    def __init__(
+        self,
+        writer: Optional[BatchedInfluxWriter] = None,
+        restart_delay: float = 5.0,
+        max_restart_delay: float = 300.0,
+        process_options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Initialize the supervisor.
+
+        Args:
+            writer: Shared batched InfluxDB writer
+            restart_delay: Upper bound of the first reconnect delay
+            max_restart_delay: Upper bound on the reconnect delay
+            process_options: Extra keyword arguments for each
+                ChaturbateClientProcess (workers, queue_size, ...)
+        """
+        self.writer = writer
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.process_options = process_options or {}
+        self.accounts: Dict[str, AccountState] = {}
+
+    async def start(self) -> None:
+        """Start the shared writer."""
+        if self.writer is not None:
+            await self.writer.start()
+
+    async def stop(self) -> None:
+        """Stop every account and flush the shared writer."""
+        await asyncio.gather(
+            *(self.remove_account(username) for username in list(self.accounts)),
+            return_exceptions=True,
+        )
+        if self.writer is not None:
+            await self.writer.stop()
+
+    async def add_account(self, username: str, token: str) -> bool:
+        """Start polling an account.
+
+        Args:
+            username: Chaturbate account username
+            token: Authentication token
+
+        Returns:
+            True if the account was added, False if it is already supervised
+        """
+        if username in self.accounts:
+            return False
+
+        process = ChaturbateClientProcess(
+            username=username,
+            token=token,
+            event_handler=AccountEventHandler(username, self.writer),
+            backoff=ReconnectBackoff(self.restart_delay, self.max_restart_delay),
+            **self.process_options,
+        )
+        state = AccountState(username=username, process=process)
+        state.task = asyncio.create_task(
+            self._supervise(state), name=f"account:{username}"
+        )
+        self.accounts[username] = state
+        logger.info(f"Added account '{username}'")
+        return True
+
+    async def remove_account(self, username: str) -> bool:
+        """Stop polling an account.
+
+        Args:
+            username: Chaturbate account username
+
+        Returns:
+            True if the account was removed, False if it was not supervised
+        """
+        state = self.accounts.pop(username, None)
+        if state is None:
+            return False
+
+        state.removed = True
+        if state.process.is_running:
+            await state.process.stop()
+        state.task.cancel()
+        await asyncio.gather(state.task, return_exceptions=True)
+        state.status = "stopped"
+        logger.info(f"Removed account '{username}'")
+        return True
+
+    async def _supervise(self, state: AccountState) -> None:
+        # start() retries retryable errors itself and only raises fatal ones
+        state.status = "running"
+        try:
+            await state.process.start()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            state.last_error = str(e)
+            state.status = "failed"
+            logger.error(f"Account '{state.username}' failed: {e}")
+            return
+        state.status = "stopped"
+
+    def list_accounts(self) -> List[str]:
+        """Get the supervised usernames."""
+        return sorted(self.accounts)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get per-account state and writer statistics."""
+        return {
+            "accounts": {
+                username: state.to_dict() for username, state in self.accounts.items()
+            },
+            "writer": self.writer.get_stats() if self.writer is not None else None,
+        }
+
+    async def handle_command(self, command: str, *args: Any) -> Any:
+        """Run a control command.
+
+        Args:
+            command: One of "add", "remove", "list" or "status"
+            *args: Command arguments
+
+        Returns:
+            The command result
+
+        Raises:
+            ValueError: If the command is unknown
+        """
+        if command == "add":
+            return await self.add_account(*args)
+        if command == "remove":
+            return await self.remove_account(*args)
+        if command == "list":
+            return self.list_accounts()
+        if command == "status":
+            return self.get_status()
+        raise ValueError(f"Unknown supervisor command: {command}")
+
+
+def _shard_main(
+    index: int,
+    commands: multiprocessing.Queue,
+    responses: multiprocessing.Queue,
+    process_options: Dict[str, Any],
+    writer_options: Dict[str, Any],
+) -> None:
+    """Entry point of a shard worker process."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(
+        _serve_shard(index, commands, responses, process_options, writer_options)
+    )
+
+
+async def _serve_shard(
+    index: int,
+    commands: multiprocessing.Queue,
+    responses: multiprocessing.Queue,
+    process_options: Dict[str, Any],
+    writer_options: Dict[str, Any],
+) -> None:
+    writer = None
+    try:
+        writer = BatchedInfluxWriter(InfluxDBClient(), **writer_options)
+    except Exception as e:
+        logger.warning(f"Shard {index} running without InfluxDB: {e}")
+
+    supervisor = AccountSupervisor(writer=writer, process_options=process_options)
+    await supervisor.start()
+    logger.info(f"Supervisor shard {index} started")
+
+    try:
+        while True:
+            request_id, command, args = await asyncio.to_thread(commands.get)
+            if command == "shutdown":
+                break
+            try:
+                result = await supervisor.handle_command(command, *args)
+                responses.put((request_id, "ok", result))
+            except Exception as e:
+                responses.put((request_id, "error", str(e)))
+    finally:
+        await supervisor.stop()
+        logger.info(f"Supervisor shard {index} stopped")
+
+
+@dataclass
+class _Shard:
+    process: multiprocessing.Process
+    commands: multiprocessing.Queue
+    responses: multiprocessing.Queue
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class SupervisorCluster:
+    """Shards supervised accounts across worker processes.
+
+    Every shard is a process running one ``AccountSupervisor`` on its own
+    event loop with its own batched InfluxDB writer. Accounts are assigned to
+    shards with ``shard_for`` and can be added or removed at runtime through
+    the methods below, which are safe to call from any thread. A shard whose
+    process died is respawned, and its accounts re-added, by the next call
+    routed to it or by ``revive_dead_shards``.
+
+    Attributes:
+        shards: Number of worker processes
+    """
+
+    def __init__(
+        self,
+        shards: Optional[int] = None,
+        process_options: Optional[Dict[str, Any]] = None,
+        writer_options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Initialize the cluster.
+
+        Args:
+            shards: Number of worker processes (or uses SUPERVISOR_SHARDS env
+                var, defaulting to the CPU count)
+            process_options: Extra keyword arguments for each
+                ChaturbateClientProcess
+            writer_options: Keyword arguments for each shard's
+                BatchedInfluxWriter
+        """
+        self.shards = shards or int(
+            os.getenv("SUPERVISOR_SHARDS", str(os.cpu_count() or 1))
+        )
+        if self.shards < 1:
+            raise ValueError("shards must be at least 1")
+        self.process_options = process_options or {}
+        self.writer_options = writer_options or {}
+        self._shards: List[_Shard] = []
+        self._tokens: Dict[str, str] = {}
+        self._request_ids = itertools.count(1)
+        self._revive_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the shard worker processes."""
+        if self._shards:
+            return
+        self._shards = [self._spawn(index) for index in range(self.shards)]
+        logger.info(f"Started supervisor cluster with {self.shards} shards")
+
+    def _spawn(self, index: int) -> _Shard:
+        # Spawn rather than fork so shards do not inherit the parent's threads
+        context = multiprocessing.get_context("spawn")
+        commands, responses = context.Queue(), context.Queue()
+        process = context.Process(
+            target=_shard_main,
+            args=(
+                index,
+                commands,
+                responses,
+                self.process_options,
+                self.writer_options,
+            ),
+            name=f"supervisor-shard-{index}",
+            daemon=True,
+        )
+        process.start()
+        return _Shard(process, commands, responses)
+
+    def stop(self, timeout: float = 15.0) -> None:
+        """Stop every account and shut the shard processes down.
+
+        Args:
+            timeout: Maximum time to wait for each shard to exit
+        """
+        for shard in self._shards:
+            shard.commands.put((None, "shutdown", ()))
+        for shard in self._shards:
+            shard.process.join(timeout)
+            if shard.process.is_alive():
+                logger.warning(f"Terminating unresponsive {shard.process.name}")
+                shard.process.terminate()
+        self._shards = []
+        self._tokens.clear()
+        logger.info("Stopped supervisor cluster")
+
+    def revive_dead_shards(self) -> int:
+        """Respawn shard processes that died and re-add their accounts.
+
+        Returns:
+            Number of shards respawned
+        """
+        return sum(self._revive(index) for index in range(len(self._shards)))
+
+    def _revive(self, index: int) -> bool:
+        with self._revive_lock:
+            shard = self._shards[index]
+            if shard.process.is_alive():
+                return False
+            logger.error(
+                f"{shard.process.name} exited with code {shard.process.exitcode}; "
+                "respawning it"
+            )
+            shard = self._shards[index] = self._spawn(index)
+
+        for username, token in list(self._tokens.items()):
+            if shard_for(username, self.shards) != index:
+                continue
+            try:
+                self._request(shard, "add", (username, token))
+            except Exception as e:
+                logger.error(f"Failed to re-add account '{username}': {e}")
+        return True
+
+    def _call(self, index: int, command: str, *args: Any, timeout: float = 30.0):
+        if not self._shards:
+            raise RuntimeError("Supervisor cluster is not running")
+        self._revive(index)
+        return self._request(self._shards[index], command, args, timeout)
+
+    def _request(
+        self, shard: _Shard, command: str, args: tuple, timeout: float = 30.0
+    ) -> Any:
+        with shard.lock:
+            request_id = next(self._request_ids)
+            shard.commands.put((request_id, command, args))
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise queue.Empty
+                try:
+                    reply = shard.responses.get(timeout=min(remaining, 1.0))
+                except queue.Empty:
+                    if not shard.process.is_alive():
+                        raise RuntimeError(
+                            f"{shard.process.name} exited during '{command}'"
+                        )
+                    continue
+                reply_id, status, result = reply
+                if reply_id == request_id:
+                    break
+                # A reply to an earlier call that timed out
+                logger.warning(f"Discarding late reply to request {reply_id}")
+        if status == "error":
+            raise RuntimeError(result)
+        return result
+
+    def add_account(self, username: str, token: str) -> bool:
+        """Start polling an account on its shard.
+
+        Args:
+            username: Chaturbate account username
+            token: Authentication token
+
+        Returns:
+            True if the account was added, False if it is already supervised
+        """
+        added = self._call(shard_for(username, self.shards), "add", username, token)
+        if added:
+            self._tokens[username] = token
+        return added
+
+    def remove_account(self, username: str) -> bool:
+        """Stop polling an account.
+
+        Args:
+            username: Chaturbate account username
+
+        Returns:
+            True if the account was removed, False if it was not supervised
+        """
+        self._tokens.pop(username, None)
+        return self._call(shard_for(username, self.shards), "remove", username)
+
+    def reconcile(self, accounts: Dict[str, str]) -> None:
+        """Make the supervised accounts match a username → token mapping.
+
+        Accounts missing from the mapping are removed, new ones are added and
+        accounts whose token changed are restarted with the new token.
+
+        Args:
+            accounts: The desired accounts
+        """
+        for username in set(self._tokens) - set(accounts):
+            self.remove_account(username)
+        for username, token in accounts.items():
+            current = self._tokens.get(username)
+            if current == token:
+                continue
+            if current is not None:
+                self.remove_account(username)
+            self.add_account(username, token)
+
+    def list_accounts(self) -> List[str]:
+        """Get the supervised usernames across all shards."""
+        return sorted(
+            username
+            for index in range(len(self._shards))
+            for username in self._call(index, "list")
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the status of every shard and its accounts.
+
+        Dead shards are reported with ``alive`` False and are not queried.
+        """
+        shards = []
+        for index, shard in enumerate(self._shards):
+            status = {
+                "index": index,
+                "pid": shard.process.pid,
+                "alive": shard.process.is_alive(),
+            }
+            if status["alive"]:
+                status.update(self._request(shard, "status", ()))
+            shards.append(status)
+        return {"shards": shards}
+
+
+def load_accounts(path: str) -> Dict[str, str]:
+    """Load accounts from a JSON file mapping usernames to tokens.
+
+    Args:
+        path: Path of the accounts file
+
+    Returns:
+        Mapping of username to token
+    """
+    with open(path) as f:
+        accounts = json.load(f)
+    if not isinstance(accounts, dict):
+        raise ValueError(f"{path} must contain a JSON object of username: token")
+    return {str(username): str(token) for username, token in accounts.items()}
+
+
+def main() -> None:
+    """Run the supervisor cluster for the accounts in CHATURBATE_ACCOUNTS_FILE.
+
+    The file is re-read whenever it changes, so accounts can be added, removed
+    or have their tokens rotated without restarting. Shards that died are
+    respawned on the same schedule.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    path = os.getenv("CHATURBATE_ACCOUNTS_FILE")
+    if not path:
+        logger.error("CHATURBATE_ACCOUNTS_FILE is not set")
+        return
+    reload_interval = float(os.getenv("SUPERVISOR_RELOAD_INTERVAL", "5"))
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda s, f: stopping.set())
+    signal.signal(signal.SIGINT, lambda s, f: stopping.set())
+
+    cluster = SupervisorCluster()
+    cluster.start()
+    last_mtime = None
+    try:
+        while not stopping.is_set():
+            try:
+                cluster.revive_dead_shards()
+            except Exception as e:
+                logger.error(f"Failed to respawn supervisor shards: {e}")
+            try:
+                mtime = os.path.getmtime(path)
+                if mtime != last_mtime:
+                    cluster.reconcile(load_accounts(path))
+                    last_mtime = mtime
+                    logger.info(f"Supervising {len(cluster.list_accounts())} accounts")
+            except Exception as e:
+                logger.error(f"Failed to apply {path}: {e}")
+            stopping.wait(reload_interval)
+    finally:
+        cluster.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import asyncio
+import queue
+import threading
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from server.client import chaturbate_supervisor as supervisor_module
+from server.client.chaturbate_supervisor import (
+    AccountSupervisor,
+    SupervisorCluster,
+    _serve_shard,
+    _Shard,
+    shard_for,
+)
+
+
+class TokenRevoked(Exception):
+    status_code = 401
+
+
+@pytest.fixture
+def mock_chaturbate_client():
+    """Patch the poller client; tests set ``fetch_events`` behaviour."""
+    with patch(
+        "server.client.chaturbate_client_process.ChaturbateClient"
+    ) as mock_class:
+        mock_instance = AsyncMock()
+        mock_class.return_value = mock_instance
+        mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
+        mock_instance.__aexit__ = AsyncMock(return_value=None)
+        yield mock_instance
+
+
+def failing_once(error: Exception):
+    calls = []
+
+    async def fetch(url=None):
+        calls.append(url)
+        if len(calls) == 1:
+            raise error
+        await asyncio.Event().wait()
+
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_retryable_failures_reconnect_inside_the_process(
+    mock_chaturbate_client, tmp_path
+):
+    mock_chaturbate_client.fetch_events.side_effect = failing_once(
+        ConnectionError("reset")
+    )
+    supervisor = AccountSupervisor(
+        restart_delay=0.01,
+        process_options={"cursor_store": Mock(load=Mock(return_value=None))},
+    )
+
+    assert await supervisor.add_account("alice", "token")
+    await asyncio.sleep(0.2)
+
+    state = supervisor.accounts["alice"]
+    assert state.status == "running"
+    assert state.restarts == 1
+    assert mock_chaturbate_client.fetch_events.await_count == 2
+
+    await supervisor.stop()
+    assert state.status == "stopped"
+
+
+@pytest.mark.asyncio
+async def test_fatal_failures_leave_the_account_failed(mock_chaturbate_client):
+    mock_chaturbate_client.fetch_events.side_effect = TokenRevoked("revoked")
+    supervisor = AccountSupervisor(
+        restart_delay=0.01,
+        process_options={"cursor_store": Mock(load=Mock(return_value=None))},
+    )
+
+    await supervisor.add_account("alice", "token")
+    await asyncio.sleep(0.1)
+
+    state = supervisor.accounts["alice"]
+    assert state.status == "failed"
+    assert state.last_error == "revoked"
+    assert state.restarts == 0
+    await supervisor.stop()
+
+
+def thread_cluster() -> SupervisorCluster:
+    """A one-shard cluster whose shard queues are plain thread queues."""
+    cluster = SupervisorCluster(shards=1)
+    cluster._shards = [_Shard(Mock(), queue.Queue(), queue.Queue())]
+    return cluster
+
+
+def test_commands_round_trip_through_a_shard(monkeypatch):
+    monkeypatch.setattr(
+        supervisor_module, "InfluxDBClient", Mock(side_effect=ValueError("no env"))
+    )
+    cluster = thread_cluster()
+    shard = cluster._shards[0]
+    server = threading.Thread(
+        target=asyncio.run,
+        args=(_serve_shard(0, shard.commands, shard.responses, {}, {}),),
+    )
+    server.start()
+    try:
+        assert cluster.list_accounts() == []
+        assert cluster._call(0, "status")["accounts"] == {}
+        with pytest.raises(RuntimeError, match="Unknown supervisor command"):
+            cluster._call(0, "restart")
+    finally:
+        shard.commands.put((None, "shutdown", ()))
+        server.join(5)
+    assert not server.is_alive()
+
+
+def test_late_replies_are_not_returned_to_the_next_call():
+    cluster = thread_cluster()
+    shard = cluster._shards[0]
+
+    with pytest.raises(queue.Empty):
+        cluster._call(0, "list", timeout=0.05)
+
+    def answer_in_order():
+        for _ in range(2):
+            request_id, command, args = shard.commands.get()
+            shard.responses.put((request_id, "ok", [command, request_id]))
+
+    responder = threading.Thread(target=answer_in_order)
+    responder.start()
+    # The reply to the timed-out "list" arrives first and must be skipped
+    assert cluster._call(0, "status", timeout=5) == ["status", 2]
+    responder.join(5)
+    assert shard.responses.empty()
+
+
+class ThreadShardProcess:
+    """Runs a shard's command loop on a thread in place of a process."""
+
+    def __init__(self, index, commands, responses, process_options) -> None:
+        self.name = f"supervisor-shard-{index}"
+        self.pid = None
+        self.exitcode = None
+        self._commands = commands
+        self._thread = threading.Thread(
+            target=asyncio.run,
+            args=(_serve_shard(index, commands, responses, process_options, {}),),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        return self.exitcode is None
+
+    def kill(self) -> None:
+        self.exitcode = -9
+        self._commands.put((None, "shutdown", ()))
+        self._thread.join(5)
+
+    def join(self, timeout=None) -> None:
+        self._thread.join(timeout)
+
+    def terminate(self) -> None:
+        pass
+
+
+def test_dead_shards_are_reported_and_respawned_with_their_accounts(
+    monkeypatch, mock_chaturbate_client
+):
+    async def wait_forever(url=None):
+        await asyncio.Event().wait()
+
+    mock_chaturbate_client.fetch_events.side_effect = wait_forever
+    monkeypatch.setattr(
+        supervisor_module, "InfluxDBClient", Mock(side_effect=ValueError("no env"))
+    )
+    cluster = SupervisorCluster(
+        shards=2,
+        process_options={"cursor_store": Mock(load=Mock(return_value=None))},
+    )
+    spawned = []
+
+    def spawn(index):
+        commands, responses = queue.Queue(), queue.Queue()
+        process = ThreadShardProcess(
+            index, commands, responses, cluster.process_options
+        )
+        spawned.append(process)
+        return _Shard(process, commands, responses)
+
+    monkeypatch.setattr(cluster, "_spawn", spawn)
+    cluster.start()
+    try:
+        accounts = {"alice": "a", "bob": "b", "carol": "c", "dave": "d"}
+        cluster.reconcile(accounts)
+        victim = shard_for("alice", 2)
+        cluster._shards[victim].process.kill()
+
+        started = time.monotonic()
+        shards = cluster.get_status()["shards"]
+        assert time.monotonic() - started < 5
+        assert shards[victim]["alive"] is False
+        assert "accounts" not in shards[victim]
+        assert shards[1 - victim]["alive"] is True
+
+        assert cluster.revive_dead_shards() == 1
+        assert cluster.revive_dead_shards() == 0
+        assert len(spawned) == 3
+        assert cluster.list_accounts() == sorted(accounts)
+    finally:
+        cluster.stop(timeout=5)
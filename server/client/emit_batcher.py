@@ -0,0 +1,178 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Called with (room, payloads) to send one batch frame
+BatchEmit = Callable[[str, List[Dict[str, Any]]], None]
+
+
+class _PendingBatch:
+    __slots__ = ("payloads", "opened_at")
+
+    def __init__(self, opened_at: float) -> None:
+        self.payloads: List[Dict[str, Any]] = []
+        self.opened_at = opened_at
+
+
+class EmitBatcher:
+    """Coalesces per-room socket payloads into micro-batch frames.
+
+    Payloads added for a room are held until the room's batch is
+    ``window_seconds`` old or holds ``max_events`` payloads, then sent as one
+    frame. An urgent payload (e.g. a large tip) flushes its room's batch
+    immediately, after the payloads queued before it, so ordering within a
+    room is preserved. ``flush_expired`` must be called periodically; ``run``
+    does that until ``close`` is called.
+
+    Attributes:
+        window_seconds: Maximum time a payload waits for its batch
+        max_events: Maximum number of payloads per frame
+        stats: Counters for batched events, frames sent, urgent flushes and
+            frames (with their events) lost to emit errors
+    """
+
+    def __init__(
+        self,
+        emit: BatchEmit,
+        window_seconds: float = 0.1,
+        max_events: int = 50,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the batcher.
+
+        Args:
+            emit: Called with the room and the list of payloads of each frame
+            window_seconds: Maximum time a payload waits for its batch
+            max_events: Maximum number of payloads per frame
+            clock: Monotonic time source
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if window_seconds <= 0 or max_events < 1:
+            raise ValueError(
+                "window_seconds must be positive and max_events at least 1"
+            )
+
+        self.window_seconds = window_seconds
+        self.max_events = max_events
+        self._emit = emit
+        self._clock = clock
+        self._pending: Dict[str, _PendingBatch] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self.stats: Dict[str, int] = {
+            "events": 0,
+            "frames": 0,
+            "urgent_flushes": 0,
+            "failed_frames": 0,
+            "failed_events": 0,
+        }
+
+    @property
+    def pending(self) -> int:
+        """Number of payloads waiting to be sent."""
+        return sum(len(batch.payloads) for batch in list(self._pending.values()))
+
+    def add(self, room: str, payload: Dict[str, Any], urgent: bool = False) -> None:
+        """Queue a payload for a room.
+
+        Args:
+            room: The Socket.IO room the frame is sent to
+            payload: The event payload
+            urgent: Whether to send the room's batch right away
+        """
+        with self._lock:
+            batch = self._pending.get(room)
+            if batch is None:
+                batch = self._pending[room] = _PendingBatch(self._clock())
+            batch.payloads.append(payload)
+            self.stats["events"] += 1
+
+            if urgent:
+                self.stats["urgent_flushes"] += 1
+                self._send(room)
+            elif len(batch.payloads) >= self.max_events:
+                self._send(room)
+
+    def flush(self, room: Optional[str] = None) -> int:
+        """Send pending batches now.
+
+        Args:
+            room: Only flush this room (default: every room)
+
+        Returns:
+            Number of frames sent
+        """
+        with self._lock:
+            rooms = [room] if room is not None else list(self._pending)
+            return sum(self._send(name) for name in rooms)
+
+    def flush_expired(self) -> int:
+        """Send the batches that are at least one window old.
+
+        Returns:
+            Number of frames sent
+        """
+        with self._lock:
+            deadline = self._clock() - self.window_seconds
+            expired = [
+                room
+                for room, batch in self._pending.items()
+                if batch.opened_at <= deadline
+            ]
+            return sum(self._send(room) for room in expired)
+
+    def _send(self, room: str) -> int:
+        # Called with the lock held so frames for a room are never reordered
+        batch = self._pending.pop(room, None)
+        if batch is None or not batch.payloads:
+            return 0
+        try:
+            self._emit(room, batch.payloads)
+        except Exception as e:
+            logger.error(
+                f"Failed to emit batch of {len(batch.payloads)} to '{room}': {e}"
+            )
+            self.stats["failed_frames"] += 1
+            self.stats["failed_events"] += len(batch.payloads)
+            return 0
+        self.stats["frames"] += 1
+        return 1
+
+    def run(self, sleep: Callable[[float], Any] = time.sleep) -> None:
+        """Flush expired batches every half window until ``close`` is called.
+
+        Args:
+            sleep: Sleep function of the serving framework, e.g. socketio.sleep
+        """
+        while not self._closed.is_set():
+            sleep(self.window_seconds / 2)
+            self.flush_expired()
+
+    def close(self) -> None:
+        """Stop ``run`` and send whatever is still pending."""
+        self._closed.set()
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching counters and configuration.
+
+        Returns:
+            Dictionary with counters, the pending count, the mean batch size
+            and the window and size limits
+        """
+        frames = self.stats["frames"]
+        pending = self.pending
+        # Only events that went out in a frame count towards the batch size
+        sent = self.stats["events"] - self.stats["failed_events"] - pending
+        return {
+            **self.stats,
+            "pending": pending,
+            "mean_batch_size": round(sent / frames, 2) if frames else 0.0,
+            "window_ms": round(self.window_seconds * 1000, 3),
+            "max_events": self.max_events,
+        }
@@ -0,0 +1,95 @@
+import pytest
+
+from server.client.emit_batcher import EmitBatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_batcher(**kwargs):
+    frames = []
+    clock = FakeClock()
+    batcher = EmitBatcher(
+        lambda room, payloads: frames.append((room, list(payloads))),
+        clock=clock,
+        **kwargs,
+    )
+    return batcher, frames, clock
+
+
+def test_payloads_are_coalesced_per_room_until_the_window_expires():
+    batcher, frames, clock = make_batcher(window_seconds=0.1)
+    batcher.add("streamer:a", {"n": 1})
+    batcher.add("streamer:b", {"n": 2})
+    batcher.add("streamer:a", {"n": 3})
+
+    clock.now += 0.05
+    assert batcher.flush_expired() == 0
+    clock.now += 0.05
+    assert batcher.flush_expired() == 2
+
+    assert frames == [
+        ("streamer:a", [{"n": 1}, {"n": 3}]),
+        ("streamer:b", [{"n": 2}]),
+    ]
+    assert batcher.pending == 0
+
+
+def test_full_batches_and_urgent_payloads_flush_immediately():
+    batcher, frames, _ = make_batcher(max_events=2)
+    batcher.add("room", {"n": 1})
+    batcher.add("room", {"n": 2})
+    batcher.add("room", {"n": 3})
+    batcher.add("room", {"n": 4, "urgent": True}, urgent=True)
+
+    assert frames == [
+        ("room", [{"n": 1}, {"n": 2}]),
+        ("room", [{"n": 3}, {"n": 4, "urgent": True}]),
+    ]
+    stats = batcher.get_stats()
+    assert stats["frames"] == 2
+    assert stats["urgent_flushes"] == 1
+    assert stats["mean_batch_size"] == pytest.approx(2.0)
+
+
+def test_close_flushes_pending_and_emit_errors_are_contained():
+    def failing_emit(room, payloads):
+        raise RuntimeError("socket gone")
+
+    batcher = EmitBatcher(failing_emit)
+    batcher.add("room", {"n": 1})
+    batcher.close()
+
+    assert batcher.pending == 0
+    assert batcher.stats["frames"] == 0
+    assert batcher.stats["failed_frames"] == 1
+    assert batcher.get_stats()["mean_batch_size"] == 0.0
+    with pytest.raises(ValueError):
+        EmitBatcher(failing_emit, max_events=0)
+
+
+def test_failed_frames_do_not_inflate_the_mean_batch_size():
+    fail = [True]
+
+    def flaky_emit(room, payloads):
+        if fail[0]:
+            raise RuntimeError("socket gone")
+
+    batcher = EmitBatcher(flaky_emit, max_events=100)
+    for n in range(10):
+        batcher.add("room", {"n": n})
+    batcher.flush()
+    fail[0] = False
+    batcher.add("room", {"n": 10})
+    batcher.add("room", {"n": 11})
+    batcher.flush()
+
+    stats = batcher.get_stats()
+    assert stats["frames"] == 1
+    assert stats["failed_events"] == 10
+    assert stats["mean_batch_size"] == pytest.approx(2.0)
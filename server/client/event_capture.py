@@ -0,0 +1,225 @@
+import asyncio
+import dataclasses
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    from server.client.handler_pipeline import EventContext, LatencyHistogram
+    from server.client.load_generator import EventSink, LoadReport
+except ImportError:
+    # Imported from the server directory (Flask app)
+    from client.handler_pipeline import EventContext, LatencyHistogram
+    from client.load_generator import EventSink, LoadReport
+
+logger = logging.getLogger(__name__)
+
+
+def _to_jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        # chaturbate_poller pydantic models
+        return value.model_dump(mode="json")
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            f.name: _to_jsonable(getattr(value, f.name))
+            for f in dataclasses.fields(value)
+        }
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: _to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(item) for item in value]
+    return value
+
+
+def _to_namespace(value: Any) -> Any:
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _to_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(item) for item in value]
+    return value
+
+
+def decode_event(data: Dict[str, Any], captured_at: float) -> Any:
+    """Rebuild an event object from its captured form.
+
+    The result supports the attribute access handlers use
+    (``event.object.user.username`` and so on). Events captured without a
+    ``timestamp`` get the capture time.
+
+    Args:
+        data: The captured event fields
+        captured_at: Epoch seconds when the event was captured
+
+    Returns:
+        The event
+    """
+    event = _to_namespace(data)
+    timestamp = data.get("timestamp")
+    event.timestamp = (
+        datetime.fromisoformat(timestamp)
+        if timestamp
+        else datetime.fromtimestamp(captured_at)
+    )
+    return event
+
+
+class EventCaptureWriter:
+    """Append-only, gzip-compressed NDJSON log of raw events.
+
+    Each line is ``{"ts": <epoch seconds>, "method": ..., "event": {...}}``.
+    The compressor is sync-flushed every ``flush_interval`` seconds, so after
+    a crash everything up to the last flush can still be read. Reopening an
+    existing log appends a new gzip member, which readers see as one stream.
+
+    Attributes:
+        path: The log file
+        stats: Counters for captured events and errors
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0) -> None:
+        """Open the log for appending.
+
+        Args:
+            path: The log file, conventionally ``*.ndjson.gz``
+            flush_interval: Seconds between compressor flushes
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.flush_interval = flush_interval
+        self.stats: Dict[str, int] = {"captured": 0, "errors": 0}
+        self._file = gzip.open(path, "ab")
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def write(self, method: str, event: Any, ts: Optional[float] = None) -> None:
+        """Append one event.
+
+        Args:
+            method: The event method
+            event: The raw event (pydantic model, dataclass or dict)
+            ts: Epoch seconds the event was received (defaults to now)
+        """
+        try:
+            line = json.dumps(
+                {
+                    "ts": time.time() if ts is None else ts,
+                    "method": method,
+                    "event": _to_jsonable(event),
+                },
+                ensure_ascii=False,
+                default=str,
+            )
+        except (TypeError, ValueError) as e:
+            self.stats["errors"] += 1
+            logger.error(f"Could not capture {method} event: {e}")
+            return
+
+        with self._lock:
+            self._file.write(line.encode("utf-8") + b"\n")
+            self.stats["captured"] += 1
+            if time.monotonic() - self._flushed_at >= self.flush_interval:
+                self._file.flush(zlib.Z_SYNC_FLUSH)
+                self._flushed_at = time.monotonic()
+
+    def close(self) -> None:
+        """Flush and close the log."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    async def capture_stage(self, ctx: EventContext) -> None:
+        """HandlerPipeline stage that captures the raw event."""
+        self.write(ctx.method, ctx.event)
+
+
+def read_capture(path: str) -> Iterator[Tuple[float, str, Dict[str, Any]]]:
+    """Read a capture log.
+
+    A truncated tail (e.g. after a crash) ends the iteration instead of
+    raising.
+
+    Args:
+        path: The log file
+
+    Yields:
+        Tuples of (epoch seconds, method, event fields)
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                record = json.loads(line)
+                yield record["ts"], record["method"], record["event"]
+        except EOFError:
+            logger.warning(f"Capture log {path} ends with a truncated record")
+
+
+async def replay_capture(path: str, sink: EventSink, speed: float = 1.0) -> LoadReport:
+    """Feed a capture log to a sink, preserving its timing.
+
+    Args:
+        path: The log file
+        sink: Receives each (method, event)
+        speed: Time scale; 1 replays in real time, 10 ten times faster and
+            0 as fast as the sink allows
+
+    Returns:
+        Throughput, sink latency and schedule lag of the replay
+    """
+    if speed < 0:
+        raise ValueError("speed must not be negative")
+
+    latency = LatencyHistogram()
+    lag = LatencyHistogram()
+    methods: Dict[str, int] = {}
+    sent = errors = 0
+    first_ts: Optional[float] = None
+    last_ts = 0.0
+    started = time.perf_counter()
+
+    for ts, method, data in read_capture(path):
+        event = decode_event(data, ts)
+        if first_ts is None:
+            first_ts = ts
+        last_ts = ts
+
+        if speed:
+            due = (ts - first_ts) / speed
+            now = time.perf_counter() - started
+            if due > now:
+                await asyncio.sleep(due - now)
+                now = time.perf_counter() - started
+            lag.observe(max(0.0, now - due))
+
+        call_started = time.perf_counter()
+        try:
+            await sink(method, event)
+        except Exception as e:
+            errors += 1
+            logger.debug(f"Replay sink failed on {method}: {e}")
+        latency.observe(time.perf_counter() - call_started)
+        sent += 1
+        methods[method] = methods.get(method, 0) + 1
+
+    recorded = last_ts - first_ts if first_ts is not None else 0.0
+    return LoadReport(
+        events=sent,
+        errors=errors,
+        duration=time.perf_counter() - started,
+        target_rate=sent / recorded * speed if recorded and speed else 0.0,
+        latency=latency,
+        lag=lag,
+        methods=methods,
+    )
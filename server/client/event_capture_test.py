@@ -0,0 +1,95 @@
+import gzip
+
+import pytest
+
+from server.client.event_capture import (
+    EventCaptureWriter,
+    read_capture,
+    replay_capture,
+)
+from server.client.handler_pipeline import HandlerPipeline
+from server.client.load_generator import (
+    MockEvent,
+    MockTip,
+    MockTipObject,
+    MockUser,
+)
+
+
+def tip_event(username, tokens):
+    return MockEvent(
+        object=MockTipObject(user=MockUser(username), tip=MockTip(tokens, "hi")),
+        id=f"{username}-{tokens}",
+    )
+
+
+@pytest.mark.asyncio
+async def test_capture_stage_and_replay_round_trip(tmp_path):
+    path = str(tmp_path / "capture.ndjson.gz")
+    writer = EventCaptureWriter(path)
+    pipeline = HandlerPipeline()
+    pipeline.add_stage("capture", writer.capture_stage, required=False)
+    await pipeline.run("tip", tip_event("alice", 25))
+    writer.write("chatMessage", {"object": {"user": {"username": "bob"}}}, ts=2.0)
+    writer.close()
+
+    # Reopening appends a second gzip member
+    writer = EventCaptureWriter(path)
+    writer.write("tip", tip_event("carol", 5), ts=3.0)
+    writer.close()
+
+    records = list(read_capture(path))
+    assert [method for _, method, _ in records] == ["tip", "chatMessage", "tip"]
+
+    seen = []
+
+    async def sink(method, event):
+        seen.append((method, event))
+
+    report = await replay_capture(path, sink, speed=0)
+
+    assert report.events == 3
+    method, event = seen[0]
+    assert event.object.user.username == "alice"
+    assert event.object.tip.tokens == 25
+    assert event.id == "alice-25"
+    assert event.timestamp.year > 2000
+    # Events captured without a timestamp get the capture time
+    assert seen[1][1].timestamp.timestamp() == pytest.approx(2.0)
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    path = str(tmp_path / "capture.ndjson.gz")
+    writer = EventCaptureWriter(path, flush_interval=0)
+    for tokens in range(1, 4):
+        writer.write("tip", tip_event("dave", tokens))
+    writer._file.fileobj.flush()
+
+    # Simulate a crash: copy what is on disk without closing the stream
+    with open(path, "rb") as f:
+        data = f.read()
+    crashed = str(tmp_path / "crashed.ndjson.gz")
+    with open(crashed, "wb") as f:
+        f.write(data)
+    writer.close()
+
+    assert len(list(read_capture(crashed))) == 3
+    with gzip.open(path, "rt") as f:
+        assert len(f.readlines()) == 3
+
+
+@pytest.mark.asyncio
+async def test_replay_speed_scales_recorded_timing(tmp_path):
+    path = str(tmp_path / "capture.ndjson.gz")
+    writer = EventCaptureWriter(path)
+    writer.write("tip", tip_event("erin", 1), ts=100.0)
+    writer.write("tip", tip_event("erin", 2), ts=100.5)
+    writer.close()
+
+    async def sink(method, event):
+        pass
+
+    report = await replay_capture(path, sink, speed=10)
+
+    assert 0.04 <= report.duration < 0.5
+    assert report.target_rate == pytest.approx(40.0)
@@ -0,0 +1,119 @@
+import hashlib
+import time
+from typing import Any, Callable, Dict, Set
+
+
+def event_key(method: str, event: Any) -> int:
+    """Compute the deduplication key of an event.
+
+    Events carrying an ID are keyed on it. Otherwise the key is a stable hash
+    of the event type, user, tip amount, message and timestamp, which is what
+    identifies a redelivered event.
+
+    Args:
+        method: The event method, e.g. "tip"
+        event: The event payload
+
+    Returns:
+        A 64-bit key
+    """
+    event_id = getattr(event, "id", None)
+    if event_id:
+        material = f"id\x00{event_id}"
+    else:
+        obj = getattr(event, "object", None)
+        user = getattr(obj, "user", None)
+        tip = getattr(obj, "tip", None)
+        timestamp = getattr(event, "timestamp", None)
+        material = "\x00".join(
+            [
+                method,
+                str(getattr(user, "username", "")),
+                str(getattr(tip, "tokens", "")),
+                str(getattr(obj, "message", "") or getattr(tip, "message", "")),
+                timestamp.isoformat() if timestamp is not None else "",
+            ]
+        )
+    digest = hashlib.blake2b(material.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class EventDeduplicator:
+    """Drops events that were already seen within a time window.
+
+    Keys are kept in two rotating generations: a key is a duplicate if it is
+    in either, and the older generation is discarded every ``window_seconds``
+    (or as soon as the current one reaches ``max_entries``). Every event is
+    therefore remembered for at least one window while memory stays bounded
+    by two generations of 64-bit keys.
+
+    Attributes:
+        window_seconds: Minimum time an event is remembered
+        max_entries: Maximum number of keys per generation
+        stats: Counters for checked events, duplicates and rotations
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 600.0,
+        max_entries: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the deduplicator.
+
+        Args:
+            window_seconds: Minimum time an event is remembered
+            max_entries: Maximum number of keys per generation
+            clock: Monotonic time source
+        """
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._current: Set[int] = set()
+        self._previous: Set[int] = set()
+        self._rotated_at = clock()
+        self.stats: Dict[str, int] = {"checked": 0, "duplicates": 0, "rotations": 0}
+
+    def __len__(self) -> int:
+        return len(self._current) + len(self._previous)
+
+    def _rotate(self) -> None:
+        self._previous = self._current
+        self._current = set()
+        self._rotated_at = self._clock()
+        self.stats["rotations"] += 1
+
+    def is_duplicate(self, method: str, event: Any) -> bool:
+        """Check an event and remember it.
+
+        Args:
+            method: The event method, e.g. "tip"
+            event: The event payload
+
+        Returns:
+            True if the event was already seen and should be skipped
+        """
+        if (
+            self._clock() - self._rotated_at >= self.window_seconds
+            or len(self._current) >= self.max_entries
+        ):
+            self._rotate()
+
+        self.stats["checked"] += 1
+        key = event_key(method, event)
+        if key in self._current or key in self._previous:
+            self.stats["duplicates"] += 1
+            return True
+        self._current.add(key)
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get dedup counters, hit rate and the number of remembered keys."""
+        checked = self.stats["checked"]
+        return {
+            **self.stats,
+            "hit_rate": (
+                round(self.stats["duplicates"] / checked, 4) if checked else 0.0
+            ),
+            "size": len(self),
+        }
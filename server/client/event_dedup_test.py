@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from server.client.event_dedup import EventDeduplicator, event_key
+
+TIMESTAMP = datetime(2024, 5, 1, 12, 30, 15, 250000)
+
+
+@dataclass
+class User:
+    username: str
+
+
+@dataclass
+class Tip:
+    tokens: int
+    message: str = ""
+
+
+@dataclass
+class TipObject:
+    user: User
+    tip: Tip
+    message: str = ""
+
+
+@dataclass
+class Event:
+    object: Any
+    timestamp: datetime = TIMESTAMP
+    id: Optional[str] = None
+
+
+def tip_event(username: str = "WhaleKing", tokens: int = 100, **kwargs) -> Event:
+    return Event(object=TipObject(user=User(username), tip=Tip(tokens)), **kwargs)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_redelivered_tip_is_a_duplicate() -> None:
+    dedup = EventDeduplicator()
+
+    assert not dedup.is_duplicate("tip", tip_event())
+    assert dedup.is_duplicate("tip", tip_event())
+    assert not dedup.is_duplicate("tip", tip_event(tokens=200))
+    assert not dedup.is_duplicate("tip", tip_event(username="LoyalFan"))
+    assert dedup.get_stats()["duplicates"] == 1
+
+
+def test_event_id_takes_precedence_over_content() -> None:
+    first = tip_event(id="evt-1")
+    same_content_new_id = tip_event(id="evt-2")
+
+    assert event_key("tip", first) != event_key("tip", same_content_new_id)
+    assert event_key("tip", first) == event_key("tip", tip_event(tokens=5, id="evt-1"))
+
+
+def test_events_are_remembered_for_at_least_one_window() -> None:
+    clock = FakeClock()
+    dedup = EventDeduplicator(window_seconds=60, clock=clock)
+    dedup.is_duplicate("tip", tip_event())
+
+    clock.now = 90  # rotated once: the key is in the previous generation
+    assert dedup.is_duplicate("tip", tip_event())
+
+    clock.now = 200  # rotated again: the key has expired
+    assert not dedup.is_duplicate("tip", tip_event())
+    assert dedup.stats["rotations"] == 2
+
+
+def test_memory_is_bounded_by_two_generations() -> None:
+    dedup = EventDeduplicator(max_entries=10)
+
+    for tokens in range(1, 101):
+        dedup.is_duplicate("tip", tip_event(tokens=tokens))
+
+    assert len(dedup) <= 20
@@ -0,0 +1,142 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+EventCallback = Callable[[Any], Awaitable[None]]
+
+# Every Chaturbate Events API method and the event handler method it routes to
+EVENT_ROUTES: Dict[str, str] = {
+    "broadcastStart": "handle_room_event",
+    "broadcastStop": "handle_room_event",
+    "chatMessage": "handle_chat",
+    "fanclubJoin": "handle_user_event",
+    "follow": "handle_user_event",
+    "mediaPurchase": "handle_media_purchase",
+    "privateMessage": "handle_private_message",
+    "roomSubjectChange": "handle_room_event",
+    "tip": "handle_tip",
+    "unfollow": "handle_user_event",
+    "userEnter": "handle_user_event",
+    "userLeave": "handle_user_event",
+}
+
+
+def _build_chain(subscribers: List[EventCallback]) -> EventCallback:
+    if len(subscribers) == 1:
+        return subscribers[0]
+
+    handlers = tuple(subscribers)
+
+    async def chain(event: Any) -> None:
+        first_error: Optional[Exception] = None
+        for handler in handlers:
+            try:
+                await handler(event)
+            except Exception as e:
+                logger.error(f"Event subscriber {handler!r} failed: {e}")
+                first_error = first_error or e
+        if first_error is not None:
+            raise first_error
+
+    return chain
+
+
+class EventRouter:
+    """Routes events to their subscribers with one dict lookup.
+
+    Each event method has an ordered list of subscriber coroutines. The list
+    is compiled into a single callable whenever subscriptions change, so
+    dispatching an event never inspects it or walks the subscriber list
+    itself. A failing subscriber does not stop the rest of the chain; the
+    first error is re-raised once every subscriber has run.
+
+    Attributes:
+        chains: Compiled handler per event method; the same dict object is
+            updated in place, so consumers holding it see new subscriptions
+    """
+
+    def __init__(
+        self, routes: Optional[Mapping[str, List[EventCallback]]] = None
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            routes: Initial subscribers per event method
+        """
+        self._subscribers: Dict[str, List[EventCallback]] = {}
+        self.chains: Dict[str, EventCallback] = {}
+        for method, subscribers in (routes or {}).items():
+            for subscriber in subscribers:
+                self.subscribe(method, subscriber)
+
+    @classmethod
+    def from_handler(
+        cls, handler: Any, routes: Mapping[str, str] = EVENT_ROUTES
+    ) -> "EventRouter":
+        """Build a router from a routing table of handler method names.
+
+        Args:
+            handler: The event handler whose methods receive events
+            routes: Mapping of event method to handler method name
+
+        Returns:
+            A router with one subscriber per event method
+        """
+        return cls(
+            {method: [getattr(handler, name)] for method, name in routes.items()}
+        )
+
+    @property
+    def methods(self) -> List[str]:
+        """Event methods that have at least one subscriber."""
+        return sorted(self.chains)
+
+    def subscribe(self, method: str, handler: EventCallback) -> None:
+        """Add a subscriber to the end of an event method's chain.
+
+        Args:
+            method: The event method, e.g. "tip"
+            handler: Coroutine function called with the event
+        """
+        subscribers = self._subscribers.setdefault(method, [])
+        subscribers.append(handler)
+        self.chains[method] = _build_chain(subscribers)
+
+    def unsubscribe(self, method: str, handler: EventCallback) -> bool:
+        """Remove a subscriber from an event method's chain.
+
+        Args:
+            method: The event method
+            handler: The subscriber to remove
+
+        Returns:
+            True if the subscriber was removed
+        """
+        subscribers = self._subscribers.get(method, [])
+        if handler not in subscribers:
+            return False
+        subscribers.remove(handler)
+        if subscribers:
+            self.chains[method] = _build_chain(subscribers)
+        else:
+            del self._subscribers[method]
+            del self.chains[method]
+        return True
+
+    async def dispatch(self, method: str, event: Any) -> bool:
+        """Deliver an event to its subscribers.
+
+        Args:
+            method: The event method
+            event: The event payload
+
+        Returns:
+            True if the event had subscribers
+        """
+        chain = self.chains.get(method)
+        if chain is None:
+            logger.debug(f"No subscribers for event method '{method}'")
+            return False
+        await chain(event)
+        return True
@@ -0,0 +1,76 @@
+import pytest
+
+from server.client.event_dispatch import EVENT_ROUTES, EventRouter
+
+
+class Handler:
+    async def handle_tip(self, event):
+        pass
+
+    async def handle_chat(self, event):
+        pass
+
+    async def handle_private_message(self, event):
+        pass
+
+    async def handle_media_purchase(self, event):
+        pass
+
+    async def handle_user_event(self, event):
+        pass
+
+    async def handle_room_event(self, event):
+        pass
+
+
+def recorder(name, seen, fail=False):
+    async def handler(event):
+        seen.append((name, event))
+        if fail:
+            raise RuntimeError(f"{name} failed")
+
+    return handler
+
+
+def test_every_route_resolves_to_a_handler_method() -> None:
+    handler = Handler()
+    router = EventRouter.from_handler(handler)
+
+    assert router.methods == sorted(EVENT_ROUTES)
+    assert router.chains["tip"] == handler.handle_tip
+    assert router.chains["chatMessage"] == handler.handle_chat
+    assert router.chains["privateMessage"] == handler.handle_private_message
+
+
+@pytest.mark.asyncio
+async def test_subscribers_run_in_order() -> None:
+    seen = []
+    router = EventRouter({"tip": [recorder("persist", seen)]})
+    router.subscribe("tip", recorder("broadcast", seen))
+
+    assert await router.dispatch("tip", "event-1")
+    assert not await router.dispatch("follow", "event-2")
+    assert seen == [("persist", "event-1"), ("broadcast", "event-1")]
+
+
+@pytest.mark.asyncio
+async def test_failing_subscriber_does_not_stop_the_chain() -> None:
+    seen = []
+    router = EventRouter(
+        {"tip": [recorder("first", seen, fail=True), recorder("second", seen)]}
+    )
+
+    with pytest.raises(RuntimeError, match="first failed"):
+        await router.dispatch("tip", "event")
+    assert [name for name, _ in seen] == ["first", "second"]
+
+
+def test_unsubscribe_updates_the_shared_chain_dict() -> None:
+    seen = []
+    only = recorder("only", seen)
+    router = EventRouter({"tip": [only]})
+    chains = router.chains
+
+    assert router.unsubscribe("tip", only)
+    assert not router.unsubscribe("tip", only)
+    assert "tip" not in chains
@@ -0,0 +1,386 @@
+import asyncio
+import heapq
+import logging
+import os
+import pickle
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+EventCallback = Callable[[Any], Awaitable[None]]
+# Called after each handler with (method, handler seconds, queue depth)
+HandledCallback = Callable[[str, float, int], None]
+
+
+class OverflowPolicy(Enum):
+    """What to do with a new event when the work queue is full."""
+
+    BLOCK = "block"
+    DROP_OLDEST_CHAT = "drop_oldest_chat"
+    SPILL_TO_DISK = "spill_to_disk"
+
+
+# Lower values are handled first; chat is the only lane that may be dropped
+DEFAULT_PRIORITIES: Dict[str, int] = {
+    "tip": 0,
+    "mediaPurchase": 0,
+    "privateMessage": 1,
+    "broadcastStart": 2,
+    "broadcastStop": 2,
+    "follow": 2,
+    "unfollow": 2,
+    "fanclubJoin": 2,
+    "userEnter": 3,
+    "userLeave": 3,
+    "roomSubjectChange": 3,
+    "chatMessage": 3,
+}
+DROPPABLE_PRIORITY = 3
+_LATENCY_SAMPLES = 1024
+
+
+@dataclass
+class QueuedEvent:
+    """An event waiting for a handler worker.
+
+    Attributes:
+        method: The Chaturbate event method, e.g. "tip"
+        event: The event payload
+        enqueued_at: Monotonic time the event entered the queue
+        ticket: Position of the event in arrival order
+    """
+
+    method: str
+    event: Any
+    enqueued_at: float = field(default_factory=time.monotonic)
+    ticket: int = 0
+
+
+class EventWorkQueue:
+    """Bounded, prioritised work queue between the event poller and handlers.
+
+    The poller calls ``put`` (through the callbacks returned by
+    ``enqueue_handlers``) and returns immediately while a pool of worker tasks
+    runs the real handlers. Events are held in one lane per priority level, so
+    tips are always dequeued ahead of chat. When the queue is full the
+    overflow policy decides whether the poller waits, the oldest queued chat
+    message is dropped, or the event is spilled to a file and re-queued once
+    there is room again. ``checkpoint`` runs a callback once every event
+    queued before it is finished, whatever order the lanes handle them in.
+
+    Attributes:
+        handlers: Mapping of event method to handler coroutine function
+        workers: Number of concurrent handler workers
+        maxsize: Maximum number of events held in memory
+        policy: Overflow policy applied when the queue is full
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, EventCallback],
+        workers: int = 4,
+        maxsize: int = 1000,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        priorities: Optional[Dict[str, int]] = None,
+        spill_path: Optional[str] = None,
+        on_handled: Optional[HandledCallback] = None,
+    ) -> None:
+        """Initialize the work queue.
+
+        Args:
+            handlers: Mapping of event method to handler coroutine function
+            workers: Number of concurrent handler workers
+            maxsize: Maximum number of events held in memory
+            policy: Overflow policy applied when the queue is full
+            priorities: Priority per event method (defaults to DEFAULT_PRIORITIES)
+            spill_path: File used by the SPILL_TO_DISK policy
+            on_handled: Called after each handler with the method, handler
+                time in seconds and the remaining queue depth
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if workers < 1 or maxsize < 1:
+            raise ValueError("workers and maxsize must be at least 1")
+        if policy is OverflowPolicy.SPILL_TO_DISK and not spill_path:
+            raise ValueError("spill_path is required for the spill_to_disk policy")
+
+        self.handlers = handlers
+        self.workers = workers
+        self.maxsize = maxsize
+        self.policy = policy
+        self.priorities = priorities or DEFAULT_PRIORITIES
+        self.spill_path = spill_path
+        self.on_handled = on_handled
+
+        lane_count = max(max(self.priorities.values()), DROPPABLE_PRIORITY) + 1
+        self._lanes: List[Deque[QueuedEvent]] = [deque() for _ in range(lane_count)]
+        self._size = 0
+        self._unfinished = 0
+        self._spilled = 0
+        self._spill_offset = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+        # Tickets of unfinished events (a heap; finished ones are removed
+        # lazily once they reach the top) and the checkpoints waiting on them
+        self._last_ticket = 0
+        self._open_tickets: List[int] = []
+        self._finished_tickets: Set[int] = set()
+        self._checkpoints: Deque[Tuple[int, Callable[[], None]]] = deque()
+
+        self._wait_times: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self._handle_times: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self.counters: Dict[str, int] = {
+            "enqueued": 0,
+            "processed": 0,
+            "failed": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "max_depth": 0,
+        }
+
+    @property
+    def depth(self) -> int:
+        """Number of events waiting, including spilled events."""
+        return self._size + self._spilled
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker pool is running."""
+        return bool(self._worker_tasks)
+
+    def enqueue_handlers(self) -> Dict[str, EventCallback]:
+        """Build poller callbacks that enqueue events instead of handling them.
+
+        Returns:
+            Mapping of event method to an enqueueing coroutine function
+        """
+
+        def make_callback(method: str) -> EventCallback:
+            async def enqueue(event: Any) -> None:
+                await self.put(method, event)
+
+            return enqueue
+
+        return {method: make_callback(method) for method in self.handlers}
+
+    def _priority(self, method: str) -> int:
+        return self.priorities.get(method, DROPPABLE_PRIORITY)
+
+    async def start(self) -> None:
+        """Start the handler workers."""
+        if self._worker_tasks:
+            return
+        self._condition = asyncio.Condition()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(index)) for index in range(self.workers)
+        ]
+        logger.info(f"Started event work queue with {self.workers} workers")
+
+    async def stop(self, drain: bool = True, timeout: float = 10.0) -> None:
+        """Stop the handler workers.
+
+        Args:
+            drain: Whether to handle queued events before stopping
+            timeout: Maximum time to wait for the queue to drain
+        """
+        if not self._worker_tasks:
+            return
+
+        if drain:
+            try:
+                await asyncio.wait_for(self.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Event work queue did not drain within {timeout}s "
+                    f"({self.depth} events left)"
+                )
+
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        logger.info("Stopped event work queue")
+
+    async def join(self) -> None:
+        """Wait until every queued event has been handled."""
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self._unfinished == 0 and self._spilled == 0
+            )
+
+    async def put(self, method: str, event: Any) -> None:
+        """Queue an event for the handler workers.
+
+        Args:
+            method: The Chaturbate event method
+            event: The event payload
+        """
+        if method not in self.handlers:
+            logger.debug(f"No handler registered for event method '{method}'")
+            return
+        if self._condition is None:
+            raise RuntimeError("Event work queue is not running")
+
+        self._last_ticket += 1
+        item = QueuedEvent(method=method, event=event, ticket=self._last_ticket)
+        heapq.heappush(self._open_tickets, item.ticket)
+        priority = self._priority(method)
+
+        async with self._condition:
+            self.counters["enqueued"] += 1
+
+            if self._size >= self.maxsize or self._spilled:
+                if self.policy is OverflowPolicy.SPILL_TO_DISK:
+                    # Keep FIFO order with anything already on disk
+                    self._spill(item)
+                    return
+                if self.policy is OverflowPolicy.DROP_OLDEST_CHAT:
+                    self._drop_oldest_chat()
+                await self._condition.wait_for(lambda: self._size < self.maxsize)
+
+            self._push(item, priority)
+
+    def _push(self, item: QueuedEvent, priority: int) -> None:
+        self._lanes[priority].append(item)
+        self._size += 1
+        self._unfinished += 1
+        self.counters["max_depth"] = max(self.counters["max_depth"], self.depth)
+        self._condition.notify_all()
+
+    def _drop_oldest_chat(self) -> None:
+        lane = self._lanes[DROPPABLE_PRIORITY]
+        if not lane:
+            return
+        dropped = lane.popleft()
+        self._size -= 1
+        self._unfinished -= 1
+        self._finish(dropped.ticket)
+        self.counters["dropped"] += 1
+        logger.debug(f"Work queue full, dropped queued '{dropped.method}' event")
+
+    def _spill(self, item: QueuedEvent) -> None:
+        with open(self.spill_path, "ab") as f:
+            pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spilled += 1
+        self.counters["spilled"] += 1
+        self.counters["max_depth"] = max(self.counters["max_depth"], self.depth)
+
+    def _unspill(self) -> None:
+        """Move spilled events back into memory while there is room."""
+        if not self._spilled:
+            return
+        with open(self.spill_path, "rb") as f:
+            f.seek(self._spill_offset)
+            while self._spilled and self._size < self.maxsize:
+                item = pickle.load(f)  # nosec B301 - our own spill file
+                self._spilled -= 1
+                self._push(item, self._priority(item.method))
+            self._spill_offset = f.tell()
+        if not self._spilled:
+            os.remove(self.spill_path)
+            self._spill_offset = 0
+
+    async def _get(self) -> QueuedEvent:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._size > 0)
+            for lane in self._lanes:
+                if lane:
+                    item = lane.popleft()
+                    break
+            self._size -= 1
+            self._unspill()
+            self._condition.notify_all()
+            return item
+
+    async def _task_done(self, ticket: int) -> None:
+        async with self._condition:
+            self._unfinished -= 1
+            self._finish(ticket)
+            self._condition.notify_all()
+
+    def checkpoint(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` once every event queued so far is finished.
+
+        An event is finished when its handler returned or failed, or when the
+        overflow policy dropped it. Spilled events are not finished until
+        they have been read back and handled. The callback runs on the event
+        loop and must not block.
+
+        Args:
+            callback: Called without arguments
+        """
+        if self._oldest_open() > self._last_ticket:
+            callback()
+        else:
+            self._checkpoints.append((self._last_ticket, callback))
+
+    def _oldest_open(self) -> float:
+        return self._open_tickets[0] if self._open_tickets else float("inf")
+
+    def _finish(self, ticket: int) -> None:
+        self._finished_tickets.add(ticket)
+        open_tickets = self._open_tickets
+        while open_tickets and open_tickets[0] in self._finished_tickets:
+            self._finished_tickets.remove(heapq.heappop(open_tickets))
+
+        oldest = self._oldest_open()
+        while self._checkpoints and self._checkpoints[0][0] < oldest:
+            _, callback = self._checkpoints.popleft()
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Work queue checkpoint callback failed: {e}")
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            item = await self._get()
+            started = time.monotonic()
+            self._wait_times.append(started - item.enqueued_at)
+            try:
+                await self.handlers[item.method](item.event)
+                self.counters["processed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters["failed"] += 1
+                logger.error(f"Worker {index} failed handling '{item.method}': {e}")
+            finally:
+                elapsed = time.monotonic() - started
+                self._handle_times.append(elapsed)
+                if self.on_handled is not None:
+                    self.on_handled(item.method, elapsed, self.depth)
+                await self._task_done(item.ticket)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, counters and latency percentiles.
+
+        Returns:
+            Dictionary of queue metrics; latencies are in milliseconds
+        """
+        return {
+            **self.counters,
+            "depth": self.depth,
+            "spilled_pending": self._spilled,
+            "lane_depths": [len(lane) for lane in self._lanes],
+            "workers": len(self._worker_tasks),
+            "policy": self.policy.value,
+            "wait_ms": _percentiles(self._wait_times),
+            "handle_ms": _percentiles(self._handle_times),
+        }
+
+
+def _percentiles(samples: Deque[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p99": 0.0}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        "p50": round(ordered[int(last * 0.5)] * 1000, 3),
+        "p99": round(ordered[int(last * 0.99)] * 1000, 3),
+    }
@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from server.client.event_queue import EventWorkQueue, OverflowPolicy
+
+
+def recording_handlers(seen, gate=None):
+    async def handle(event):
+        if gate is not None:
+            await gate.wait()
+        seen.append(event)
+
+    return {"tip": handle, "chatMessage": handle}
+
+
+@pytest.mark.asyncio
+async def test_tips_are_handled_before_queued_chat():
+    seen = []
+    gate = asyncio.Event()
+    queue = EventWorkQueue(recording_handlers(seen, gate), workers=1)
+    await queue.start()
+
+    await queue.put("chatMessage", "blocker")
+    await asyncio.sleep(0)  # worker picks up the blocker and waits on the gate
+    await queue.put("chatMessage", "chat")
+    await queue.put("tip", "tip")
+    gate.set()
+    await queue.stop(drain=True)
+
+    assert seen == ["blocker", "tip", "chat"]
+    assert queue.get_stats()["processed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_chat_never_drops_tips():
+    seen = []
+    gate = asyncio.Event()
+    queue = EventWorkQueue(
+        recording_handlers(seen, gate),
+        workers=1,
+        maxsize=2,
+        policy=OverflowPolicy.DROP_OLDEST_CHAT,
+    )
+    await queue.start()
+
+    await queue.put("tip", "blocker")
+    await asyncio.sleep(0)
+    await queue.put("chatMessage", "chat-1")
+    await queue.put("tip", "tip-1")
+    await queue.put("chatMessage", "chat-2")  # full: drops chat-1
+    gate.set()
+    await queue.stop(drain=True)
+
+    assert seen == ["blocker", "tip-1", "chat-2"]
+    assert queue.get_stats()["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_spill_to_disk_keeps_every_event(tmp_path):
+    seen = []
+    gate = asyncio.Event()
+    spill_path = tmp_path / "spill.bin"
+    queue = EventWorkQueue(
+        recording_handlers(seen, gate),
+        workers=1,
+        maxsize=2,
+        policy=OverflowPolicy.SPILL_TO_DISK,
+        spill_path=str(spill_path),
+    )
+    await queue.start()
+
+    for index in range(6):
+        await queue.put("chatMessage", f"chat-{index}")
+    assert spill_path.exists()
+    assert queue.depth == 6
+
+    gate.set()
+    await queue.stop(drain=True)
+
+    assert seen == [f"chat-{index}" for index in range(6)]
+    assert not spill_path.exists()
+    assert queue.get_stats()["spilled"] > 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_methods_are_ignored_and_failures_counted():
+    async def failing(event):
+        raise ValueError("boom")
+
+    queue = EventWorkQueue({"tip": failing})
+    await queue.start()
+    await queue.put("userEnter", "ignored")
+    await queue.put("tip", "tip")
+    await queue.stop(drain=True)
+
+    stats = queue.get_stats()
+    assert stats["enqueued"] == 1
+    assert stats["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_wait_for_every_earlier_event():
+    seen = []
+    gate = asyncio.Event()
+    queue = EventWorkQueue(recording_handlers(seen, gate), workers=1)
+    await queue.start()
+    pages = []
+
+    queue.checkpoint(lambda: pages.append(0))
+    await queue.put("chatMessage", "chat 1")
+    await queue.put("chatMessage", "chat 2")
+    queue.checkpoint(lambda: pages.append(1))
+    await queue.put("tip", "tip")
+    queue.checkpoint(lambda: pages.append(2))
+    assert pages == [0]
+
+    gate.set()
+    await queue.join()
+    assert pages == [0, 1, 2]
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_dropped_and_failed_events_finish_their_checkpoint():
+    async def failing(event):
+        raise ValueError("bad event")
+
+    gate = asyncio.Event()
+    seen = []
+    handlers = {**recording_handlers(seen, gate), "tip": failing}
+    queue = EventWorkQueue(
+        handlers, workers=1, maxsize=1, policy=OverflowPolicy.DROP_OLDEST_CHAT
+    )
+    await queue.start()
+    pages = []
+
+    await queue.put("chatMessage", "blocker")
+    await asyncio.sleep(0)
+    await queue.put("chatMessage", "dropped")
+    await queue.put("tip", "fails")
+    queue.checkpoint(lambda: pages.append("page"))
+    assert pages == []
+
+    gate.set()
+    await queue.join()
+    assert pages == ["page"]
+    assert queue.counters["dropped"] == 1
+    assert queue.counters["failed"] == 1
+    await queue.stop()
@@ -0,0 +1,179 @@
+import heapq
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# (sequence number, socket event name, payload)
+RecentEvent = Tuple[int, str, Dict[str, Any]]
+
+
+class EventRing:
+    """Fixed-size ring of the most recent events of one room.
+
+    Sequence numbers live in a preallocated ``array`` and events in a
+    preallocated list, so memory is fixed at ``capacity`` slots whatever the
+    event rate. Sequence numbers must be appended in increasing order, which
+    lets ``since`` binary-search the ring.
+
+    Attributes:
+        capacity: Maximum number of events kept
+    """
+
+    __slots__ = ("capacity", "_seqs", "_names", "_payloads", "_start", "_size")
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._seqs = array("q", [0]) * capacity
+        self._names: List[Optional[str]] = [None] * capacity
+        self._payloads: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, seq: int, name: str, payload: Dict[str, Any]) -> None:
+        """Add an event, overwriting the oldest one when the ring is full."""
+        if self._size < self.capacity:
+            slot = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._seqs[slot] = seq
+        self._names[slot] = name
+        self._payloads[slot] = payload
+
+    def since(self, seq: int) -> List[RecentEvent]:
+        """Get the events with a sequence number above ``seq``, oldest first."""
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if self._seqs[(self._start + middle) % self.capacity] <= seq:
+                low = middle + 1
+            else:
+                high = middle
+        events = []
+        for offset in range(low, self._size):
+            slot = (self._start + offset) % self.capacity
+            events.append((self._seqs[slot], self._names[slot], self._payloads[slot]))
+        return events
+
+
+class RecentEvents:
+    """Per-room rings of recent events sharing one sequence counter.
+
+    Every recorded event gets the next global sequence number, so a client
+    that remembers the last number it saw can ask for everything newer across
+    all of its rooms. Memory is bounded by ``capacity`` events per room and
+    ``max_rooms`` rooms; the least recently written room is evicted first.
+    Readers polling for new events can block in ``wait`` instead of
+    spinning.
+
+    Attributes:
+        capacity: Maximum number of events kept per room
+        max_rooms: Maximum number of rooms kept
+        last_seq: Sequence number of the most recent event (0 if none)
+    """
+
+    def __init__(self, capacity: int = 256, max_rooms: int = 10_000) -> None:
+        """Initialize the store.
+
+        Args:
+            capacity: Maximum number of events kept per room
+            max_rooms: Maximum number of rooms kept
+        """
+        self.capacity = capacity
+        self.max_rooms = max_rooms
+        self.last_seq = 0
+        self._rings: "OrderedDict[str, EventRing]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._recorded = threading.Condition(self._lock)
+        self.stats: Dict[str, int] = {"recorded": 0, "snapshots": 0, "evicted_rooms": 0}
+
+    def record(
+        self, room: str, name: str, payload: Dict[str, Any], seq: Optional[int] = None
+    ) -> int:
+        """Store an event and stamp its payload with a sequence number.
+
+        Args:
+            room: The room the event is sent to
+            name: The socket event name
+            payload: The event payload; its ``seq`` key is set
+            seq: Sequence number already assigned by another process; a
+                number not above the last one means the numbering restarted,
+                and every older event is discarded
+
+        Returns:
+            The event's sequence number
+        """
+        with self._lock:
+            if seq is not None and seq <= self.last_seq:
+                self._rings.clear()
+            ring = self._rings.get(room)
+            if ring is None:
+                ring = self._rings[room] = EventRing(self.capacity)
+                if len(self._rings) > self.max_rooms:
+                    self._rings.popitem(last=False)
+                    self.stats["evicted_rooms"] += 1
+            else:
+                self._rings.move_to_end(room)
+
+            self.last_seq = seq if seq is not None else self.last_seq + 1
+            payload["seq"] = self.last_seq
+            ring.append(self.last_seq, name, payload)
+            self.stats["recorded"] += 1
+            self._recorded.notify_all()
+            return self.last_seq
+
+    def wait(self, seq: int, timeout: float) -> int:
+        """Block until the latest sequence number differs from ``seq``.
+
+        Any recorded event ends the wait, including one in a room the caller
+        does not read and a restarted numbering.
+
+        Args:
+            seq: The latest sequence number the caller has seen
+            timeout: Maximum seconds to wait
+
+        Returns:
+            The latest sequence number, still ``seq`` on timeout
+        """
+        with self._recorded:
+            self._recorded.wait_for(lambda: self.last_seq != seq, timeout)
+            return self.last_seq
+
+    def snapshot(
+        self, rooms: Iterable[str], since: int = 0, limit: Optional[int] = None
+    ) -> List[RecentEvent]:
+        """Get the recent events of some rooms newer than a sequence number.
+
+        Args:
+            rooms: Rooms to include
+            since: Only events with a higher sequence number are returned
+            limit: Keep only the newest ``limit`` events
+
+        Returns:
+            (seq, name, payload) tuples in sequence order
+        """
+        with self._lock:
+            per_room = [
+                self._rings[room].since(since) for room in rooms if room in self._rings
+            ]
+            self.stats["snapshots"] += 1
+        events = list(heapq.merge(*per_room, key=lambda event: event[0]))
+        if limit is not None:
+            events = events[-limit:] if limit > 0 else []
+        return events
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counters, the room count and the latest sequence number."""
+        return {
+            **self.stats,
+            "rooms": len(self._rings),
+            "capacity": self.capacity,
+            "last_seq": self.last_seq,
+        }
@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+from server.client.event_ring import EventRing, RecentEvents
+
+
+def test_ring_overwrites_oldest_and_searches_by_seq():
+    ring = EventRing(3)
+    for seq in range(1, 6):
+        ring.append(seq, "chaturbate_event", {"n": seq})
+
+    assert len(ring) == 3
+    assert [seq for seq, _, _ in ring.since(0)] == [3, 4, 5]
+    assert [payload["n"] for _, _, payload in ring.since(3)] == [4, 5]
+    assert ring.since(5) == []
+    with pytest.raises(ValueError):
+        EventRing(0)
+
+
+def test_snapshot_merges_rooms_in_sequence_order():
+    recent = RecentEvents(capacity=10)
+    recent.record("streamer:a", "chaturbate_event", {"message": "one"})
+    recent.record("user:me", "private_message", {"message": "two"})
+    payload = {"message": "three"}
+    seq = recent.record("streamer:a", "chaturbate_event", payload)
+    recent.record("streamer:b", "chaturbate_event", {"message": "other"})
+
+    assert payload["seq"] == seq == 3
+    snapshot = recent.snapshot(["streamer:a", "user:me", "missing"])
+    assert [(s, name) for s, name, _ in snapshot] == [
+        (1, "chaturbate_event"),
+        (2, "private_message"),
+        (3, "chaturbate_event"),
+    ]
+    assert [s for s, _, _ in recent.snapshot(["streamer:a", "user:me"], since=1)] == [
+        2,
+        3,
+    ]
+    assert [s for s, _, _ in recent.snapshot(["streamer:a"], limit=1)] == [3]
+    assert recent.snapshot(["streamer:a"], limit=0) == []
+
+
+def test_least_recently_written_room_is_evicted():
+    recent = RecentEvents(capacity=4, max_rooms=2)
+    recent.record("a", "chaturbate_event", {})
+    recent.record("b", "chaturbate_event", {})
+    recent.record("a", "chaturbate_event", {})
+    recent.record("c", "chaturbate_event", {})
+
+    assert recent.snapshot(["b"]) == []
+    assert len(recent.snapshot(["a", "c"])) == 3
+    assert recent.get_stats()["evicted_rooms"] == 1
+
+
+def test_sequence_numbers_assigned_elsewhere_are_kept():
+    recent = RecentEvents()
+    recent.record("a", "chaturbate_event", {}, seq=40)
+    payload = {}
+    recent.record("a", "chaturbate_event", payload, seq=42)
+
+    assert payload["seq"] == 42
+    assert recent.last_seq == 42
+    assert [s for s, _, _ in recent.snapshot(["a"], since=40)] == [42]
+    recent.record("a", "chaturbate_event", {}, seq=1)
+    assert [s for s, _, _ in recent.snapshot(["a"])] == [1]
+
+
+def test_wait_returns_when_an_event_is_recorded():
+    recent = RecentEvents()
+    recent.record("a", "chaturbate_event", {})
+    assert recent.wait(0, timeout=0) == 1
+    assert recent.wait(1, timeout=0.01) == 1
+
+    timer = threading.Timer(0.01, recent.record, ("b", "chaturbate_event", {}))
+    timer.start()
+    assert recent.wait(1, timeout=5) == 2
+    timer.join()
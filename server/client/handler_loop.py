@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOM = "default"
+
+
+class HandlerLoop:
+    """A single long-lived asyncio event loop for running event handlers.
+
+    Handler coroutines are submitted from any thread and executed on one
+    background loop thread, instead of creating a thread and an event loop per
+    event. Each room gets its own FIFO queue and worker task, so events from
+    the same room are handled strictly in submission order while different
+    rooms proceed concurrently. The number of in-flight coroutines is bounded;
+    submitters block (or are rejected) when the loop falls behind.
+
+    Attributes:
+        max_pending: Maximum number of submitted but unfinished coroutines
+        stats: Counters for submitted, completed, failed and rejected handlers
+    """
+
+    def __init__(self, max_pending: int = 1000, name: str = "handler-loop") -> None:
+        """Initialize the handler loop.
+
+        Args:
+            max_pending: Maximum number of submitted but unfinished coroutines
+            name: Name of the background thread
+        """
+        self.max_pending = max_pending
+        self.name = name
+        self.stats: Dict[str, int] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+        }
+
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._room_queues: Dict[str, asyncio.Queue] = {}
+        self._room_workers: Dict[str, asyncio.Task] = {}
+        self._started = threading.Event()
+        self._accepting = False
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Number of submitted coroutines waiting for their room worker."""
+        return sum(queue.qsize() for queue in list(self._room_queues.values()))
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the loop thread is running and accepting work."""
+        return self._accepting
+
+    def start(self) -> None:
+        """Start the background loop thread if it is not already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._loop = asyncio.new_event_loop()
+            self._started.clear()
+            self._thread = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self._thread.start()
+            self._started.wait()
+            self._accepting = True
+
+        logger.info(f"Started handler loop '{self.name}'")
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(self._started.set)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    def submit(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        room: str = DEFAULT_ROOM,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """Schedule a handler coroutine on the loop.
+
+        Args:
+            coro: The coroutine to run
+            room: Ordering key; coroutines for the same room run one at a time
+            block: Whether to wait for a free slot when the loop is saturated
+            timeout: Maximum time to wait for a free slot
+
+        Returns:
+            True if the coroutine was accepted, False if it was rejected
+        """
+        if not self._accepting or not self._slots.acquire(block, timeout):
+            coro.close()
+            self.stats["rejected"] += 1
+            logger.warning(f"Handler loop '{self.name}' rejected event for '{room}'")
+            return False
+
+        try:
+            self._loop.call_soon_threadsafe(self._enqueue, room, coro)
+        except RuntimeError:
+            # Loop closed between the check above and scheduling
+            self._slots.release()
+            coro.close()
+            self.stats["rejected"] += 1
+            return False
+
+        self.stats["submitted"] += 1
+        return True
+
+    def _enqueue(self, room: str, coro: Coroutine[Any, Any, Any]) -> None:
+        queue = self._room_queues.get(room)
+        if queue is None:
+            queue = self._room_queues[room] = asyncio.Queue()
+            self._room_workers[room] = self._loop.create_task(
+                self._room_worker(room, queue)
+            )
+        queue.put_nowait(coro)
+
+    async def _room_worker(self, room: str, queue: asyncio.Queue) -> None:
+        while True:
+            coro = await queue.get()
+            try:
+                await coro
+                self.stats["completed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"Handler for room '{room}' failed: {e}")
+            finally:
+                queue.task_done()
+                self._slots.release()
+
+    async def _drain(self) -> None:
+        await asyncio.gather(*(queue.join() for queue in self._room_queues.values()))
+
+    async def _shutdown(self) -> None:
+        for task in self._room_workers.values():
+            task.cancel()
+        await asyncio.gather(*self._room_workers.values(), return_exceptions=True)
+
+        # Discard anything left over from an incomplete drain
+        for queue in self._room_queues.values():
+            while not queue.empty():
+                queue.get_nowait().close()
+                self.stats["rejected"] += 1
+                self._slots.release()
+
+        self._room_workers.clear()
+        self._room_queues.clear()
+
+    def stop(self, drain: bool = True, timeout: float = 10.0) -> None:
+        """Stop the loop thread.
+
+        Args:
+            drain: Whether to finish queued handlers before stopping
+            timeout: Maximum time to wait for queued handlers to finish
+        """
+        with self._lock:
+            if self._thread is None:
+                return
+            self._accepting = False
+
+            if drain:
+                future = asyncio.run_coroutine_threadsafe(self._drain(), self._loop)
+                try:
+                    future.result(timeout)
+                except Exception:
+                    future.cancel()
+                    logger.warning(
+                        f"Handler loop '{self.name}' did not drain within {timeout}s"
+                    )
+
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._thread = None
+
+        logger.info(f"Stopped handler loop '{self.name}'")
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+from server.client.handler_loop import HandlerLoop
+
+
+def test_events_in_a_room_run_in_submission_order() -> None:
+    handler_loop = HandlerLoop()
+    handler_loop.start()
+    seen = []
+
+    async def handler(value):
+        # Later events finish sooner if they were allowed to overlap
+        await asyncio.sleep(0.001 * (10 - value))
+        seen.append(value)
+
+    for value in range(10):
+        assert handler_loop.submit(handler(value), room="room-a")
+    handler_loop.stop(drain=True)
+
+    assert seen == list(range(10))
+    assert handler_loop.stats["completed"] == 10
+
+
+def test_handlers_share_one_thread() -> None:
+    handler_loop = HandlerLoop()
+    handler_loop.start()
+    threads = set()
+
+    async def handler():
+        threads.add(threading.get_ident())
+
+    for index in range(20):
+        handler_loop.submit(handler(), room=f"room-{index % 3}")
+    handler_loop.stop()
+
+    assert len(threads) == 1
+
+
+def test_failed_handler_does_not_stop_room() -> None:
+    handler_loop = HandlerLoop()
+    handler_loop.start()
+    seen = []
+
+    async def failing():
+        raise ValueError("boom")
+
+    async def handler():
+        seen.append(True)
+
+    handler_loop.submit(failing())
+    handler_loop.submit(handler())
+    handler_loop.stop()
+
+    assert seen == [True]
+    assert handler_loop.stats["failed"] == 1
+
+
+def test_submit_rejects_when_saturated_or_stopped() -> None:
+    handler_loop = HandlerLoop(max_pending=1)
+    handler_loop.start()
+    release = threading.Event()
+
+    async def blocked():
+        while not release.is_set():
+            await asyncio.sleep(0.001)
+
+    async def handler():
+        pass
+
+    assert handler_loop.submit(blocked())
+    assert not handler_loop.submit(handler(), block=False)
+    release.set()
+    handler_loop.stop()
+
+    assert not handler_loop.submit(handler())
+    assert handler_loop.stats["rejected"] == 2
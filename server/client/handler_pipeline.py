@@ -0,0 +1,252 @@
+import logging
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bucket bounds in seconds, roughly 1-2.5-5 per decade from 10us to 10s
+_BUCKET_BOUNDS: Tuple[float, ...] = tuple(
+    base * scale
+    for scale in (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+    for base in (1.0, 2.5, 5.0)
+) + (10.0,)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with O(1) memory.
+
+    Percentiles are estimated as the upper bound of the bucket holding the
+    requested rank, which is accurate to the bucket resolution (1-2.5-5 per
+    decade).
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency sample.
+
+        Args:
+            seconds: The latency in seconds
+        """
+        self.counts[bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's samples to this one."""
+        for index, bucket_count in enumerate(other.counts):
+            self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        if other.max > self.max:
+            self.max = other.max
+
+    def reset(self) -> None:
+        """Discard all samples."""
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate a latency percentile.
+
+        Args:
+            fraction: The percentile as a fraction, e.g. 0.99
+
+        Returns:
+            The estimated latency in seconds (0.0 if there are no samples)
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                if index < len(_BUCKET_BOUNDS):
+                    return min(_BUCKET_BOUNDS[index], self.max)
+                return self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, float]:
+        """Summarise the histogram in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.5) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+@dataclass
+class EventContext:
+    """State passed from stage to stage for one event.
+
+    Attributes:
+        method: The event method, e.g. "tip"
+        event: The event payload
+        data: Fields extracted by earlier stages
+        point: InfluxDB point to persist, if any
+        emits: Socket.IO (event name, payload, room) to broadcast; a room of
+            None reaches every client in the namespace
+        dropped: Reason the event was dropped, or None
+    """
+
+    method: str
+    event: Any
+    data: Dict[str, Any] = field(default_factory=dict)
+    point: Any = None
+    emits: List[Tuple[str, Dict[str, Any], Optional[str]]] = field(default_factory=list)
+    dropped: Optional[str] = None
+
+    def drop(self, reason: str) -> None:
+        """Stop processing the event; later stages are skipped."""
+        self.dropped = reason
+
+
+Stage = Callable[[EventContext], Awaitable[None]]
+
+
+@dataclass
+class _StageEntry:
+    name: str
+    stage: Stage
+    required: bool
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+    drops: int = 0
+
+
+class HandlerPipeline:
+    """Ordered chain of event processing stages with per-stage metrics.
+
+    Every event runs through the stages in order. A stage may drop the event,
+    which skips the remaining stages. If a required stage raises, the event
+    is abandoned; errors in optional stages are counted and the next stage
+    still runs, so a failing InfluxDB write does not stop the broadcast.
+    Each stage records a latency histogram, an error count and a drop count.
+    """
+
+    def __init__(self) -> None:
+        self._stages: List[_StageEntry] = []
+        self._total = LatencyHistogram()
+        self._methods: Dict[str, int] = {}
+
+    @property
+    def stage_names(self) -> List[str]:
+        """Names of the stages, in order."""
+        return [entry.name for entry in self._stages]
+
+    def _index(self, name: str) -> int:
+        for index, entry in enumerate(self._stages):
+            if entry.name == name:
+                return index
+        raise KeyError(f"No pipeline stage named '{name}'")
+
+    def add_stage(
+        self,
+        name: str,
+        stage: Stage,
+        required: bool = True,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> None:
+        """Add a stage.
+
+        Args:
+            name: Unique stage name
+            stage: Coroutine function called with the EventContext
+            required: Whether an error in this stage abandons the event
+            before: Insert before the named stage
+            after: Insert after the named stage (default: append)
+
+        Raises:
+            ValueError: If the name is already used
+        """
+        if name in self.stage_names:
+            raise ValueError(f"Pipeline stage '{name}' already exists")
+        entry = _StageEntry(name=name, stage=stage, required=required)
+        if before is not None:
+            self._stages.insert(self._index(before), entry)
+        elif after is not None:
+            self._stages.insert(self._index(after) + 1, entry)
+        else:
+            self._stages.append(entry)
+
+    def replace_stage(self, name: str, stage: Stage) -> None:
+        """Swap the implementation of a stage, resetting its metrics."""
+        index = self._index(name)
+        self._stages[index] = _StageEntry(
+            name=name, stage=stage, required=self._stages[index].required
+        )
+
+    def remove_stage(self, name: str) -> None:
+        """Remove a stage."""
+        del self._stages[self._index(name)]
+
+    async def run(self, method: str, event: Any) -> EventContext:
+        """Run an event through every stage.
+
+        Args:
+            method: The event method
+            event: The event payload
+
+        Returns:
+            The final context; ``dropped`` is set if a stage stopped it
+        """
+        context = EventContext(method=method, event=event)
+        self._methods[method] = self._methods.get(method, 0) + 1
+        started = time.perf_counter()
+
+        for entry in self._stages:
+            stage_started = time.perf_counter()
+            try:
+                await entry.stage(context)
+            except Exception as e:
+                entry.errors += 1
+                logger.error(f"Pipeline stage '{entry.name}' failed on {method}: {e}")
+                if entry.required:
+                    context.drop(f"{entry.name} failed")
+            finally:
+                entry.latency.observe(time.perf_counter() - stage_started)
+
+            if context.dropped is not None:
+                entry.drops += 1
+                break
+
+        self._total.observe(time.perf_counter() - started)
+        return context
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-stage latency, error and drop counts.
+
+        Returns:
+            Dictionary with a "stages" list in pipeline order, end-to-end
+            latency and event counts per method
+        """
+        return {
+            "stages": [
+                {
+                    "name": entry.name,
+                    "required": entry.required,
+                    "errors": entry.errors,
+                    "drops": entry.drops,
+                    **entry.latency.to_dict(),
+                }
+                for entry in self._stages
+            ],
+            "total": self._total.to_dict(),
+            "events": dict(self._methods),
+        }
@@ -0,0 +1,76 @@
+import pytest
+
+from server.client.handler_pipeline import HandlerPipeline, LatencyHistogram
+
+
+def stage(name, seen, fail=False, drop=None):
+    async def run(ctx):
+        seen.append(name)
+        if fail:
+            raise RuntimeError(f"{name} failed")
+        if drop:
+            ctx.drop(drop)
+
+    return run
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for _ in range(99):
+        histogram.observe(0.0002)
+    histogram.observe(0.3)
+
+    assert histogram.percentile(0.5) == pytest.approx(0.00025)
+    assert histogram.percentile(1.0) == pytest.approx(0.3)
+    stats = histogram.to_dict()
+    assert stats["count"] == 100
+    assert stats["max_ms"] == pytest.approx(300.0)
+    assert LatencyHistogram().to_dict()["p99_ms"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_drop_skips_later_stages():
+    seen = []
+    pipeline = HandlerPipeline()
+    pipeline.add_stage("validate", stage("validate", seen))
+    pipeline.add_stage("dedup", stage("dedup", seen, drop="duplicate"))
+    pipeline.add_stage("persist", stage("persist", seen))
+
+    ctx = await pipeline.run("tip", object())
+
+    assert ctx.dropped == "duplicate"
+    assert seen == ["validate", "dedup"]
+    stats = pipeline.get_stats()
+    assert [s["drops"] for s in stats["stages"]] == [0, 1, 0]
+    assert stats["events"] == {"tip": 1}
+
+
+@pytest.mark.asyncio
+async def test_optional_stage_errors_do_not_stop_the_event():
+    seen = []
+    pipeline = HandlerPipeline()
+    pipeline.add_stage("persist", stage("persist", seen, fail=True), required=False)
+    pipeline.add_stage("broadcast", stage("broadcast", seen))
+    pipeline.add_stage("enrich", stage("enrich", seen, fail=True), before="persist")
+
+    ctx = await pipeline.run("chatMessage", object())
+    assert ctx.dropped == "enrich failed"
+    assert seen == ["enrich"]
+
+    pipeline.replace_stage("enrich", stage("enrich", []))
+    seen.clear()
+    ctx = await pipeline.run("chatMessage", object())
+    assert ctx.dropped is None
+    assert seen == ["persist", "broadcast"]
+
+    errors = {s["name"]: s["errors"] for s in pipeline.get_stats()["stages"]}
+    assert errors == {"enrich": 0, "persist": 1, "broadcast": 0}
+
+
+def test_stage_names_are_unique():
+    pipeline = HandlerPipeline()
+    pipeline.add_stage("validate", stage("validate", []))
+    with pytest.raises(ValueError):
+        pipeline.add_stage("validate", stage("validate", []))
+    pipeline.remove_stage("validate")
+    assert pipeline.stage_names == []
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from influxdb_client import Point
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedInfluxWriter:
+    """Asyncio-friendly InfluxDB writer that batches points.
+
+    Handlers call ``write`` without awaiting network I/O; points are buffered
+    and flushed from a background task when the batch is full or the flush
+    interval elapses. Each flush is a single write call made in a worker
+    thread, so one writer can be shared by every account handled on a loop.
+
+    Attributes:
+        influx_client: The InfluxDB client used for writes
+        batch_size: Number of buffered points that triggers a flush
+        flush_interval: Maximum seconds a point waits before being flushed
+        max_buffer: Points kept while InfluxDB is failing before dropping
+    """
+
+    def __init__(
+        self,
+        influx_client: Any,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer: int = 50_000,
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            influx_client: An InfluxDBClient with ``write_api``, ``bucket`` and
+                ``org``
+            batch_size: Number of buffered points that triggers a flush
+            flush_interval: Maximum seconds a point waits before being flushed
+            max_buffer: Points kept while InfluxDB is failing before dropping
+        """
+        self.influx_client = influx_client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+
+        self._buffer: Deque[Point] = deque(maxlen=max_buffer)
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {
+            "points_written": 0,
+            "batches": 0,
+            "errors": 0,
+            "dropped": 0,
+        }
+
+    @property
+    def pending(self) -> int:
+        """Number of points waiting to be flushed."""
+        return len(self._buffer)
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is not None:
+            return
+        self._batch_ready = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write any buffered points."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+
+    def write(self, point: Point) -> None:
+        """Buffer a point for the next batch.
+
+        Args:
+            point: The point to write
+        """
+        # The deque discards the oldest point once it is full
+        if len(self._buffer) == self._buffer.maxlen:
+            self.stats["dropped"] += 1
+        self._buffer.append(point)
+        if len(self._buffer) >= self.batch_size and self._batch_ready is not None:
+            self._batch_ready.set()
+
+    async def flush(self) -> None:
+        """Write all buffered points in one request."""
+        if not self._buffer:
+            return
+        batch = list(self._buffer)
+        self._buffer.clear()
+        try:
+            await asyncio.to_thread(self._write_batch, batch)
+            self.stats["points_written"] += len(batch)
+            self.stats["batches"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Failed to write batch of {len(batch)} points: {e}")
+            # Keep the points for the next attempt, newest last
+            self._buffer = deque(batch + list(self._buffer), maxlen=self.max_buffer)
+
+    def _write_batch(self, batch: List[Point]) -> None:
+        self.influx_client.write_api.write(
+            bucket=self.influx_client.bucket,
+            org=self.influx_client.org,
+            record=batch,
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._batch_ready.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get write counters and the number of pending points."""
+        return {**self.stats, "pending": self.pending}
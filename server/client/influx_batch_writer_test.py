@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from influxdb_client import Point
+
+from server.client.influx_batch_writer import BatchedInfluxWriter
+
+
+class RecordingInfluxClient:
+    bucket = "events"
+    org = "org"
+
+    def __init__(self, fail: bool = False) -> None:
+        self.batches = []
+        self.fail = fail
+        self.write_api = self
+
+    def write(self, bucket, org, record) -> None:
+        if self.fail:
+            raise ConnectionError("influx down")
+        self.batches.append(list(record))
+
+
+def point(value: int) -> Point:
+    return Point("chaturbate_events").field("value", value)
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_flushed_in_one_write() -> None:
+    client = RecordingInfluxClient()
+    writer = BatchedInfluxWriter(client, batch_size=3, flush_interval=60)
+    await writer.start()
+
+    for value in range(3):
+        writer.write(point(value))
+    await asyncio.sleep(0.05)
+
+    assert [len(batch) for batch in client.batches] == [3]
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_flushed_on_interval_and_stop() -> None:
+    client = RecordingInfluxClient()
+    writer = BatchedInfluxWriter(client, batch_size=100, flush_interval=0.02)
+    await writer.start()
+
+    writer.write(point(1))
+    await asyncio.sleep(0.1)
+    writer.write(point(2))
+    await writer.stop()
+
+    assert [len(batch) for batch in client.batches] == [1, 1]
+    assert writer.get_stats()["points_written"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_retried_and_bounded() -> None:
+    client = RecordingInfluxClient(fail=True)
+    writer = BatchedInfluxWriter(client, batch_size=100, max_buffer=3)
+
+    for value in range(5):
+        writer.write(point(value))
+    await writer.flush()
+
+    assert writer.pending == 3
+    assert writer.stats == {
+        "points_written": 0,
+        "batches": 0,
+        "errors": 1,
+        "dropped": 2,
+    }
+
+    client.fail = False
+    await writer.flush()
+    assert writer.pending == 0
+    # The oldest points were the ones dropped
+    assert [p._fields["value"] for p in client.batches[0]] == [2, 3, 4]
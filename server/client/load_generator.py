@@ -0,0 +1,354 @@
+import asyncio
+import itertools
+import logging
+import random
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from server.client.event_dispatch import EventRouter
+    from server.client.handler_pipeline import LatencyHistogram
+except ImportError:
+    # Imported from the server directory (Flask app)
+    from client.event_dispatch import EventRouter
+    from client.handler_pipeline import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Async callable receiving (method, event)
+EventSink = Callable[[str, Any], Awaitable[None]]
+
+# The original demo mix: 70% tips, 29% chat, 1% private messages
+DEFAULT_MIX: Dict[str, float] = {"tip": 70, "chatMessage": 29, "privateMessage": 1}
+
+TIP_AMOUNTS: Tuple[int, ...] = (5, 10, 25, 50, 100, 150, 200, 500, 1000)
+TIP_MESSAGES: Tuple[str, ...] = (
+    "Thanks!",
+    "Great show!",
+    "Keep it up!",
+    "You're amazing!",
+    "Love the stream!",
+    "",
+)
+CHAT_MESSAGES: Tuple[str, ...] = (
+    "Hello!",
+    "How are you?",
+    "Great stream!",
+    "What time is it?",
+    "You look amazing!",
+    "😍",
+    "Thanks for the show!",
+    "Keep up the good work!",
+    "When is the next stream?",
+    "Love your content!",
+)
+PRIVATE_MESSAGES: Tuple[str, ...] = (
+    "Hey, can we chat privately?",
+    "I love your shows! ❤️",
+    "Are you available for a private show?",
+    "Thanks for the amazing content!",
+    "Just wanted to say hi privately 😊",
+    "You're incredible!",
+    "Can I request something special?",
+    "Hope you're having a great day!",
+    "Would love to support you more",
+    "Your last show was amazing!",
+)
+
+
+# Mock objects that match the chaturbate_poller structure
+@dataclass
+class MockUser:
+    username: str
+
+
+@dataclass
+class MockTip:
+    tokens: int
+    message: str = ""
+
+
+@dataclass
+class MockTipObject:
+    user: MockUser
+    tip: MockTip
+    message: str = ""
+
+
+@dataclass
+class MockChatObject:
+    user: MockUser
+    message: str
+
+
+@dataclass
+class MockEvent:
+    object: Any
+    timestamp: datetime = None
+    id: str = ""
+
+    def __post_init__(self):
+        if self.timestamp is None:
+            self.timestamp = datetime.now()
+
+
+@dataclass
+class LoadProfile:
+    """Shape of the synthetic load.
+
+    Attributes:
+        rate: Target events per second outside bursts
+        mix: Relative weight per event method ("tip", "chatMessage",
+            "privateMessage")
+        users: Size of the user population
+        zipf_exponent: Skew of user activity; user k is picked with weight
+            1 / k**zipf_exponent (0 means uniform)
+        burst_interval: Seconds between the starts of two bursts (0 disables
+            bursts)
+        burst_duration: Length of a burst in seconds
+        burst_multiplier: Rate multiplier during a burst
+        seed: Seed for event content; the same seed yields the same events
+    """
+
+    rate: float = 1000.0
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    users: int = 1000
+    zipf_exponent: float = 1.1
+    burst_interval: float = 0.0
+    burst_duration: float = 1.0
+    burst_multiplier: float = 5.0
+    seed: Optional[int] = None
+
+    def rate_at(self, elapsed: float) -> float:
+        """Target rate at a point in the run, accounting for bursts."""
+        if (
+            self.burst_interval > 0
+            and elapsed % self.burst_interval < self.burst_duration
+        ):
+            return self.rate * self.burst_multiplier
+        return self.rate
+
+
+class ZipfSampler:
+    """Draws ranks 0..n-1 with probability proportional to 1 / (rank+1)**s.
+
+    Cumulative weights are computed once, so each draw is one random number
+    and a binary search.
+    """
+
+    def __init__(self, n: int, exponent: float, rng: random.Random) -> None:
+        if n < 1:
+            raise ValueError("population must contain at least one user")
+        self._cumulative = list(
+            itertools.accumulate(1.0 / (rank**exponent) for rank in range(1, n + 1))
+        )
+        self._rng = rng
+
+    def sample(self) -> int:
+        """Draw one rank."""
+        target = self._rng.random() * self._cumulative[-1]
+        return min(bisect_right(self._cumulative, target), len(self._cumulative) - 1)
+
+
+class SyntheticEventSource:
+    """Deterministic stream of (method, event) pairs for a load profile.
+
+    Event content depends only on the profile's seed. Every event carries a
+    unique ``id`` so deduplication never drops generated load.
+    """
+
+    def __init__(
+        self, profile: LoadProfile, usernames: Optional[Sequence[str]] = None
+    ) -> None:
+        """Initialize the source.
+
+        Args:
+            profile: The load profile
+            usernames: User population, most active first (defaults to
+                ``profile.users`` generated names)
+        """
+        if not profile.mix or min(profile.mix.values()) < 0:
+            raise ValueError("mix must have non-negative weights")
+        self.rng = random.Random(profile.seed)
+        self.usernames: List[str] = (
+            list(usernames)
+            if usernames
+            else [f"user{rank:06d}" for rank in range(profile.users)]
+        )
+        self._methods = list(profile.mix)
+        self._method_weights = list(itertools.accumulate(profile.mix.values()))
+        self._users = ZipfSampler(len(self.usernames), profile.zipf_exponent, self.rng)
+        self._run = f"{time.time_ns():x}"
+        self._counter = itertools.count()
+
+    def next_event(self) -> Tuple[str, MockEvent]:
+        """Build the next event.
+
+        Returns:
+            The event method and the event
+        """
+        rng = self.rng
+        method = rng.choices(self._methods, cum_weights=self._method_weights)[0]
+        user = MockUser(username=self.usernames[self._users.sample()])
+        if method == "tip":
+            message = rng.choice(TIP_MESSAGES)
+            obj = MockTipObject(
+                user=user,
+                tip=MockTip(tokens=rng.choice(TIP_AMOUNTS), message=message),
+                message=message,
+            )
+        elif method == "privateMessage":
+            obj = MockChatObject(user=user, message=rng.choice(PRIVATE_MESSAGES))
+        else:
+            obj = MockChatObject(user=user, message=rng.choice(CHAT_MESSAGES))
+        return method, MockEvent(object=obj, id=f"{self._run}-{next(self._counter)}")
+
+
+@dataclass
+class LoadReport:
+    """Outcome of a load run.
+
+    Attributes:
+        events: Events delivered to the sink
+        errors: Events whose sink call raised
+        duration: Wall-clock length of the run in seconds
+        target_rate: Configured base rate
+        latency: Sink latency per event
+        lag: How late events were delivered relative to their schedule
+        methods: Events per method
+    """
+
+    events: int
+    errors: int
+    duration: float
+    target_rate: float
+    latency: LatencyHistogram
+    lag: LatencyHistogram
+    methods: Dict[str, int]
+
+    @property
+    def throughput(self) -> float:
+        """Achieved events per second."""
+        return self.events / self.duration if self.duration else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarise the run; latencies are in milliseconds."""
+        return {
+            "events": self.events,
+            "errors": self.errors,
+            "duration_s": round(self.duration, 3),
+            "target_rate": round(self.target_rate, 1),
+            "throughput": round(self.throughput, 1),
+            "latency": self.latency.to_dict(),
+            "lag": self.lag.to_dict(),
+            "methods": dict(self.methods),
+        }
+
+
+class LoadGenerator:
+    """Replays a load profile against an event sink at a paced rate.
+
+    Events are scheduled at ``1 / rate`` intervals (shorter during bursts)
+    and delivered one at a time. When the sink keeps up, the generator sleeps
+    until the next event is due; when it falls behind, events are sent back
+    to back and the delay shows up as schedule lag. Comparing throughput with
+    the target rate therefore shows where ingest saturates.
+    """
+
+    def __init__(
+        self, profile: LoadProfile, usernames: Optional[Sequence[str]] = None
+    ) -> None:
+        """Initialize the generator.
+
+        Args:
+            profile: The load profile
+            usernames: User population, most active first
+        """
+        if profile.rate <= 0:
+            raise ValueError("rate must be positive")
+        self.profile = profile
+        self.source = SyntheticEventSource(profile, usernames)
+
+    async def run(
+        self,
+        sink: EventSink,
+        events: Optional[int] = None,
+        duration: Optional[float] = None,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> LoadReport:
+        """Generate load until a limit is reached.
+
+        Args:
+            sink: Receives each (method, event)
+            events: Stop after this many events
+            duration: Stop after this many seconds
+            should_stop: Polled before each event; stop when it returns True
+
+        Returns:
+            Throughput, latency and lag of the run
+        """
+        if events is None and duration is None and should_stop is None:
+            raise ValueError("events, duration or should_stop is required")
+
+        latency = LatencyHistogram()
+        lag = LatencyHistogram()
+        methods: Dict[str, int] = {}
+        sent = errors = 0
+        started = time.perf_counter()
+        due = 0.0
+
+        while (events is None or sent < events) and not (should_stop and should_stop()):
+            now = time.perf_counter() - started
+            if duration is not None and now >= duration:
+                break
+            if due > now:
+                await asyncio.sleep(due - now)
+                now = time.perf_counter() - started
+            lag.observe(max(0.0, now - due))
+
+            method, event = self.source.next_event()
+            call_started = time.perf_counter()
+            try:
+                await sink(method, event)
+            except Exception as e:
+                errors += 1
+                logger.debug(f"Load sink failed on {method}: {e}")
+            latency.observe(time.perf_counter() - call_started)
+
+            sent += 1
+            methods[method] = methods.get(method, 0) + 1
+            due += 1.0 / self.profile.rate_at(due)
+
+        return LoadReport(
+            events=sent,
+            errors=errors,
+            duration=time.perf_counter() - started,
+            target_rate=self.profile.rate,
+            latency=latency,
+            lag=lag,
+            methods=methods,
+        )
+
+
+async def noop_sink(method: str, event: Any) -> None:
+    """Sink that discards events, for measuring generator overhead."""
+
+
+def handler_sink(handler: Any) -> EventSink:
+    """Build a sink that routes events to an event handler's methods.
+
+    Args:
+        handler: A ChaturbateClientEventHandler (or subclass)
+
+    Returns:
+        A sink dispatching through the standard routing table
+    """
+    router = EventRouter.from_handler(handler)
+
+    async def sink(method: str, event: Any) -> None:
+        await router.dispatch(method, event)
+
+    return sink
@@ -0,0 +1,90 @@
+import pytest
+
+from server.client.load_generator import (
+    LoadGenerator,
+    LoadProfile,
+    SyntheticEventSource,
+    handler_sink,
+)
+
+
+def describe(event):
+    obj = event.object
+    tip = getattr(obj, "tip", None)
+    return obj.user.username, obj.message, tip.tokens if tip else None
+
+
+def test_same_seed_yields_same_events():
+    first = SyntheticEventSource(LoadProfile(seed=7))
+    second = SyntheticEventSource(LoadProfile(seed=7))
+
+    for _ in range(50):
+        (method_a, event_a), (method_b, event_b) = (
+            first.next_event(),
+            second.next_event(),
+        )
+        assert method_a == method_b
+        assert describe(event_a) == describe(event_b)
+        assert event_a.id != event_b.id
+
+
+def test_zipf_population_and_mix():
+    source = SyntheticEventSource(
+        LoadProfile(
+            users=100, zipf_exponent=1.2, mix={"tip": 1, "chatMessage": 1}, seed=3
+        )
+    )
+    users = {}
+    methods = set()
+    for _ in range(5000):
+        method, event = source.next_event()
+        methods.add(method)
+        users[event.object.user.username] = users.get(event.object.user.username, 0) + 1
+
+    assert methods == {"tip", "chatMessage"}
+    assert users["user000000"] > 10 * users.get("user000099", 0)
+
+
+def test_bursts_raise_the_rate():
+    profile = LoadProfile(
+        rate=100, burst_interval=10, burst_duration=2, burst_multiplier=4
+    )
+    assert profile.rate_at(1.0) == 400
+    assert profile.rate_at(5.0) == 100
+    assert profile.rate_at(11.0) == 400
+
+
+@pytest.mark.asyncio
+async def test_run_reports_throughput_and_routes_to_handler():
+    class Handler:
+        def __init__(self):
+            self.seen = []
+
+        async def handle_tip(self, event):
+            self.seen.append("tip")
+
+        async def handle_chat(self, event):
+            raise RuntimeError("boom")
+
+        async def handle_private_message(self, event):
+            self.seen.append("privateMessage")
+
+        async def handle_media_purchase(self, event):
+            pass
+
+        async def handle_user_event(self, event):
+            pass
+
+        async def handle_room_event(self, event):
+            pass
+
+    handler = Handler()
+    generator = LoadGenerator(LoadProfile(rate=100_000, seed=1))
+    report = await generator.run(handler_sink(handler), events=500)
+
+    assert report.events == 500
+    assert report.errors == report.methods.get("chatMessage", 0) > 0
+    assert len(handler.seen) == 500 - report.errors
+    stats = report.to_dict()
+    assert stats["throughput"] > 0
+    assert stats["latency"]["count"] == 500
@@ -0,0 +1,79 @@
+import json
+from typing import Any, Dict, Tuple
+
+try:
+    import msgpack
+except ImportError:
+    # msgpack is optional; clients fall back to JSON
+    msgpack = None
+
+# Plain Socket.IO payloads, serialised by Socket.IO itself
+OBJECT_ENCODING = "object"
+# Pre-encoded payloads, sent as one binary attachment shared by every socket
+JSON_ENCODING = "json"
+MSGPACK_ENCODING = "msgpack"
+
+
+def _encode_json(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Pre-encoded formats supported by this process, JSON first."""
+    if msgpack is None:
+        return (JSON_ENCODING,)
+    return (JSON_ENCODING, MSGPACK_ENCODING)
+
+
+def encode_payload(payload: Any, encoding: str) -> bytes:
+    """Serialise a payload in a pre-encoded format.
+
+    Args:
+        payload: A JSON-compatible value
+        encoding: One of ``available_encodings()``
+
+    Returns:
+        The encoded bytes
+
+    Raises:
+        ValueError: If the encoding is not available
+    """
+    if encoding == JSON_ENCODING:
+        return _encode_json(payload)
+    if encoding == MSGPACK_ENCODING and msgpack is not None:
+        return msgpack.packb(payload, use_bin_type=True)
+    raise ValueError(f"Unsupported payload encoding '{encoding}'")
+
+
+class EncodedPayload:
+    """A payload that is serialised at most once per encoding.
+
+    The same instance is handed to every room variant of a broadcast, so a
+    payload reaching thousands of sockets is encoded once per format and the
+    resulting buffer is shared by all of them.
+
+    Attributes:
+        payload: The original JSON-compatible value
+    """
+
+    __slots__ = ("payload", "_encoded")
+
+    def __init__(self, payload: Any) -> None:
+        self.payload = payload
+        self._encoded: Dict[str, bytes] = {}
+
+    def encode(self, encoding: str) -> bytes:
+        """Get the payload in an encoding, serialising it on first use.
+
+        Args:
+            encoding: One of ``available_encodings()``
+
+        Returns:
+            The cached encoded bytes
+        """
+        encoded = self._encoded.get(encoding)
+        if encoded is None:
+            encoded = self._encoded[encoding] = encode_payload(self.payload, encoding)
+        return encoded
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from server.client import payload_encoding
+from server.client.payload_encoding import (
+    JSON_ENCODING,
+    EncodedPayload,
+    available_encodings,
+    encode_payload,
+)
+
+
+def test_json_encoding_is_compact_utf8():
+    encoded = encode_payload({"username": "Zoë", "amount": 5}, JSON_ENCODING)
+
+    assert encoded == '{"username":"Zoë","amount":5}'.encode("utf-8")
+    assert JSON_ENCODING in available_encodings()
+
+
+def test_encoded_payload_serialises_once_per_encoding(monkeypatch):
+    calls = []
+    real_encode = payload_encoding.encode_payload
+
+    def counting_encode(payload, encoding):
+        calls.append(encoding)
+        return real_encode(payload, encoding)
+
+    monkeypatch.setattr(payload_encoding, "encode_payload", counting_encode)
+    encoded = EncodedPayload([{"type": "chat", "message": "hi"}])
+
+    first = encoded.encode(JSON_ENCODING)
+    assert encoded.encode(JSON_ENCODING) is first
+    assert json.loads(first) == [{"type": "chat", "message": "hi"}]
+    assert calls == [JSON_ENCODING]
+
+
+def test_unknown_encoding_is_rejected(monkeypatch):
+    monkeypatch.setattr(payload_encoding, "msgpack", None)
+
+    assert available_encodings() == (JSON_ENCODING,)
+    with pytest.raises(ValueError):
+        encode_payload({}, "msgpack")
+    with pytest.raises(ValueError):
+        encode_payload({}, "xml")
@@ -0,0 +1,183 @@
+import json
+import logging
+import os
+import random
+import re
+from typing import Optional
+
+try:
+    from chaturbate_poller.exceptions import AuthenticationError, NotFoundError
+except ImportError:
+    AuthenticationError = NotFoundError = None
+
+logger = logging.getLogger(__name__)
+
+FATAL_ERRORS = tuple(
+    error for error in (AuthenticationError, NotFoundError, PermissionError) if error
+)
+
+DEFAULT_CURSOR_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "cursors",
+)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is None:
+        status = getattr(error, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Decide whether a failed session should be retried.
+
+    Authentication and not-found errors, and HTTP client errors other than
+    timeouts and rate limiting, will fail the same way on every attempt.
+    Everything else (network errors, timeouts, server errors, dropped
+    connections) is treated as transient.
+
+    Args:
+        error: The exception that ended the session
+
+    Returns:
+        True if reconnecting may succeed
+    """
+    if FATAL_ERRORS and isinstance(error, FATAL_ERRORS):
+        return False
+    status = _status_code(error)
+    if status is not None and 400 <= status < 500:
+        return status in (408, 429)
+    return True
+
+
+def is_expired_cursor_error(error: BaseException) -> bool:
+    """Whether an error means the resume cursor is expired or unknown.
+
+    The events API answers a stale ``nextUrl`` with 404. Only then may the
+    cursor be discarded; any other fatal error must leave it in place so a
+    later run can still resume without a gap.
+
+    Args:
+        error: The exception that ended the session
+
+    Returns:
+        True if retrying from the live edge is the only way forward
+    """
+    if NotFoundError is not None and isinstance(error, NotFoundError):
+        return True
+    return _status_code(error) == 404
+
+
+class ReconnectBackoff:
+    """Capped exponential backoff with full jitter.
+
+    Each delay is drawn uniformly from ``[0, min(cap, base * 2 ** attempt)]``,
+    so many accounts failing at once spread their reconnects out instead of
+    retrying in lockstep.
+
+    Attributes:
+        base: Upper bound of the first delay in seconds
+        cap: Maximum delay in seconds
+        attempt: Number of consecutive failures so far
+    """
+
+    def __init__(
+        self, base: float = 1.0, cap: float = 300.0, rng: Optional[random.Random] = None
+    ) -> None:
+        """Initialize the backoff.
+
+        Args:
+            base: Upper bound of the first delay in seconds
+            cap: Maximum delay in seconds
+            rng: Random number generator (for deterministic tests)
+        """
+        self.base = base
+        self.cap = cap
+        self.attempt = 0
+        self._rng = rng or random.Random()
+
+    def next_delay(self) -> float:
+        """Get the delay before the next attempt and count the failure."""
+        ceiling = min(self.cap, self.base * 2 ** min(self.attempt, 32))
+        self.attempt += 1
+        return self._rng.uniform(0, ceiling)
+
+    def reset(self) -> None:
+        """Start over after a successful request."""
+        self.attempt = 0
+
+
+class CursorStore:
+    """Persists the poller's ``nextUrl`` so sessions resume where they stopped.
+
+    The cursor is written atomically once every event of the pages before
+    it has been handled. Without a path the cursor is only kept in memory.
+
+    Attributes:
+        path: File the cursor is stored in, or None for memory only
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """Initialize the store.
+
+        Args:
+            path: File the cursor is stored in, or None for memory only
+        """
+        self.path = path
+        self._cursor: Optional[str] = None
+        self._loaded = path is None
+
+    @classmethod
+    def for_account(
+        cls, username: str, directory: Optional[str] = None
+    ) -> "CursorStore":
+        """Create a store with one file per account.
+
+        Args:
+            username: Chaturbate account username
+            directory: Directory for cursor files (or uses CHATURBATE_CURSOR_DIR
+                env var, defaulting to server/data/cursors)
+
+        Returns:
+            The cursor store
+        """
+        directory = directory or os.getenv("CHATURBATE_CURSOR_DIR", DEFAULT_CURSOR_DIR)
+        filename = re.sub(r"[^\w.-]", "_", username) + ".json"
+        return cls(os.path.join(directory, filename))
+
+    def load(self) -> Optional[str]:
+        """Get the saved cursor, or None to start from the live edge."""
+        if not self._loaded:
+            self._loaded = True
+            try:
+                with open(self.path) as f:
+                    self._cursor = json.load(f).get("next_url")
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable cursor file {self.path}: {e}")
+        return self._cursor
+
+    def save(self, cursor: Optional[str]) -> None:
+        """Store the cursor to resume from.
+
+        Args:
+            cursor: The poller's next URL, or None to clear it
+        """
+        if cursor == self._cursor and self._loaded:
+            return
+        self._cursor = cursor
+        self._loaded = True
+        if self.path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"next_url": cursor}, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save cursor to {self.path}: {e}")
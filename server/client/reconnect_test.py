@@ -0,0 +1,70 @@
+import random
+
+from server.client.reconnect import (
+    CursorStore,
+    ReconnectBackoff,
+    is_expired_cursor_error,
+    is_retryable_error,
+)
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_backoff_delays_are_jittered_and_capped() -> None:
+    backoff = ReconnectBackoff(base=1.0, cap=8.0, rng=random.Random(7))
+
+    delays = [backoff.next_delay() for _ in range(10)]
+
+    for attempt, delay in enumerate(delays):
+        assert 0 <= delay <= min(8.0, 2**attempt)
+    assert len(set(delays)) == len(delays)
+    assert backoff.attempt == 10
+
+    backoff.reset()
+    assert backoff.attempt == 0
+    assert backoff.next_delay() <= 1.0
+
+
+def test_error_classification() -> None:
+    assert is_retryable_error(ConnectionError("reset"))
+    assert is_retryable_error(TimeoutError())
+    assert is_retryable_error(HTTPError(503))
+    assert is_retryable_error(HTTPError(429))
+    assert not is_retryable_error(HTTPError(401))
+    assert not is_retryable_error(HTTPError(404))
+    assert not is_retryable_error(PermissionError("token revoked"))
+
+
+def test_only_not_found_means_an_expired_cursor() -> None:
+    assert is_expired_cursor_error(HTTPError(404))
+    assert not is_expired_cursor_error(HTTPError(401))
+    assert not is_expired_cursor_error(HTTPError(403))
+    assert not is_expired_cursor_error(PermissionError("token revoked"))
+    assert not is_expired_cursor_error(ConnectionError("reset"))
+
+
+def test_cursor_round_trips_through_file(tmp_path) -> None:
+    path = str(tmp_path / "cursors" / "alice.json")
+
+    store = CursorStore(path)
+    assert store.load() is None
+    store.save("https://events/next-2")
+
+    assert CursorStore(path).load() == "https://events/next-2"
+
+
+def test_cursor_file_name_is_sanitised(tmp_path) -> None:
+    store = CursorStore.for_account("google-oauth2|123", directory=str(tmp_path))
+
+    assert store.path == str(tmp_path / "google-oauth2_123.json")
+
+
+def test_unreadable_cursor_starts_from_live_edge(tmp_path) -> None:
+    path = tmp_path / "alice.json"
+    path.write_text("not json")
+
+    assert CursorStore(str(path)).load() is None
@@ -0,0 +1,160 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from server.client.handler_pipeline import LatencyHistogram
+except ImportError:
+    # Imported from the server directory (Flask app)
+    from client.handler_pipeline import LatencyHistogram
+
+# Window name and length in seconds
+DEFAULT_WINDOWS: Tuple[Tuple[str, int], ...] = (("1m", 60), ("5m", 300), ("15m", 900))
+
+
+class _Slot:
+    __slots__ = (
+        "stamp",
+        "events",
+        "tokens",
+        "latency",
+        "depth_sum",
+        "depth_samples",
+        "depth_max",
+    )
+
+    def __init__(self) -> None:
+        self.stamp = -1
+        self.events = 0
+        self.tokens = 0
+        self.latency = LatencyHistogram()
+        self.depth_sum = 0
+        self.depth_samples = 0
+        self.depth_max = 0
+
+    def reset(self, stamp: int) -> None:
+        self.stamp = stamp
+        self.events = 0
+        self.tokens = 0
+        self.latency.reset()
+        self.depth_sum = 0
+        self.depth_samples = 0
+        self.depth_max = 0
+
+
+class RollingStats:
+    """Event rates, handler latency and queue depth over sliding windows.
+
+    Samples land in a ring of fixed-length time slots covering the longest
+    window. Recording touches only the current slot, so every update is O(1);
+    a slot is cleared when the ring wraps back onto it. Reading a window
+    merges the slots it covers, which costs O(slots) and only happens when
+    stats are requested.
+
+    Attributes:
+        slot_seconds: Length of one ring slot, i.e. the window resolution
+        windows: (name, seconds) pairs reported by ``snapshot``
+    """
+
+    def __init__(
+        self,
+        slot_seconds: int = 5,
+        windows: Tuple[Tuple[str, int], ...] = DEFAULT_WINDOWS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the ring.
+
+        Args:
+            slot_seconds: Length of one ring slot
+            windows: (name, seconds) pairs reported by ``snapshot``
+            clock: Monotonic time source
+
+        Raises:
+            ValueError: If a window is not a multiple of the slot length
+        """
+        if any(seconds % slot_seconds for _, seconds in windows):
+            raise ValueError("windows must be multiples of slot_seconds")
+
+        self.slot_seconds = slot_seconds
+        self.windows = windows
+        self._clock = clock
+        self._slots: List[_Slot] = [
+            _Slot()
+            for _ in range(max(seconds for _, seconds in windows) // slot_seconds)
+        ]
+        self._started = clock()
+
+    def _current(self) -> _Slot:
+        stamp = int(self._clock() // self.slot_seconds)
+        slot = self._slots[stamp % len(self._slots)]
+        if slot.stamp != stamp:
+            slot.reset(stamp)
+        return slot
+
+    def record_event(self, tokens: int = 0) -> None:
+        """Count one handled event.
+
+        Args:
+            tokens: Tokens carried by the event (tips and media purchases)
+        """
+        slot = self._current()
+        slot.events += 1
+        slot.tokens += tokens
+
+    def observe_latency(
+        self, seconds: float, queue_depth: Optional[int] = None
+    ) -> None:
+        """Record how long a handler took and, optionally, the queue depth.
+
+        Args:
+            seconds: Handler latency in seconds
+            queue_depth: Events waiting when the handler finished
+        """
+        slot = self._current()
+        slot.latency.observe(seconds)
+        if queue_depth is not None:
+            slot.depth_sum += queue_depth
+            slot.depth_samples += 1
+            if queue_depth > slot.depth_max:
+                slot.depth_max = queue_depth
+
+    def reset(self) -> None:
+        """Discard all samples."""
+        for slot in self._slots:
+            slot.reset(-1)
+        self._started = self._clock()
+
+    def _window(self, seconds: int, now: float) -> Dict[str, Any]:
+        newest = int(now // self.slot_seconds)
+        oldest = newest - seconds // self.slot_seconds
+        events = tokens = depth_sum = depth_samples = depth_max = 0
+        latency = LatencyHistogram()
+        for slot in self._slots:
+            if oldest < slot.stamp <= newest:
+                events += slot.events
+                tokens += slot.tokens
+                latency.merge(slot.latency)
+                depth_sum += slot.depth_sum
+                depth_samples += slot.depth_samples
+                depth_max = max(depth_max, slot.depth_max)
+
+        # Do not dilute rates with time before the stats started
+        elapsed = min(seconds, max(now - self._started, self.slot_seconds))
+        return {
+            "events_per_sec": round(events / elapsed, 3),
+            "tokens_per_min": round(tokens * 60 / elapsed, 3),
+            "p50_ms": round(latency.percentile(0.5) * 1000, 3),
+            "p99_ms": round(latency.percentile(0.99) * 1000, 3),
+            "queue_depth_avg": (
+                round(depth_sum / depth_samples, 3) if depth_samples else 0.0
+            ),
+            "queue_depth_max": depth_max,
+        }
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get rates, latency percentiles and queue depth for every window.
+
+        Returns:
+            Dictionary keyed by window name, e.g. "1m"
+        """
+        now = self._clock()
+        return {name: self._window(seconds, now) for name, seconds in self.windows}
@@ -0,0 +1,67 @@
+import pytest
+
+from server.client.rolling_stats import RollingStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rates_per_window():
+    clock = FakeClock()
+    stats = RollingStats(clock=clock)
+    clock.now += 900
+    for _ in range(60):
+        stats.record_event(tokens=10)
+    clock.now += 240
+    for _ in range(60):
+        stats.record_event()
+    clock.now += 59
+
+    snapshot = stats.snapshot()
+    assert snapshot["1m"]["events_per_sec"] == pytest.approx(1.0)
+    assert snapshot["1m"]["tokens_per_min"] == 0.0
+    assert snapshot["5m"]["events_per_sec"] == pytest.approx(120 / 300)
+    assert snapshot["5m"]["tokens_per_min"] == pytest.approx(600 / 5)
+
+
+def test_rates_are_not_diluted_before_the_window_fills():
+    clock = FakeClock()
+    stats = RollingStats(clock=clock)
+    clock.now += 10
+    for _ in range(20):
+        stats.record_event()
+
+    assert stats.snapshot()["15m"]["events_per_sec"] == pytest.approx(2.0)
+
+
+def test_latency_and_depth_expire_with_their_slot():
+    clock = FakeClock()
+    stats = RollingStats(clock=clock)
+    for _ in range(99):
+        stats.observe_latency(0.001, queue_depth=2)
+    stats.observe_latency(0.4, queue_depth=10)
+
+    window = stats.snapshot()["1m"]
+    assert window["p50_ms"] == pytest.approx(1.0)
+    assert window["p99_ms"] == pytest.approx(1.0)
+    assert window["queue_depth_max"] == 10
+    assert window["queue_depth_avg"] == pytest.approx(2.08)
+
+    clock.now += 61
+    assert stats.snapshot()["1m"]["p99_ms"] == 0.0
+    assert stats.snapshot()["5m"]["queue_depth_max"] == 10
+
+    # The ring wraps after 15 minutes and reuses the slot
+    clock.now += 900
+    stats.record_event()
+    assert stats.snapshot()["15m"]["queue_depth_max"] == 0
+
+
+def test_windows_must_align_with_slots():
+    with pytest.raises(ValueError):
+        RollingStats(slot_seconds=7)
@@ -0,0 +1,316 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Called with (sid, event name, payload, ack callback) to emit one frame
+SendFrame = Callable[[str, str, Any, Callable[..., None]], None]
+# Called with the sid of a connection that fell too far behind
+DisconnectClient = Callable[[str], None]
+
+# Payload types that may be dropped for a slow client; tips never are
+DROPPABLE_TYPES = frozenset({"chat", "system", "message"})
+
+
+def is_droppable(name: str, payload: Any) -> bool:
+    """Whether a socket event may be dropped when a client falls behind.
+
+    Chat-like events and batch frames holding only chat-like events may be
+    dropped; tips, private messages and anything unknown may not.
+    """
+    if name == "chaturbate_event" and isinstance(payload, dict):
+        return payload.get("type") in DROPPABLE_TYPES
+    if name == "chaturbate_events" and isinstance(payload, list):
+        return all(
+            isinstance(item, dict) and item.get("type") in DROPPABLE_TYPES
+            for item in payload
+        )
+    return False
+
+
+class ClientSendQueue:
+    """Bounded outbound queue of one Socket.IO connection.
+
+    Frames are emitted with an acknowledgement callback and at most
+    ``window`` frames may be unacknowledged, so a slow client accumulates
+    frames here instead of in the transport. When ``max_queued`` frames are
+    waiting, the oldest droppable (chat) frame makes room; if none is
+    queued, a new droppable frame is dropped, while tips and private
+    messages are always kept. The lag is the age of the oldest frame that
+    was queued but not yet acknowledged.
+
+    Attributes:
+        sid: The Socket.IO session ID
+        stats: Counters for queued, sent, acknowledged and dropped frames
+    """
+
+    __slots__ = (
+        "sid",
+        "window",
+        "max_queued",
+        "_clock",
+        "_queue",
+        "_in_flight",
+        "_lock",
+        "send_lock",
+        "stats",
+        "max_lag",
+    )
+
+    def __init__(
+        self,
+        sid: str,
+        window: int = 32,
+        max_queued: int = 500,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.sid = sid
+        self.window = window
+        self.max_queued = max_queued
+        self._clock = clock
+        # (queued at, name, payload, droppable)
+        self._queue: Deque[Tuple[float, str, Any, bool]] = deque()
+        # Queued-at times of unacknowledged frames, oldest first
+        self._in_flight: Deque[float] = deque()
+        self._lock = threading.Lock()
+        # Held while taking and emitting frames so they leave in order
+        self.send_lock = threading.RLock()
+        self.stats: Dict[str, int] = {"queued": 0, "sent": 0, "acked": 0, "dropped": 0}
+        self.max_lag = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Number of frames waiting to be sent."""
+        return len(self._queue)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of sent frames not yet acknowledged."""
+        return len(self._in_flight)
+
+    def put(self, name: str, payload: Any, droppable: bool) -> bool:
+        """Queue a frame, applying the overflow policy.
+
+        Args:
+            name: The socket event name
+            payload: The payload to emit
+            droppable: Whether the frame may be dropped under pressure
+
+        Returns:
+            True if the frame was queued, False if it was dropped
+        """
+        with self._lock:
+            full = len(self._queue) >= self.max_queued
+            if full and not self._drop_oldest_droppable():
+                if droppable:
+                    self.stats["dropped"] += 1
+                    return False
+            self._queue.append((self._clock(), name, payload, droppable))
+            self.stats["queued"] += 1
+            return True
+
+    def _drop_oldest_droppable(self) -> bool:
+        for index, frame in enumerate(self._queue):
+            if frame[3]:
+                del self._queue[index]
+                self.stats["dropped"] += 1
+                return True
+        return False
+
+    def take(self) -> List[Tuple[str, Any]]:
+        """Remove the frames that fit in the acknowledgement window.
+
+        Returns:
+            (name, payload) pairs to emit, oldest first
+        """
+        with self._lock:
+            frames = []
+            while self._queue and len(self._in_flight) < self.window:
+                queued_at, name, payload, _ = self._queue.popleft()
+                self._in_flight.append(queued_at)
+                frames.append((name, payload))
+            self.stats["sent"] += len(frames)
+            return frames
+
+    def ack(self) -> None:
+        """Record the acknowledgement of the oldest unacknowledged frame."""
+        with self._lock:
+            if self._in_flight:
+                self._in_flight.popleft()
+                self.stats["acked"] += 1
+
+    def lag(self) -> float:
+        """Age in seconds of the oldest unacknowledged or waiting frame."""
+        with self._lock:
+            oldest = None
+            if self._in_flight:
+                oldest = self._in_flight[0]
+            elif self._queue:
+                oldest = self._queue[0][0]
+        lag = self._clock() - oldest if oldest is not None else 0.0
+        if lag > self.max_lag:
+            self.max_lag = lag
+        return lag
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counters, queue depth and lag of the connection."""
+        lag = self.lag()
+        return {
+            **self.stats,
+            "depth": self.depth,
+            "in_flight": self.in_flight,
+            "lag_ms": round(lag * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+        }
+
+
+class SendQueueRegistry:
+    """Per-connection send queues with lag-based disconnection.
+
+    Frames put for a connection are emitted straight away while its
+    acknowledgement window has room; each acknowledgement pumps the next
+    frames. ``check_lag`` disconnects connections whose lag exceeds
+    ``max_lag_seconds``; ``run`` calls it periodically until ``stop``.
+
+    Attributes:
+        window: Maximum unacknowledged frames per connection
+        max_queued: Frames held per connection before dropping chat
+        max_lag_seconds: Lag after which a connection is disconnected
+        stats: Counters for opened connections and lag disconnects
+    """
+
+    def __init__(
+        self,
+        send: SendFrame,
+        disconnect: DisconnectClient,
+        window: int = 32,
+        max_queued: int = 500,
+        max_lag_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            send: Emits one frame to a connection with an ack callback
+            disconnect: Disconnects a connection that fell behind
+            window: Maximum unacknowledged frames per connection
+            max_queued: Frames held per connection before dropping chat
+            max_lag_seconds: Lag after which a connection is disconnected
+            clock: Monotonic time source
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if window < 1 or max_queued < 1 or max_lag_seconds <= 0:
+            raise ValueError("window, max_queued and max_lag_seconds must be positive")
+
+        self.window = window
+        self.max_queued = max_queued
+        self.max_lag_seconds = max_lag_seconds
+        self._send = send
+        self._disconnect = disconnect
+        self._clock = clock
+        self._queues: Dict[str, ClientSendQueue] = {}
+        self._closed = threading.Event()
+        self.stats: Dict[str, int] = {"opened": 0, "lag_disconnects": 0}
+
+    def __contains__(self, sid: str) -> bool:
+        return sid in self._queues
+
+    def __len__(self) -> int:
+        return len(self._queues)
+
+    def open(self, sid: str) -> ClientSendQueue:
+        """Create the send queue of a new connection."""
+        queue = self._queues[sid] = ClientSendQueue(
+            sid, window=self.window, max_queued=self.max_queued, clock=self._clock
+        )
+        self.stats["opened"] += 1
+        return queue
+
+    def close(self, sid: str) -> None:
+        """Discard the send queue of a closed connection."""
+        self._queues.pop(sid, None)
+
+    def put(self, sid: str, name: str, payload: Any, droppable: bool) -> None:
+        """Queue a frame for a connection and send what the window allows."""
+        queue = self._queues.get(sid)
+        if queue is not None and queue.put(name, payload, droppable):
+            self.pump(queue)
+
+    def pump(self, queue: ClientSendQueue) -> None:
+        """Emit the frames that fit in a connection's acknowledgement window."""
+        with queue.send_lock:
+            for name, payload in queue.take():
+                try:
+                    self._send(queue.sid, name, payload, lambda *_: self._on_ack(queue))
+                except Exception as e:
+                    logger.error(f"Failed to send {name} to {queue.sid}: {e}")
+                    queue.ack()
+
+    def _on_ack(self, queue: ClientSendQueue) -> None:
+        queue.ack()
+        if queue.depth:
+            self.pump(queue)
+
+    def check_lag(self) -> List[str]:
+        """Disconnect every connection lagging more than ``max_lag_seconds``.
+
+        Returns:
+            Session IDs of the disconnected connections
+        """
+        laggards = [
+            sid
+            for sid, queue in list(self._queues.items())
+            if queue.lag() > self.max_lag_seconds
+        ]
+        for sid in laggards:
+            self.close(sid)
+            self.stats["lag_disconnects"] += 1
+            logger.warning(
+                f"Disconnecting slow client {sid}: lag above {self.max_lag_seconds}s"
+            )
+            try:
+                self._disconnect(sid)
+            except Exception as e:
+                logger.error(f"Failed to disconnect slow client {sid}: {e}")
+        return laggards
+
+    def run(self, sleep: Callable[[float], Any] = time.sleep, interval: float = 1.0):
+        """Check lag every ``interval`` seconds until ``stop`` is called.
+
+        Args:
+            sleep: Sleep function of the serving framework, e.g. socketio.sleep
+            interval: Seconds between checks
+        """
+        while not self._closed.is_set():
+            sleep(interval)
+            self.check_lag()
+
+    def stop(self) -> None:
+        """Stop ``run``."""
+        self._closed.set()
+
+    def get_stats(self, sid: Optional[str] = None) -> Dict[str, Any]:
+        """Get registry counters and per-connection queue stats.
+
+        Args:
+            sid: Only report this connection
+
+        Returns:
+            Dictionary with counters, limits and a ``clients`` mapping of
+            session ID to queue stats
+        """
+        queues = self._queues.items()
+        if sid is not None:
+            queues = [(sid, self._queues[sid])] if sid in self._queues else []
+        return {
+            **self.stats,
+            "window": self.window,
+            "max_queued": self.max_queued,
+            "max_lag_ms": round(self.max_lag_seconds * 1000, 1),
+            "clients": {key: queue.get_stats() for key, queue in list(queues)},
+        }
@@ -0,0 +1,81 @@
+import pytest
+
+from server.client.send_queue import (
+    ClientSendQueue,
+    SendQueueRegistry,
+    is_droppable,
+)
+
+CHAT = {"type": "chat", "message": "hi"}
+TIP = {"type": "tip", "amount": 10}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 50.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_only_chat_like_events_are_droppable():
+    assert is_droppable("chaturbate_event", CHAT)
+    assert not is_droppable("chaturbate_event", TIP)
+    assert is_droppable("chaturbate_events", [CHAT, CHAT])
+    assert not is_droppable("chaturbate_events", [CHAT, TIP])
+    assert not is_droppable("private_message", {"type": "private_message"})
+    assert not is_droppable("chaturbate_event", b"{}")
+
+
+def test_full_queue_drops_oldest_chat_but_keeps_tips():
+    queue = ClientSendQueue("sid", window=1, max_queued=2)
+    assert queue.put("chaturbate_event", {"n": 1}, droppable=True)
+    assert queue.put("chaturbate_event", {"n": 2}, droppable=False)
+    assert queue.put("chaturbate_event", {"n": 3}, droppable=False)
+    assert not queue.put("chaturbate_event", {"n": 4}, droppable=True)
+    assert queue.put("chaturbate_event", {"n": 5}, droppable=False)
+
+    assert [payload["n"] for _, payload in queue.take()] == [2]
+    queue.ack()
+    assert [payload["n"] for _, payload in queue.take()] == [3]
+    assert queue.stats["dropped"] == 2
+    assert queue.depth == 1
+
+
+def test_acks_pump_the_window_and_laggards_are_disconnected():
+    clock = FakeClock()
+    sent, acks, disconnected = [], [], []
+
+    def send(sid, name, payload, callback):
+        sent.append(payload)
+        acks.append(callback)
+
+    registry = SendQueueRegistry(
+        send, disconnected.append, window=2, max_lag_seconds=5, clock=clock
+    )
+    registry.open("fast")
+    registry.open("slow")
+    for n in range(4):
+        registry.put("fast", "chaturbate_event", {"n": n}, droppable=False)
+    registry.put("slow", "chaturbate_event", {"n": "slow"}, droppable=False)
+
+    assert [p["n"] for p in sent] == [0, 1, "slow"]
+    acks[0]()
+    assert sent[-1] == {"n": 2}
+
+    clock.now += 6
+    for index in (1, 3, 4):
+        acks[index]()
+    assert [p["n"] for p in sent] == [0, 1, "slow", 2, 3]
+    assert registry.check_lag() == ["slow"]
+    assert disconnected == ["slow"]
+    assert "slow" not in registry
+    stats = registry.get_stats()
+    assert stats["lag_disconnects"] == 1
+    assert stats["clients"]["fast"]["in_flight"] == 0
+    assert stats["clients"]["fast"]["acked"] == 4
+
+
+def test_invalid_configuration_is_rejected():
+    with pytest.raises(ValueError):
+        SendQueueRegistry(lambda *args: None, lambda sid: None, window=0)
@@ -0,0 +1,127 @@
+import hashlib
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+# Payload types a client can subscribe to
+EVENT_TYPES = frozenset({"tip", "chat", "system", "message", "private_message"})
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def _match_all(payload: Dict[str, Any]) -> bool:
+    return True
+
+
+class SubscriptionFilter:
+    """Server-side predicate deciding which events a client receives.
+
+    The declared predicates are compiled once into a single ``matches``
+    function that only runs the checks actually requested, so evaluating a
+    filter costs a few dictionary lookups per event. Filters with the same
+    predicates share the same ``key``, letting every client that declared
+    them be served by one evaluation.
+
+    Attributes:
+        types: Payload types to receive, or None for all
+        min_tip: Minimum tokens for tip events (0 for all tips)
+        usernames: Lowercased usernames to receive events from, or None
+        key: Short stable identifier of the predicates
+        matches: Compiled predicate taking a socket payload
+    """
+
+    __slots__ = ("types", "min_tip", "usernames", "key", "matches")
+
+    def __init__(
+        self,
+        types: Optional[FrozenSet[str]] = None,
+        min_tip: int = 0,
+        usernames: Optional[FrozenSet[str]] = None,
+    ) -> None:
+        self.types = types
+        self.min_tip = min_tip
+        self.usernames = usernames
+        material = "\x00".join(
+            [
+                ",".join(sorted(types)) if types is not None else "*",
+                str(min_tip),
+                ",".join(sorted(usernames)) if usernames is not None else "*",
+            ]
+        )
+        self.key = hashlib.blake2b(material.encode("utf-8"), digest_size=6).hexdigest()
+        self.matches = self._compile()
+
+    @classmethod
+    def from_request(cls, data: Any) -> Optional["SubscriptionFilter"]:
+        """Build a filter from a client's ``subscribe`` message.
+
+        Args:
+            data: Mapping with optional ``types`` (list of payload types),
+                ``min_tip`` (int) and ``usernames`` (list of str)
+
+        Returns:
+            The filter, or None if no predicate was given
+
+        Raises:
+            ValueError: If a predicate is malformed
+        """
+        if data is None:
+            return None
+        if not isinstance(data, dict):
+            raise ValueError("subscription must be an object")
+
+        types = data.get("types")
+        if types is not None:
+            if not isinstance(types, list) or not set(types) <= EVENT_TYPES:
+                raise ValueError(
+                    f"types must be a list of: {', '.join(sorted(EVENT_TYPES))}"
+                )
+            types = frozenset(types)
+
+        min_tip = data.get("min_tip") or 0
+        if not isinstance(min_tip, int) or isinstance(min_tip, bool) or min_tip < 0:
+            raise ValueError("min_tip must be a non-negative integer")
+
+        usernames = data.get("usernames")
+        if usernames is not None:
+            if not isinstance(usernames, list) or not all(
+                isinstance(name, str) for name in usernames
+            ):
+                raise ValueError("usernames must be a list of strings")
+            usernames = frozenset(name.lower() for name in usernames)
+
+        if types is None and not min_tip and usernames is None:
+            return None
+        return cls(types=types, min_tip=min_tip, usernames=usernames)
+
+    def _compile(self) -> Predicate:
+        checks: List[Predicate] = []
+        if self.types is not None:
+            types = self.types
+            checks.append(lambda payload: payload.get("type") in types)
+        if self.min_tip:
+            min_tip = self.min_tip
+            checks.append(
+                lambda payload: payload.get("type") != "tip"
+                or (payload.get("amount") or 0) >= min_tip
+            )
+        if self.usernames is not None:
+            usernames = self.usernames
+            checks.append(
+                lambda payload: (
+                    payload.get("username") or payload.get("from_username") or ""
+                ).lower()
+                in usernames
+            )
+
+        if not checks:
+            return _match_all
+        if len(checks) == 1:
+            return checks[0]
+        return lambda payload: all(check(payload) for check in checks)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the filter as a ``subscribe`` message would."""
+        return {
+            "types": sorted(self.types) if self.types is not None else None,
+            "min_tip": self.min_tip,
+            "usernames": sorted(self.usernames) if self.usernames is not None else None,
+        }
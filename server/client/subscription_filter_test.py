@@ -0,0 +1,68 @@
+import pytest
+
+from server.client.subscription_filter import SubscriptionFilter
+
+TIP = {"type": "tip", "username": "WhaleKing", "amount": 500}
+SMALL_TIP = {"type": "tip", "username": "Viewer2", "amount": 5}
+CHAT = {"type": "chat", "username": "Viewer2", "message": "hi"}
+PRIVATE = {"type": "private_message", "from_username": "WhaleKing", "message": "psst"}
+
+
+def test_predicates_are_combined():
+    subscription = SubscriptionFilter.from_request(
+        {
+            "types": ["tip", "private_message"],
+            "min_tip": 100,
+            "usernames": ["whaleking"],
+        }
+    )
+
+    assert subscription.matches(TIP)
+    assert subscription.matches(PRIVATE)
+    assert not subscription.matches(SMALL_TIP)
+    assert not subscription.matches(CHAT)
+
+
+def test_min_tip_only_applies_to_tips():
+    subscription = SubscriptionFilter.from_request({"min_tip": 100})
+
+    assert [subscription.matches(p) for p in (TIP, SMALL_TIP, CHAT)] == [
+        True,
+        False,
+        True,
+    ]
+
+
+def test_equal_filters_share_a_key_and_empty_requests_clear():
+    first = SubscriptionFilter.from_request(
+        {"types": ["tip", "chat"], "usernames": ["A"]}
+    )
+    second = SubscriptionFilter.from_request(
+        {"usernames": ["a"], "types": ["chat", "tip"]}
+    )
+
+    assert first.key == second.key
+    assert first.key != SubscriptionFilter.from_request({"types": ["tip"]}).key
+    assert first.to_dict() == {
+        "types": ["chat", "tip"],
+        "min_tip": 0,
+        "usernames": ["a"],
+    }
+    assert SubscriptionFilter.from_request({}) is None
+    assert SubscriptionFilter.from_request(None) is None
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        ["tip"],
+        {"types": ["gift"]},
+        {"types": "tip"},
+        {"min_tip": -1},
+        {"min_tip": "100"},
+        {"usernames": [1]},
+    ],
+)
+def test_malformed_requests_are_rejected(data):
+    with pytest.raises(ValueError):
+        SubscriptionFilter.from_request(data)
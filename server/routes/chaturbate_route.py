@@ -1,64 +1,208 @@
-import asyncio
+import atexit
 import json
 import logging
 import os
-import random
-import threading
+import socket
 import time
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, Optional, Set
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
-from flask import request
+from flask import Response, request
 from flask_restx import Namespace, Resource
-from flask_socketio import SocketIO, disconnect, emit
+from flask_socketio import SocketIO, disconnect, emit, join_room, leave_room
 from influxdb_client import Point
 
+from client.backplane import Backplane, LocalBackplane, create_backplane
+from client.chat_commands import CommandResult
+from client.emit_batcher import EmitBatcher
+from client.event_capture import EventCaptureWriter
+from client.event_dedup import EventDeduplicator
+from client.event_ring import RecentEvent, RecentEvents
+from client.handler_loop import HandlerLoop
+from client.handler_pipeline import EventContext, HandlerPipeline
 from client.influx_client import InfluxDBClient
+from client.load_generator import (
+    LoadGenerator,
+    LoadProfile,
+    MockChatObject,
+    MockEvent,
+    MockUser,
+    handler_sink,
+)
+from client.payload_encoding import (
+    OBJECT_ENCODING,
+    EncodedPayload,
+    available_encodings,
+    encode_payload,
+)
+from client.send_queue import SendQueueRegistry, is_droppable
+from client.subscription_filter import SubscriptionFilter
+from services.inbox_stats_cache import get_inbox_stats_cache
+from services.message_ids import get_message_id_index
+from services.message_search_index import (
+    PUBLIC_SCOPE,
+    MessageSearchIndex,
+    get_message_search_index,
+)
+from utils.auth import (
+    Auth0Config,
+    AuthError,
+    get_token_auth_header,
+    verify_decode_jwt,
+)
 
 logger = logging.getLogger(__name__)
 
 api = Namespace("chaturbate", description="Chaturbate WebSocket operations")
 
+# Handler ordering key for events produced by the demo generator
+DEMO_ROOM = "demo"
+# One event every two seconds on average, like the original 1-3s interval
+DEMO_EVENT_RATE = 0.5
+# Demo viewers, most active first
+DEMO_USERS = (
+    "WhaleKing",
+    "DiamondHands",
+    "LoyalFan",
+    "RegularFan",
+    "NewSupporter",
+    "BigSpender2024",
+    "GenerousViewer",
+    "ChatUser1",
+    "Viewer2",
+    "RandomTipper",
+    "QuietViewer",
+    "VIPFan",
+    "SecretAdmirer",
+    "MysteryUser",
+    "PrivateSupporter",
+    "SilentFan",
+    "AnonymousViewer",
+)
+
+# Streamer whose room clients join when they do not name one
+DEFAULT_STREAMER = os.getenv("CHATURBATE_USERNAME", DEMO_ROOM)
+
+# Micro-batching for clients that connect with batch enabled
+BATCH_WINDOW_SECONDS = float(os.getenv("CHATURBATE_BATCH_WINDOW_MS", "100")) / 1000
+BATCH_MAX_EVENTS = int(os.getenv("CHATURBATE_BATCH_MAX_EVENTS", "50"))
+# Tips of at least this many tokens are sent to batching clients immediately
+URGENT_TIP_TOKENS = int(os.getenv("CHATURBATE_URGENT_TIP_TOKENS", "100"))
+
+# Recent events kept per room, and sent to a client when it connects
+RECENT_EVENTS_PER_ROOM = int(os.getenv("CHATURBATE_RECENT_EVENTS", "256"))
+SNAPSHOT_EVENTS = int(os.getenv("CHATURBATE_SNAPSHOT_EVENTS", "50"))
+# Longest long-poll wait, and the keepalive interval of event streams
+EVENT_POLL_SECONDS = int(os.getenv("CHATURBATE_EVENT_POLL_SECONDS", "25"))
+# Reconnect delay suggested to EventSource clients
+SSE_RETRY_MS = 3000
+
+# Flow control for clients that acknowledge frames
+SEND_WINDOW = int(os.getenv("CHATURBATE_SEND_WINDOW", "32"))
+SEND_QUEUE_SIZE = int(os.getenv("CHATURBATE_SEND_QUEUE_SIZE", "500"))
+MAX_CLIENT_LAG_SECONDS = float(os.getenv("CHATURBATE_MAX_CLIENT_LAG_SECONDS", "10"))
+
+# Multi-worker deployment: "ingest" workers run the event pipeline and the
+# demo client, "socket" workers serve clients, "all" (default) does both
+INGEST_ROLE = "ingest"
+SOCKET_ROLE = "socket"
+WORKER_ROLE = os.getenv("CHATURBATE_WORKER_ROLE", "all")
+WORKER_ID = os.getenv("CHATURBATE_WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}"
+# redis://... to share events between workers; unset for a single process
+BACKPLANE_URL = os.getenv("CHATURBATE_BACKPLANE_URL")
+EVENTS_CHANNEL = "chaturbate:events"
+CONTROL_CHANNEL = "chaturbate:control"
+INBOX_CHANNEL = "chaturbate:inbox"
+STATE_REPORT_SECONDS = 5.0
+
 # Global storage for WebSocket connections and demo client
 connected_clients: Set[str] = set()
+
+
+@dataclass
+class SocketClient:
+    """A connected /chaturbate client.
+
+    Attributes:
+        sid: The Socket.IO session ID
+        rooms: Logical rooms the client follows, streamer room first, then
+            its user room if authenticated
+        joined: Socket.IO rooms actually joined, with filter, batch and
+            encoding variants applied
+        encoding: Payload encoding negotiated on connect
+        batched: Whether public events arrive as batch frames
+        filter: Subscription filter declared by the client, if any
+        acked: Whether events reach the client through its own send queue,
+            with acknowledgements, instead of Socket.IO rooms
+    """
+
+    sid: str
+    rooms: List[str]
+    joined: List[str] = field(default_factory=list)
+    encoding: str = OBJECT_ENCODING
+    batched: bool = False
+    filter: Optional[SubscriptionFilter] = None
+    acked: bool = False
+
+
+# Connected clients by session ID
+clients: Dict[str, SocketClient] = {}
+# Number of connected clients in each joined room, kept in step with clients
+room_members: Dict[str, int] = {}
+# Subscription filters in use on each logical room, with their client counts
+room_filters: Dict[str, Dict[str, Tuple[SubscriptionFilter, int]]] = {}
+# Acknowledging clients of each joined room; they are not in the Socket.IO room
+queued_members: Dict[str, Set[str]] = {}
 demo_client_running: bool = False
 socketio: Optional[SocketIO] = None
 
 
-# Create mock objects that match the chaturbate_poller structure
-@dataclass
-class MockUser:
-    username: str
+def streamer_room(streamer: str) -> str:
+    """Socket.IO room receiving a streamer's public events."""
+    return f"streamer:{streamer}"
 
 
-@dataclass
-class MockTip:
-    tokens: int
-    message: str = ""
+def user_room(user_id: str) -> str:
+    """Socket.IO room receiving one authenticated user's private events."""
+    return f"user:{user_id}"
 
 
-@dataclass
-class MockTipObject:
-    user: MockUser
-    tip: MockTip
-    message: str = ""
+def batch_room(room: str) -> str:
+    """Room receiving a room's events as ``chaturbate_events`` batch frames."""
+    return f"{room}:batch"
 
 
-@dataclass
-class MockChatObject:
-    user: MockUser
-    message: str
+def encoded_room(room: str, encoding: str) -> str:
+    """Room variant receiving a room's events pre-encoded in ``encoding``."""
+    if encoding == OBJECT_ENCODING:
+        return room
+    return f"{room}:{encoding}"
 
 
-@dataclass
-class MockEvent:
-    object: any
-    timestamp: datetime = None
+def filtered_room(room: str, key: str) -> str:
+    """Room variant for the clients of a room sharing one subscription filter."""
+    return f"{room}:filter:{key}"
+
+
+def joined_rooms(client: "SocketClient") -> List[str]:
+    """Socket.IO rooms a client must join to receive its logical rooms."""
+    joined = []
+    for index, room in enumerate(client.rooms):
+        if client.filter is not None:
+            room = filtered_room(room, client.filter.key)
+        # Only public events, in the streamer room, are batched
+        if client.batched and index == 0:
+            room = batch_room(room)
+        joined.append(encoded_room(room, client.encoding))
+    return joined
+
 
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+def has_members(room: str) -> bool:
+    """Whether any client joined a room in any encoding."""
+    return bool(room_members.get(room)) or any(
+        room_members.get(encoded_room(room, encoding))
+        for encoding in available_encodings()
+    )
 
 
 # Import the real event handler and models
@@ -68,14 +212,121 @@ logger.info("Using real ChaturbateClientEventHandler with chaturbate_poller mode
 
 
 class WebSocketEventHandler(ChaturbateClientEventHandler):
-    """Event handler that forwards processed events to WebSocket clients and stores them in InfluxDB."""
-
-    def __init__(self, socket_io: SocketIO):
+    """Event handler that forwards processed events to WebSocket clients and stores them in InfluxDB.
+
+    Tips, chat and private messages run through a HandlerPipeline of
+    validate -> dedup -> enrich -> persist -> broadcast -> analytics stages,
+    each with its own latency histogram and error counter. Setting
+    CHATURBATE_CAPTURE_PATH adds a capture stage that logs every raw event
+    for offline replay.
+
+    Public events are emitted to the broadcaster's streamer room and private
+    messages to the recipient's user room, so each event only reaches the
+    clients that should see it. Clients that opted into batching sit in the
+    streamer room's batch room instead and receive public events coalesced
+    into ``chaturbate_events`` frames; large tips flush the batch at once.
+
+    Clients that negotiated a binary encoding sit in encoded variants of
+    their rooms. Each event or batch is serialised once per encoding in use
+    and the same buffer is sent to every socket in the variant room.
+
+    Every published event is stamped with a global ``seq`` and kept in a
+    bounded per-room ring, so (re)connecting clients get a snapshot of what
+    they missed without querying InfluxDB.
+
+    Clients with a subscription filter sit in a filtered variant of their
+    rooms shared by every client with the same filter. Each filter is
+    evaluated once per event, before anything is encoded, and non-matching
+    events are never serialised for its clients.
+
+    Clients that acknowledge frames get their own bounded send queue. A slow
+    one accumulates frames there, loses queued chat first (never tips or
+    private messages) and is disconnected once its lag passes
+    MAX_CLIENT_LAG_SECONDS, without holding up anyone else.
+
+    Published events travel over a backplane: the pipeline publishes each
+    event, the backplane numbers it from a counter shared by every worker,
+    and every socket-serving worker (this one
+    included, unless its role is ingest only) records and delivers it to
+    its own clients. The default in-process backplane hands the event over
+    directly.
+    """
+
+    def __init__(
+        self,
+        socket_io: SocketIO,
+        streamer: str = DEFAULT_STREAMER,
+        backplane: Optional[Backplane] = None,
+        role: str = WORKER_ROLE,
+        search_index: Optional[MessageSearchIndex] = None,
+    ):
         super().__init__(enable_logging=True)
         self.socketio = socket_io
+        self.streamer = streamer
+        self.role = role
+        self.backplane = backplane or LocalBackplane()
         self.influx_client = None
+        # Benchmarks and tests pass their own so they never touch the real one
+        if search_index is None:
+            search_index = get_message_search_index()
+        self.search_index = search_index
+        self.dedup = EventDeduplicator()
+        self.pipeline = self._build_pipeline()
+        self.batcher = EmitBatcher(
+            self._emit_batch,
+            window_seconds=BATCH_WINDOW_SECONDS,
+            max_events=BATCH_MAX_EVENTS,
+        )
+        self.capture: Optional[EventCaptureWriter] = None
+        self.recent_events = RecentEvents(capacity=RECENT_EVENTS_PER_ROOM)
+        self.send_queues = SendQueueRegistry(
+            self._send_frame,
+            self._disconnect_client,
+            window=SEND_WINDOW,
+            max_queued=SEND_QUEUE_SIZE,
+            max_lag_seconds=MAX_CLIENT_LAG_SECONDS,
+        )
+        self.encoding_stats: Dict[str, Dict[str, int]] = {
+            encoding: {"frames": 0, "bytes": 0} for encoding in available_encodings()
+        }
         self._init_influx_client()
 
+        if role != INGEST_ROLE:
+            self.backplane.subscribe(EVENTS_CHANNEL, self._on_backplane_event)
+
+        capture_path = os.getenv("CHATURBATE_CAPTURE_PATH")
+        if capture_path:
+            self.enable_capture(capture_path)
+
+    def _build_pipeline(self) -> HandlerPipeline:
+        """Assemble the default stages; add or replace stages on self.pipeline."""
+        pipeline = HandlerPipeline()
+        pipeline.add_stage("validate", self._validate_stage)
+        pipeline.add_stage("dedup", self._dedup_stage)
+        pipeline.add_stage("enrich", self._enrich_stage)
+        pipeline.add_stage("persist", self._persist_stage, required=False)
+        pipeline.add_stage("broadcast", self._broadcast_stage, required=False)
+        pipeline.add_stage("analytics", self._analytics_stage, required=False)
+        return pipeline
+
+    def enable_capture(self, path: str) -> None:
+        """Start logging every raw event to a compressed NDJSON capture file."""
+        if self.capture is not None:
+            return
+        self.capture = EventCaptureWriter(path)
+        self.pipeline.add_stage(
+            "capture", self.capture.capture_stage, required=False, before="validate"
+        )
+        logger.info(f"Capturing raw events to {path}")
+
+    def disable_capture(self) -> None:
+        """Stop capturing and close the capture file."""
+        if self.capture is None:
+            return
+        self.pipeline.remove_stage("capture")
+        self.capture.close()
+        self.capture = None
+
     def _init_influx_client(self):
         """Initialize InfluxDB client if environment variables are set."""
         try:
@@ -86,109 +337,66 @@ class WebSocketEventHandler(ChaturbateClientEventHandler):
             self.influx_client = None
 
     def _write_to_influx(self, point: Point):
-        """Write a point to InfluxDB if client is available."""
+        """Write a point to InfluxDB if client is available.
+
+        Write errors propagate so the persist stage counts them.
+        """
         if self.influx_client:
-            try:
-                write_api = self.influx_client.write_api
-                write_api.write(
-                    bucket=self.influx_client.bucket,
-                    org=self.influx_client.org,
-                    record=point,
-                )
-                logger.info(
-                    f"Successfully wrote event to InfluxDB: {point._name} for user: {point._tags.get('username', 'unknown')}"
-                )
-            except Exception as e:
-                logger.error(f"Failed to write to InfluxDB: {e}")
+            write_api = self.influx_client.write_api
+            write_api.write(
+                bucket=self.influx_client.bucket,
+                org=self.influx_client.org,
+                record=point,
+            )
+            logger.debug(
+                f"Wrote event to InfluxDB: {point._name} for user: {point._tags.get('username', 'unknown')}"
+            )
         else:
             logger.warning("InfluxDB client not available - skipping write")
 
-    async def handle_tip(self, event) -> None:
-        """Handle tip events, write to InfluxDB, and forward to WebSocket."""
+    def _index_message(
+        self,
+        kind: str,
+        from_user: str,
+        message: str,
+        timestamp,
+        to_user: str = "",
+        message_id: str = "",
+    ):
+        """Add a chat or private message to the full-text search index."""
         try:
-            # Process with parent handler first
-            await super().handle_tip(event)
-
-            if event and event.object and event.object.user and event.object.tip:
-                username = event.object.user.username or "Anonymous"
-                amount = event.object.tip.tokens or 0
-                message = (
-                    getattr(event.object.tip, "message", "")
-                    or event.object.message
-                    or ""
-                )
-
-                # Write to InfluxDB
-                point = (
-                    Point("chaturbate_events")
-                    .tag("method", "tip")
-                    .tag("username", username)
-                    .field("object.tip.tokens", amount)
-                    .field("object.user.username", username)
-                    .field("object.tip.message", message)
-                    .time(event.timestamp)
-                )
-
-                self._write_to_influx(point)
-
-                data = {
-                    "type": "tip",
-                    "username": username,
-                    "amount": amount,
-                    "message": message,
-                    "timestamp": event.timestamp.timestamp(),
-                }
-
-                self.socketio.emit("chaturbate_event", data, namespace="/chaturbate")
-                logger.info(
-                    f"Processed tip event to InfluxDB and WebSocket: {username} tipped {amount} tokens"
-                )
-
+            self.search_index.add_message(
+                kind=kind,
+                from_user=from_user,
+                message=message,
+                to_user=to_user,
+                scope=to_user or PUBLIC_SCOPE,
+                timestamp=timestamp.timestamp(),
+                message_id=message_id,
+            )
         except Exception as e:
-            logger.error(f"Error handling tip event: {e}")
+            logger.error(f"Failed to index message: {e}")
+
+    async def handle_tip(self, event) -> None:
+        """Handle tip events, write to InfluxDB, and forward to WebSocket."""
+        await self._run_pipeline("tip", event)
 
     async def handle_chat(self, event) -> None:
         """Handle chat events, write to InfluxDB, and forward to WebSocket."""
-        try:
-            # Process with parent handler first
-            await super().handle_chat(event)
-
-            if event and event.object and event.object.user:
-                username = event.object.user.username or "Anonymous"
-                message = event.object.message or ""
-
-                # Determine if this is a system message
-                method = "system" if username == "System" else "chatMessage"
-
-                # Write to InfluxDB
-                point = (
-                    Point("chaturbate_events")
-                    .tag("method", method)
-                    .tag("username", username)
-                    .field("object.user.username", username)
-                    .field("object.message", message)
-                    .time(event.timestamp)
-                )
-
-                self._write_to_influx(point)
-
-                # Use appropriate type for WebSocket event
-                event_type = "system" if username == "System" else "chat"
-                
-                data = {
-                    "type": event_type,
-                    "username": username,
-                    "message": message,
-                    "timestamp": event.timestamp.timestamp(),
-                }
-
-                self.socketio.emit("chaturbate_event", data, namespace="/chaturbate")
-                logger.debug(
-                    f"Processed chat event to InfluxDB and WebSocket: {username}: {message[:50]}..."
-                )
+        await self._run_pipeline("chatMessage", event)
 
-        except Exception as e:
-            logger.error(f"Error handling chat event: {e}")
+    async def handle_private_message(self, event) -> None:
+        """Handle private message events, write to InfluxDB, and forward to WebSocket."""
+        await self._run_pipeline("privateMessage", event)
+
+    async def _run_pipeline(self, method: str, event) -> None:
+        """Run an event through the pipeline and record its latency."""
+        started = time.perf_counter()
+        await self.pipeline.run(method, event)
+        self.rolling_stats.observe_latency(
+            time.perf_counter() - started,
+            queue_depth=handler_loop.pending if handler_loop else None,
+        )
 
     async def handle_message(self, event) -> None:
         """Handle generic message events and forward to WebSocket."""
@@ -203,73 +411,351 @@ class WebSocketEventHandler(ChaturbateClientEventHandler):
                     "timestamp": event.timestamp.timestamp(),
                 }
 
-                self.socketio.emit("chaturbate_event", data, namespace="/chaturbate")
+                self._publish("chaturbate_event", data, self._streamer_room(event))
                 logger.debug(f"Processed and forwarded generic message event")
 
         except Exception as e:
             logger.error(f"Error handling message event: {e}")
 
-    async def handle_private_message(self, event) -> None:
-        """Handle private message events, write to InfluxDB, and forward to WebSocket."""
-        try:
-            # Process with parent handler first
-            await super().handle_private_message(event)
-
-            if event and event.object and event.object.user:
-                from_username = event.object.user.username or "Anonymous"
-                message = event.object.message or ""
-
-                # For private messages, we need to determine the recipient
-                # In a real implementation, this would come from the event data
-                # For demo purposes, we'll use the actual logged-in user's ID
-                to_username = "google-oauth2|101763761877997490084"
-                
-                logger.info(f"🔒 Processing private message: {from_username} -> {to_username}: {message}")
-
-                # Write to InfluxDB with specific tags for private messages
-                point = (
-                    Point("chaturbate_events")
-                    .tag("method", "privateMessage")
-                    .tag("from_user", from_username)
-                    .tag("to_user", to_username)
-                    .tag("is_read", "false")
-                    .field("object.user.username", from_username)
-                    .field("object.message", message)
-                    .field("from_user", from_username)
-                    .field("to_user", to_username)
-                    .time(event.timestamp)
-                )
+    async def _validate_stage(self, ctx: EventContext) -> None:
+        """Drop events missing the fields every stage relies on."""
+        event = ctx.event
+        if not event or not event.object or not event.object.user:
+            ctx.drop("invalid")
+        elif ctx.method == "tip" and not event.object.tip:
+            ctx.drop("invalid")
+
+    async def _dedup_stage(self, ctx: EventContext) -> None:
+        """Drop events that were already processed."""
+        if self.dedup.is_duplicate(ctx.method, ctx.event):
+            logger.debug(f"Skipping duplicate {ctx.method} event")
+            ctx.drop("duplicate")
+
+    async def _enrich_stage(self, ctx: EventContext) -> None:
+        """Run the base handler and build the point and socket payload."""
+        if ctx.method == "tip":
+            await self._enrich_tip(ctx)
+        elif ctx.method == "chatMessage":
+            await self._enrich_chat(ctx)
+        elif ctx.method == "privateMessage":
+            await self._enrich_private_message(ctx)
+
+    async def _enrich_tip(self, ctx: EventContext) -> None:
+        event = ctx.event
+        await super().handle_tip(event)
+
+        username = event.object.user.username or "Anonymous"
+        amount = event.object.tip.tokens or 0
+        message = getattr(event.object.tip, "message", "") or event.object.message or ""
+
+        ctx.point = (
+            Point("chaturbate_events")
+            .tag("method", "tip")
+            .tag("username", username)
+            .field("object.tip.tokens", amount)
+            .field("object.user.username", username)
+            .field("object.tip.message", message)
+            .time(event.timestamp)
+        )
+        ctx.data = {"username": username, "amount": amount}
+        ctx.emits.append(
+            (
+                "chaturbate_event",
+                {
+                    "type": "tip",
+                    "username": username,
+                    "amount": amount,
+                    "message": message,
+                    "timestamp": event.timestamp.timestamp(),
+                },
+                self._streamer_room(event),
+            )
+        )
 
-                self._write_to_influx(point)
-                logger.info(f"✅ Wrote private message to InfluxDB")
+    async def _enrich_chat(self, ctx: EventContext) -> None:
+        event = ctx.event
+        # The base handler drops spam and rejected commands
+        keep, command = await self._filter_chat(event)
+        reply = self._command_reply(event, command)
+        if not keep:
+            if reply is None:
+                ctx.drop("filtered")
+            else:
+                # Still tell the room how to use a mistyped command
+                ctx.emits.append(reply)
+            return
 
-                data = {
+        username = event.object.user.username or "Anonymous"
+        message = event.object.message or ""
+
+        # Determine if this is a system message
+        method = "system" if username == "System" else "chatMessage"
+
+        ctx.point = (
+            Point("chaturbate_events")
+            .tag("method", method)
+            .tag("username", username)
+            .field("object.user.username", username)
+            .field("object.message", message)
+            .time(event.timestamp)
+        )
+        ctx.data = {"username": username, "message": message}
+        if method == "chatMessage":
+            ctx.data["index"] = {"kind": "chat", "from_user": username}
+        ctx.emits.append(
+            (
+                "chaturbate_event",
+                {
+                    "type": "system" if method == "system" else "chat",
+                    "username": username,
+                    "message": message,
+                    "timestamp": event.timestamp.timestamp(),
+                },
+                self._streamer_room(event),
+            )
+        )
+        if reply is not None:
+            ctx.emits.append(reply)
+
+    def _command_reply(
+        self, event, command: Optional[CommandResult]
+    ) -> Optional[Tuple[str, Dict, str]]:
+        """The socket emit carrying a chat command's reply, if it has one."""
+        if command is None or not command.reply:
+            return None
+        return (
+            "chaturbate_event",
+            {
+                "type": "command_reply",
+                "username": event.object.user.username or "Anonymous",
+                "command": command.command,
+                "message": command.reply,
+                "timestamp": event.timestamp.timestamp(),
+            },
+            self._streamer_room(event),
+        )
+
+    async def _enrich_private_message(self, ctx: EventContext) -> None:
+        event = ctx.event
+        await super().handle_private_message(event)
+
+        from_username = event.object.user.username or "Anonymous"
+        message = event.object.message or ""
+
+        # For private messages, we need to determine the recipient
+        # In a real implementation, this would come from the event data
+        # For demo purposes, we'll use the actual logged-in user's ID
+        to_username = "google-oauth2|101763761877997490084"
+
+        # Assign a stable ID; the point is written at the ID's
+        # (strictly increasing) timestamp so lookups by ID are exact
+        location = get_message_id_index().assign(
+            event.timestamp, from_username, to_username, message
+        )
+
+        ctx.point = (
+            Point("chaturbate_events")
+            .tag("method", "privateMessage")
+            .tag("from_user", from_username)
+            .tag("to_user", to_username)
+            .tag("is_read", "false")
+            .field("object.user.username", from_username)
+            .field("object.message", message)
+            .field("from_user", from_username)
+            .field("to_user", to_username)
+            .field("message_id", location.message_id)
+            .time(location.time_us * 1000)
+        )
+        ctx.data = {
+            "username": from_username,
+            "message": message,
+            "to_user": to_username,
+            "index": {
+                "kind": "private_message",
+                "from_user": from_username,
+                "to_user": to_username,
+                "message_id": location.message_id,
+            },
+        }
+        ctx.emits.append(
+            (
+                "private_message",
+                {
+                    "id": location.message_id,
                     "type": "private_message",
                     "from_username": from_username,
                     "to_username": to_username,
                     "message": message,
                     "timestamp": event.timestamp.timestamp(),
                     "is_read": False,
-                }
+                },
+                user_room(to_username),
+            )
+        )
 
-                # Emit to specific user namespace or broadcast for now
-                self.socketio.emit("private_message", data, namespace="/chaturbate")
-                logger.info(
-                    f"✅ Emitted private message to WebSocket: {from_username} -> {to_username}"
-                )
+    def _streamer_room(self, event) -> str:
+        """Room for an event's public broadcast, by its broadcaster."""
+        broadcaster = getattr(event.object, "broadcaster", None) or self.streamer
+        return streamer_room(broadcaster)
 
-        except Exception as e:
-            logger.error(f"Error handling private message event: {e}")
+    def _enqueue(self, room: str, name: str, payload, droppable: bool) -> None:
+        """Queue a frame for every acknowledging client of a room."""
+        for sid in list(queued_members.get(room, ())):
+            self.send_queues.put(sid, name, payload, droppable)
+
+    def _send_frame(self, sid: str, name: str, payload, callback) -> None:
+        """Emit one queued frame to a client, asking for an acknowledgement."""
+        self.socketio.emit(
+            name, payload, namespace="/chaturbate", to=sid, callback=callback
+        )
+
+    def _disconnect_client(self, sid: str) -> None:
+        """Disconnect a client that fell too far behind."""
+        self.socketio.server.disconnect(sid, namespace="/chaturbate")
+
+    async def _persist_stage(self, ctx: EventContext) -> None:
+        """Write the point to InfluxDB and index searchable messages."""
+        if ctx.point is not None:
+            self._write_to_influx(ctx.point)
+        if ctx.method == "privateMessage":
+            get_inbox_stats_cache().invalidate(ctx.data["to_user"])
+        if "index" in ctx.data:
+            self._index_message(
+                message=ctx.data["message"],
+                timestamp=ctx.event.timestamp,
+                **ctx.data["index"],
+            )
+
+    async def _broadcast_stage(self, ctx: EventContext) -> None:
+        """Publish the prepared payloads to WebSocket clients."""
+        for name, payload, room in ctx.emits:
+            self._publish(name, payload, room, urgent=self._is_urgent(ctx))
+
+    def _is_urgent(self, ctx: EventContext) -> bool:
+        """Whether an event skips the batch window."""
+        return ctx.method == "tip" and ctx.data.get("amount", 0) >= URGENT_TIP_TOKENS
+
+    def _publish(
+        self, name: str, payload: Dict, room: Optional[str], urgent: bool = False
+    ) -> None:
+        """Publish an event to every socket-serving worker.
+
+        Room events are numbered by the backplane, so events published by
+        several ingest workers share one ascending sequence. A room of None
+        reaches every client of the namespace and is not numbered.
+        """
+        message = {"name": name, "payload": payload, "room": room, "urgent": urgent}
+        if room is None:
+            self.backplane.publish(EVENTS_CHANNEL, message)
+        else:
+            self.backplane.publish_numbered(EVENTS_CHANNEL, message)
+
+    def broadcast(self, name: str, payload: Dict) -> None:
+        """Send an event to every client of the namespace on every worker."""
+        self._publish(name, payload, None)
+
+    def _on_backplane_event(self, message: Dict) -> None:
+        """Record a published event in its room's ring and send it to the room.
+
+        Filtered variants of the room receive the event if their filter
+        matches; every variant shares one encoding of the payload.
+        """
+        name, payload, room = message["name"], message["payload"], message["room"]
+        urgent = message.get("urgent", False)
+        encoded = EncodedPayload(payload)
+        if room is None:
+            self._emit(name, payload, room, encoded)
+            return
+
+        self.recent_events.record(room, name, payload, seq=message.get("seq"))
+        self._deliver(name, payload, room, encoded, urgent)
+        for subscription, _ in list(room_filters.get(room, {}).values()):
+            if subscription.matches(payload):
+                target = filtered_room(room, subscription.key)
+                self._deliver(name, payload, target, encoded, urgent)
+
+    def _deliver(
+        self,
+        name: str,
+        payload: Dict,
+        room: str,
+        encoded: EncodedPayload,
+        urgent: bool,
+    ) -> None:
+        """Send an event to a room and queue it for the room's batching clients."""
+        self._emit(name, payload, room, encoded)
+        if name == "chaturbate_event" and has_members(batch_room(room)):
+            self.batcher.add(batch_room(room), payload, urgent=urgent)
+
+    def _emit_batch(self, room: str, payloads: List[Dict]) -> None:
+        """Send one batch frame to a batch room."""
+        self._emit("chaturbate_events", payloads, room)
+
+    def _emit(
+        self,
+        name: str,
+        payload,
+        room: Optional[str],
+        encoded: Optional[EncodedPayload] = None,
+    ) -> None:
+        """Emit to a room and to its encoded variants that have clients.
+
+        The payload is encoded at most once per encoding; Socket.IO sends the
+        encoded bytes as a binary attachment without re-serialising them.
+        """
+        if room is None:
+            self.socketio.emit(name, payload, namespace="/chaturbate")
+            return
+        droppable = is_droppable(name, payload)
+        if room_members.get(room):
+            self.socketio.emit(name, payload, namespace="/chaturbate", to=room)
+            self._enqueue(room, name, payload, droppable)
+
+        encoded = encoded or EncodedPayload(payload)
+        for encoding in available_encodings():
+            target = encoded_room(room, encoding)
+            if not room_members.get(target):
+                continue
+            buffer = encoded.encode(encoding)
+            self.socketio.emit(name, buffer, namespace="/chaturbate", to=target)
+            self._enqueue(target, name, buffer, droppable)
+            stats = self.encoding_stats[encoding]
+            stats["frames"] += 1
+            stats["bytes"] += len(buffer)
+
+    async def _analytics_stage(self, ctx: EventContext) -> None:
+        """Log the processed event."""
+        if ctx.method == "tip":
+            logger.info(
+                f"Processed tip event to InfluxDB and WebSocket: {ctx.data['username']} tipped {ctx.data['amount']} tokens"
+            )
+        elif ctx.method == "privateMessage":
+            logger.info(
+                f"✅ Processed private message: {ctx.data['username']} -> {ctx.data['to_user']}"
+            )
+        else:
+            logger.debug(
+                f"Processed {ctx.method} event to InfluxDB and WebSocket: {ctx.data.get('username')}"
+            )
 
 
 class DemoEventGenerator:
-    """Demo event generator that creates proper event objects and processes them through the event handler."""
+    """Generates a slow trickle of demo events while clients are connected.
+
+    A thin wrapper around the seeded LoadGenerator: events are drawn from the
+    demo user population and handled on the shared handler loop, in the demo
+    room, so generation needs no thread or event loop of its own and keeps
+    working when gevent patches threading.
+    """
 
-    def __init__(self, event_handler: WebSocketEventHandler):
+    def __init__(self, event_handler: WebSocketEventHandler, handler_loop: HandlerLoop):
         self.event_handler = event_handler
+        self.handler_loop = handler_loop
         self.running = False
-        self.last_private_message_time = time.time()
-        self.private_message_interval = 120  # 2 minutes in seconds
+        self.profile = LoadProfile(rate=DEMO_EVENT_RATE, zipf_exponent=1.0)
+        self._dispatch = handler_sink(event_handler)
+        # Bumped on every start so a stopped run ends even if restarted quickly
+        self._generation = 0
 
     def start(self):
         """Start generating demo events."""
@@ -277,206 +763,508 @@ class DemoEventGenerator:
             return
 
         self.running = True
+        self._generation += 1
         logger.info("Starting demo event generator with real event handler processing")
-
-        def generate_events():
-            while self.running and connected_clients:
-                try:
-                    # Generate random events and process them through the event handler
-                    # 70% tips, 29% chat, 1% private messages (less frequent)
-                    event_type = random.choices(
-                        ["tip", "chat", "private_message"], weights=[70, 29, 1], k=1
-                    )[0]
-
-                    if event_type == "tip":
-                        # Create a proper tip event object matching real Chaturbate structure
-                        # Use consistent usernames with different tip patterns
-                        tipper_profiles = [
-                            ("WhaleKing", [100, 200, 500, 1000]),  # Big spender
-                            ("DiamondHands", [50, 100, 200, 500]),  # Generous regular
-                            ("LoyalFan", [25, 50, 100, 100]),  # Consistent tipper
-                            ("NewSupporter", [10, 25, 50]),  # New supporter
-                            ("RandomTipper", [5, 10, 25, 50]),  # Occasional tipper
-                            ("BigSpender2024", [200, 500, 1000]),  # VIP
-                            ("GenerousViewer", [100, 150, 200]),  # Premium supporter
-                        ]
-
-                        # Pick a tipper profile
-                        username, amounts = random.choice(tipper_profiles)
-                        user = MockUser(username=username)
-                        amount = random.choice(amounts)
-                        tip_message = random.choice(
-                            [
-                                "Thanks!",
-                                "Great show!",
-                                "Keep it up!",
-                                "You're amazing!",
-                                "Love the stream!",
-                                "",
-                            ]
-                        )
-
-                        tip = MockTip(tokens=amount, message=tip_message)
-                        tip_object = MockTipObject(
-                            user=user, tip=tip, message=tip_message
-                        )
-                        event = MockEvent(object=tip_object)
-
-                        # Process through the real event handler
-                        self._run_async_handler(self.event_handler.handle_tip(event))
-
-                    elif event_type == "chat":
-                        # Create a proper chat event object
-                        # Mix of tippers and regular chatters
-                        chat_users = [
-                            "WhaleKing",
-                            "DiamondHands",
-                            "LoyalFan",
-                            "NewSupporter",
-                            "ChatUser1",
-                            "Viewer2",
-                            "RegularFan",
-                            "QuietViewer",
-                            "BigSpender2024",
-                            "GenerousViewer",
-                        ]
-                        user = MockUser(username=random.choice(chat_users))
-                        chat_message = random.choice(
-                            [
-                                "Hello!",
-                                "How are you?",
-                                "Great stream!",
-                                "What time is it?",
-                                "You look amazing!",
-                                "😍",
-                                "Thanks for the show!",
-                                "Keep up the good work!",
-                                "When is the next stream?",
-                                "Love your content!",
-                            ]
-                        )
-
-                        chat_object = MockChatObject(user=user, message=chat_message)
-                        event = MockEvent(object=chat_object, timestamp=datetime.now())
-
-                        # Process through the real event handler
-                        self._run_async_handler(self.event_handler.handle_chat(event))
-
-                    elif event_type == "private_message":
-                        # Create a proper private message event object
-                        pm_senders = [
-                            "SecretAdmirer",
-                            "VIPFan",
-                            "WhaleKing",
-                            "DiamondHands",
-                            "MysteryUser",
-                            "PrivateSupporter",
-                            "SilentFan",
-                            "AnonymousViewer",
-                        ]
-                        user = MockUser(username=random.choice(pm_senders))
-                        private_messages = [
-                            "Hey, can we chat privately?",
-                            "I love your shows! ❤️",
-                            "Are you available for a private show?",
-                            "Thanks for the amazing content!",
-                            "Just wanted to say hi privately 😊",
-                            "You're incredible!",
-                            "Can I request something special?",
-                            "Hope you're having a great day!",
-                            "Would love to support you more",
-                            "Your last show was amazing!",
-                        ]
-
-                        chat_object = MockChatObject(
-                            user=user, message=random.choice(private_messages)
-                        )
-                        event = MockEvent(object=chat_object, timestamp=datetime.now())
-
-                        # Process through the real event handler
-                        self._run_async_handler(
-                            self.event_handler.handle_private_message(event)
-                        )
-
-                    logger.debug(f"Generated and processed demo event: {event_type}")
-
-                    # Wait 1-3 seconds between events for more frequent tips
-                    time.sleep(random.uniform(1, 3))
-
-                except Exception as e:
-                    logger.error(f"Error generating demo event: {e}")
-                    time.sleep(5)
-
-            logger.info("Demo event generator stopped")
-
-        # Start in background thread
-        thread = threading.Thread(target=generate_events, daemon=True)
-        thread.start()
+        if not self.handler_loop.submit(
+            self._generate(self._generation), room=DEMO_ROOM, block=False
+        ):
+            self.running = False
+            raise RuntimeError("Handler loop is not accepting work")
 
     def stop(self):
         """Stop generating demo events."""
         self.running = False
         logger.info("Stopping demo event generator")
 
-    def _run_async_handler(self, coro):
-        """Run async handler in a new thread with event loop."""
-
-        def run():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(coro)
-            finally:
-                loop.close()
+    def _should_stop(self, generation: int) -> bool:
+        return not (
+            self.running
+            and generation == self._generation
+            and (connected_clients or cluster_state()["connected_clients"])
+        )
 
-        thread = threading.Thread(target=run, daemon=True)
-        thread.start()
+    async def _generate(self, generation: int) -> None:
+        """Feed generated events through the handler until stopped."""
+        generator = LoadGenerator(self.profile, usernames=DEMO_USERS)
+        try:
+            report = await generator.run(
+                self._dispatch, should_stop=lambda: self._should_stop(generation)
+            )
+            logger.info(f"Demo event generator stopped after {report.events} events")
+        except Exception as e:
+            logger.error(f"Demo event generator failed: {e}")
+            if generation == self._generation:
+                self.running = False
+                demo_generator_failed(str(e))
 
 
 demo_generator: Optional[DemoEventGenerator] = None
 event_handler: Optional[WebSocketEventHandler] = None
+handler_loop: Optional[HandlerLoop] = None
 
 
 def setup_socketio(app, socket_io: SocketIO):
     """Setup SocketIO event handlers for Chaturbate connections."""
-    global socketio, demo_generator, event_handler
+    global socketio, demo_generator, event_handler, handler_loop
     socketio = socket_io
-    event_handler = WebSocketEventHandler(socketio)
-    demo_generator = DemoEventGenerator(event_handler)
+    backplane = create_backplane(BACKPLANE_URL)
+    event_handler = WebSocketEventHandler(socketio, backplane=backplane)
+    atexit.register(event_handler.disable_capture)
+    # Registered before the handler loop, so it runs after the loop has drained
+    atexit.register(event_handler.search_index.save)
+
+    # Only ingest workers run the demo client; others ask them over the backplane
+    if WORKER_ROLE != SOCKET_ROLE:
+        backplane.subscribe(CONTROL_CHANNEL, handle_control_message)
+    # Inbox stats are cached per worker; invalidate them on every worker
+    stats_cache = get_inbox_stats_cache()
+    backplane.subscribe(
+        INBOX_CHANNEL, lambda message: stats_cache.discard(message["username"])
+    )
+    stats_cache.broadcast_invalidations(
+        lambda username: backplane.publish(INBOX_CHANNEL, {"username": username})
+    )
+    backplane.start()
+    atexit.register(backplane.close)
+    socket_io.start_background_task(run_state_reporter, event_handler, socket_io.sleep)
+    atexit.register(backplane.delete_state, WORKER_ID)
+
+    # Flush micro-batches for batching clients in the background
+    socket_io.start_background_task(event_handler.batcher.run, socket_io.sleep)
+    atexit.register(event_handler.batcher.close)
+
+    # Disconnect acknowledging clients that fall too far behind
+    socket_io.start_background_task(event_handler.send_queues.run, socket_io.sleep)
+    atexit.register(event_handler.send_queues.stop)
+
+    # One long-lived loop runs every handler coroutine; drain it on exit
+    handler_loop = HandlerLoop()
+    handler_loop.start()
+    atexit.register(handler_loop.stop)
+
+    demo_generator = DemoEventGenerator(event_handler, handler_loop)
 
     @socket_io.on("connect", namespace="/chaturbate")
-    def handle_connect():
-        """Handle WebSocket connection."""
+    def handle_connect(auth=None):
+        """Handle WebSocket connection.
+
+        Clients join their streamer's room (``auth["streamer"]`` or the
+        ``streamer`` query parameter, default DEFAULT_STREAMER). Clients that
+        send an Auth0 access token as ``auth["token"]`` also join their user
+        room and receive their private messages; an invalid token refuses the
+        connection. Clients that set ``auth["batch"]`` (or the ``batch``
+        query parameter) receive public events as ``chaturbate_events``
+        batch frames instead of one ``chaturbate_event`` per event. Clients
+        that set ``auth["encoding"]`` (or the ``encoding`` query parameter)
+        to one of ``available_encodings()`` receive every payload as bytes
+        in that encoding; an unknown encoding refuses the connection.
+
+        Clients that set ``auth["ack"]`` must acknowledge every event frame;
+        they get a bounded per-connection send queue (see
+        WebSocketEventHandler) instead of joining Socket.IO rooms.
+
+        ``auth["subscribe"]`` may declare a subscription filter up front, as
+        the ``subscribe`` message does; an invalid filter refuses the
+        connection.
+
+        The client is then sent an ``event_snapshot`` of up to
+        SNAPSHOT_EVENTS recent events of its rooms, newer than ``auth["since"]``
+        (or the ``since`` query parameter), the last ``seq`` it saw.
+        """
         client_id = request.sid
+        auth = auth if isinstance(auth, dict) else {}
+        streamer = (
+            auth.get("streamer") or request.args.get("streamer") or DEFAULT_STREAMER
+        )
+        batched = bool(auth.get("batch")) or request.args.get("batch") in ("1", "true")
+        rooms = [streamer_room(streamer)]
+
+        encoding = (
+            auth.get("encoding") or request.args.get("encoding") or OBJECT_ENCODING
+        )
+        if encoding != OBJECT_ENCODING and encoding not in available_encodings():
+            logger.warning(
+                f"Rejected Chaturbate WebSocket client {client_id}: "
+                f"unsupported encoding '{encoding}'"
+            )
+            raise ConnectionRefusedError(f"Unsupported encoding '{encoding}'")
+
+        token = auth.get("token")
+        if token:
+            try:
+                payload = verify_decode_jwt(token, Auth0Config())
+            except AuthError as e:
+                logger.warning(
+                    f"Rejected Chaturbate WebSocket client {client_id}: {e.error}"
+                )
+                raise ConnectionRefusedError(e.error["description"])
+            rooms.append(user_room(payload["sub"]))
+
+        try:
+            subscription = SubscriptionFilter.from_request(auth.get("subscribe"))
+        except ValueError as e:
+            logger.warning(f"Rejected Chaturbate WebSocket client {client_id}: {e}")
+            raise ConnectionRefusedError(str(e))
+
+        client = SocketClient(
+            sid=client_id,
+            rooms=rooms,
+            encoding=encoding,
+            batched=batched,
+            filter=subscription,
+            acked=bool(auth.get("ack")),
+        )
+        if client.acked:
+            event_handler.send_queues.open(client_id)
+        track_filter(client, 1)
+        move_client(client, joined_rooms(client))
+        clients[client_id] = client
         connected_clients.add(client_id)
-        logger.info(f"Client {client_id} connected to Chaturbate WebSocket")
+        joined = client.joined
+        logger.info(
+            f"Client {client_id} connected to Chaturbate WebSocket, rooms: {joined}"
+        )
 
         # Send connection confirmation
-        emit("connection_status", {"status": "connected"})
+        emit(
+            "connection_status",
+            {
+                "status": "connected",
+                "rooms": joined,
+                "authenticated": bool(token),
+                "batched": batched,
+                "encoding": encoding,
+                "filter": subscription.to_dict() if subscription else None,
+                "acked": client.acked,
+            },
+        )
+        since = auth.get("since") or request.args.get("since")
+        send_snapshot(client, since)
+        report_worker_state()
 
         # Start demo client if not already running
-        start_demo_client()
+        request_demo_client("start")
 
     @socket_io.on("disconnect", namespace="/chaturbate")
     def handle_disconnect():
         """Handle WebSocket disconnection."""
         client_id = request.sid
         connected_clients.discard(client_id)
+        client = clients.pop(client_id, None)
+        if client:
+            track_filter(client, -1)
+            for room in client.joined:
+                count_member(room, -1)
+                queued_members.get(room, set()).discard(client_id)
+            event_handler.send_queues.close(client_id)
         logger.info(f"Client {client_id} disconnected from Chaturbate WebSocket")
+        report_worker_state()
 
-        # Stop demo client if no clients connected
+        # Stop demo client if no clients are connected to any worker
         if not connected_clients:
-            stop_demo_client()
+            request_demo_client("stop_if_idle")
+
+    @socket_io.on("request_snapshot", namespace="/chaturbate")
+    def handle_request_snapshot(data=None):
+        """Send recent events newer than ``data["since"]`` (up to ``data["limit"]``)."""
+        client = clients.get(request.sid)
+        if client is None:
+            return
+        data = data if isinstance(data, dict) else {}
+        send_snapshot(client, data.get("since"), data.get("limit"))
+
+    @socket_io.on("subscribe", namespace="/chaturbate")
+    def handle_subscribe(data=None):
+        """Replace the client's subscription filter.
+
+        ``data`` may hold ``types`` (payload types such as "tip" or "chat"),
+        ``min_tip`` (minimum tokens of tips) and ``usernames``; ``None`` or an
+        empty object clears the filter. The acknowledgement holds the active
+        filter, or an error if the filter is invalid.
+        """
+        client = clients.get(request.sid)
+        if client is None:
+            return {"error": "Not connected"}
+        try:
+            subscription = SubscriptionFilter.from_request(data)
+        except ValueError as e:
+            return {"error": str(e)}
+
+        # Register the new filter and join its rooms before leaving the old
+        # ones, so no event is lost while switching
+        previous = SocketClient(
+            sid=client.sid, rooms=client.rooms, filter=client.filter
+        )
+        client.filter = subscription
+        track_filter(client, 1)
+        move_client(client, joined_rooms(client))
+        track_filter(previous, -1)
+        described = subscription.to_dict() if subscription else None
+        logger.info(f"Client {client.sid} subscribed with filter {described}")
+
+        return {
+            "status": "subscribed",
+            "filter": described,
+            "rooms": client.joined,
+        }
 
     @socket_io.on("start_chaturbate", namespace="/chaturbate")
     def handle_start_chaturbate():
         """Handle request to start Chaturbate client."""
-        start_demo_client()
+        request_demo_client("start")
 
     @socket_io.on("stop_chaturbate", namespace="/chaturbate")
     def handle_stop_chaturbate():
         """Handle request to stop Chaturbate client."""
+        request_demo_client("stop")
+
+
+def count_member(room: str, delta: int) -> None:
+    """Adjust the client count of a joined room."""
+    remaining = room_members.get(room, 0) + delta
+    if remaining > 0:
+        room_members[room] = remaining
+    else:
+        room_members.pop(room, None)
+
+
+def track_filter(client: SocketClient, delta: int) -> None:
+    """Adjust the client count of a client's filter on each of its rooms."""
+    if client.filter is None:
+        return
+    key = client.filter.key
+    for room in client.rooms:
+        filters = room_filters.setdefault(room, {})
+        _, count = filters.get(key, (client.filter, 0))
+        if count + delta > 0:
+            filters[key] = (client.filter, count + delta)
+        else:
+            filters.pop(key, None)
+            if not filters:
+                room_filters.pop(room, None)
+
+
+def move_client(client: SocketClient, joined: List[str]) -> None:
+    """Join a client to a new set of Socket.IO rooms, then leave the old ones."""
+    for room in joined:
+        if room in client.joined:
+            continue
+        if client.acked:
+            queued_members.setdefault(room, set()).add(client.sid)
+        else:
+            join_room(room, sid=client.sid, namespace="/chaturbate")
+        count_member(room, 1)
+    for room in client.joined:
+        if room in joined:
+            continue
+        if client.acked:
+            queued_members.get(room, set()).discard(client.sid)
+        else:
+            leave_room(room, sid=client.sid, namespace="/chaturbate")
+        count_member(room, -1)
+    client.joined = joined
+
+
+def _parse_seq(value, default: int) -> int:
+    """Parse a client-supplied sequence number or count."""
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return default
+
+
+def read_events(
+    recent: RecentEvents,
+    rooms: List[str],
+    since: int,
+    limit: Optional[int] = None,
+    resume: bool = False,
+) -> Tuple[List[RecentEvent], int]:
+    """Read the kept events of some rooms newer than a sequence number.
+
+    A ``since`` above the latest sequence number means the numbering
+    restarted (e.g. the ingest worker restarted), so every kept event is
+    returned.
+
+    Args:
+        recent: The recent-events rings
+        rooms: Rooms to read
+        since: Only events with a higher sequence number are read
+        limit: Maximum number of events returned
+        resume: Return the oldest ``limit`` events after ``since``, so a
+            reader resuming after a burst pages through it, instead of the
+            newest ones for an initial snapshot
+
+    Returns:
+        The events in sequence order and the sequence number to resume
+        from: no kept event of ``rooms`` up to it is left unread
+    """
+    last_seq = recent.last_seq
+    if since > last_seq:
+        since = 0
+    if resume and limit is not None:
+        events = recent.snapshot(rooms, since=since)
+        if len(events) > limit:
+            events = events[:limit] if limit > 0 else []
+            return events, events[-1][0] if events else since
+    else:
+        events = recent.snapshot(rooms, since=since, limit=limit)
+    if events:
+        last_seq = max(last_seq, events[-1][0])
+    return events, last_seq
+
+
+def events_body(events: List[RecentEvent], last_seq: int) -> Dict:
+    """The ``{"events": [{"seq", "name", "data"}], "last_seq"}`` body of a read."""
+    return {
+        "events": [
+            {"seq": seq, "name": name, "data": payload} for seq, name, payload in events
+        ],
+        "last_seq": last_seq,
+    }
+
+
+def http_rooms() -> List[str]:
+    """Rooms of an HTTP reader: its ``streamer``'s and, with a bearer token, its own.
+
+    Raises:
+        AuthError: If an Authorization header is sent but not valid
+    """
+    rooms = [streamer_room(request.args.get("streamer") or DEFAULT_STREAMER)]
+    if request.headers.get("Authorization"):
+        payload = verify_decode_jwt(get_token_auth_header(), Auth0Config())
+        rooms.append(user_room(payload["sub"]))
+    return rooms
+
+
+def stream_events(
+    recent: RecentEvents, rooms: List[str], since: Optional[int]
+) -> Iterator[str]:
+    """Yield Server-Sent Events frames of new events of some rooms, forever.
+
+    Without ``since`` the stream starts with the newest SNAPSHOT_EVENTS kept
+    events; with it, every kept event after ``since`` is sent, oldest first
+    and SNAPSHOT_EVENTS per read. Each frame's id is the event's sequence
+    number, so a reconnecting EventSource resumes through its Last-Event-ID
+    header; a comment frame every EVENT_POLL_SECONDS without events keeps
+    proxies from closing the connection and detects closed ones.
+    """
+    yield f"retry: {SSE_RETRY_MS}\n\n"
+    if since is None:
+        events, since = read_events(recent, rooms, 0, SNAPSHOT_EVENTS)
+    else:
+        events, since = read_events(recent, rooms, since, SNAPSHOT_EVENTS, True)
+    while True:
+        for seq, name, payload in events:
+            data = json.dumps(payload, separators=(",", ":"))
+            yield f"id: {seq}\nevent: {name}\ndata: {data}\n\n"
+        if not events and recent.wait(since, EVENT_POLL_SECONDS) == since:
+            yield ": keepalive\n\n"
+        events, since = read_events(recent, rooms, since, SNAPSHOT_EVENTS, True)
+
+
+def send_snapshot(client: SocketClient, since=None, limit=None) -> None:
+    """Emit an ``event_snapshot`` of recent events to one client.
+
+    The snapshot holds the newest events of the client's rooms with a
+    sequence number above ``since`` that pass its subscription filter, in
+    order, and the latest sequence number so the client can resume from it.
+    """
+    if not event_handler:
+        return
+    limit = min(_parse_seq(limit, SNAPSHOT_EVENTS), SNAPSHOT_EVENTS)
+    events, last_seq = read_events(
+        event_handler.recent_events, client.rooms, _parse_seq(since, 0)
+    )
+    if client.filter is not None:
+        events = [event for event in events if client.filter.matches(event[2])]
+    events = events[-limit:] if limit else []
+    body = events_body(events, last_seq)
+    if client.encoding != OBJECT_ENCODING:
+        body = encode_payload(body, client.encoding)
+    emit("event_snapshot", body, namespace="/chaturbate", to=client.sid)
+
+
+def room_sizes() -> Dict[str, int]:
+    """Number of connected clients in each Socket.IO room."""
+    return dict(room_members)
+
+
+def worker_state() -> Dict:
+    """This worker's role, clients, rooms and demo client status."""
+    return {
+        "role": WORKER_ROLE,
+        "connected_clients": len(connected_clients),
+        "rooms": room_sizes(),
+        "demo_client_running": demo_client_running,
+    }
+
+
+def report_worker_state() -> None:
+    """Share this worker's state with the other workers."""
+    if event_handler:
+        event_handler.backplane.set_state(WORKER_ID, worker_state())
+
+
+def run_state_reporter(handler: WebSocketEventHandler, sleep) -> None:
+    """Refresh this worker's shared state so it does not expire.
+
+    Runs until ``handler`` is replaced, e.g. by another ``setup_socketio``.
+    """
+    while event_handler is handler:
+        report_worker_state()
+        sleep(STATE_REPORT_SECONDS)
+
+
+def cluster_state() -> Dict:
+    """Clients, rooms and demo client status summed over every live worker."""
+    states = event_handler.backplane.get_states() if event_handler else {}
+    states[WORKER_ID] = worker_state()
+
+    rooms: Dict[str, int] = {}
+    for state in states.values():
+        for room, count in state["rooms"].items():
+            rooms[room] = rooms.get(room, 0) + count
+    return {
+        "running": any(state["demo_client_running"] for state in states.values()),
+        "connected_clients": sum(
+            state["connected_clients"] for state in states.values()
+        ),
+        "rooms": rooms,
+        "workers": {
+            worker_id: {
+                "role": state["role"],
+                "connected_clients": state["connected_clients"],
+                "demo_client_running": state["demo_client_running"],
+            }
+            for worker_id, state in states.items()
+        },
+    }
+
+
+def request_demo_client(action: str) -> None:
+    """Ask the ingest worker to "start", "stop" or "stop_if_idle" the demo client."""
+    if event_handler:
+        event_handler.backplane.publish(CONTROL_CHANNEL, {"action": action})
+
+
+def handle_control_message(message: Dict) -> None:
+    """Run a demo client request from any worker."""
+    action = message.get("action")
+    if action == "start":
+        start_demo_client()
+    elif action == "stop":
         stop_demo_client()
+    elif action == "stop_if_idle" and not cluster_state()["connected_clients"]:
+        stop_demo_client()
+
+
+def broadcast(name: str, payload: Dict) -> None:
+    """Send an event to every /chaturbate client on every worker."""
+    if event_handler:
+        event_handler.broadcast(name, payload)
+    elif socketio:
+        socketio.emit(name, payload, namespace="/chaturbate")
 
 
 def start_demo_client():
@@ -492,29 +1280,24 @@ def start_demo_client():
         logger.info("Starting demo Chaturbate client with event handler processing")
 
         # Send status update
-        if socketio:
-            socketio.emit(
-                "chaturbate_status", {"status": "starting"}, namespace="/chaturbate"
-            )
+        broadcast("chaturbate_status", {"status": "starting"})
 
         # Send system message through event handler
-        if event_handler:
+        if event_handler and handler_loop:
             system_event = MockEvent(
                 object=MockChatObject(
                     user=MockUser(username="System"),
                     message="Demo Chaturbate client started - events will be processed through handler",
                 )
             )
-            demo_generator._run_async_handler(event_handler.handle_chat(system_event))
+            handler_loop.submit(event_handler.handle_chat(system_event), room=DEMO_ROOM)
 
         # Start demo event generator
         if demo_generator:
             demo_generator.start()
 
-        if socketio:
-            socketio.emit(
-                "chaturbate_status", {"status": "running"}, namespace="/chaturbate"
-            )
+        broadcast("chaturbate_status", {"status": "running"})
+        report_worker_state()
 
         logger.info(
             "Demo client started successfully - events will go through ChaturbateClientEventHandler"
@@ -524,10 +1307,15 @@ def start_demo_client():
         error_msg = f"Failed to start demo client: {str(e)}"
         logger.error(error_msg)
         demo_client_running = False
-        if socketio:
-            socketio.emit(
-                "chaturbate_error", {"error": error_msg}, namespace="/chaturbate"
-            )
+        broadcast("chaturbate_error", {"error": error_msg})
+
+
+def demo_generator_failed(error: str) -> None:
+    """Mark the demo client stopped after its generator died."""
+    global demo_client_running
+    demo_client_running = False
+    broadcast("chaturbate_error", {"error": f"Demo event generator failed: {error}"})
+    report_worker_state()
 
 
 def stop_demo_client():
@@ -542,50 +1330,73 @@ def stop_demo_client():
         logger.info("Stopping demo Chaturbate client")
         demo_client_running = False
 
-        if socketio:
-            socketio.emit(
-                "chaturbate_status", {"status": "stopping"}, namespace="/chaturbate"
-            )
+        broadcast("chaturbate_status", {"status": "stopping"})
 
         # Stop demo event generator
         if demo_generator:
             demo_generator.stop()
 
         # Send system message through event handler
-        if event_handler and demo_generator:
+        if event_handler and handler_loop:
             system_event = MockEvent(
                 object=MockChatObject(
                     user=MockUser(username="System"),
                     message="Demo Chaturbate client stopped",
                 )
             )
-            demo_generator._run_async_handler(event_handler.handle_chat(system_event))
+            handler_loop.submit(event_handler.handle_chat(system_event), room=DEMO_ROOM)
 
-        if socketio:
-            socketio.emit(
-                "chaturbate_status", {"status": "stopped"}, namespace="/chaturbate"
-            )
+        broadcast("chaturbate_status", {"status": "stopped"})
+        report_worker_state()
 
         logger.info("Demo client stopped successfully")
 
     except Exception as e:
         error_msg = f"Error stopping demo client: {str(e)}"
         logger.error(error_msg)
-        if socketio:
-            socketio.emit(
-                "chaturbate_error", {"error": error_msg}, namespace="/chaturbate"
-            )
+        broadcast("chaturbate_error", {"error": error_msg})
+
+
+def shutdown_socketio(reason: str = "Server shutting down") -> None:
+    """Prepare the Socket.IO side for process exit.
+
+    Stops the demo client, tells every client the server is going away (so
+    it reconnects, resuming from its last ``seq``), sends pending batches
+    and disconnects all clients. Queued handlers are drained by the handler
+    loop's exit hook afterwards.
+    """
+    stop_demo_client()
+    if not socketio:
+        return
+
+    socketio.emit(
+        "chaturbate_status",
+        {"status": "shutting_down", "reason": reason},
+        namespace="/chaturbate",
+    )
+    if event_handler:
+        event_handler.batcher.flush()
+        event_handler.send_queues.stop()
+    for client_id in list(connected_clients):
+        socketio.server.disconnect(client_id, namespace="/chaturbate")
+    if event_handler:
+        event_handler.backplane.delete_state(WORKER_ID)
+    logger.info(f"Socket.IO shut down: {reason}")
 
 
 @api.route("/status")
 class ChaturbateStatus(Resource):
     def get(self):
-        """Get current Chaturbate client status."""
-        global demo_client_running
+        """Get current Chaturbate client status across every worker."""
+        cluster = cluster_state()
 
         status = {
-            "running": demo_client_running,
-            "connected_clients": len(connected_clients),
+            "running": cluster["running"],
+            "connected_clients": cluster["connected_clients"],
+            "rooms": cluster["rooms"],
+            "worker_id": WORKER_ID,
+            "workers": cluster["workers"],
+            "subscription_filters": sum(len(f) for f in room_filters.values()),
             "has_credentials": True,  # Always true for demo
             "demo_mode": True,
             "using_real_handler": True,
@@ -595,15 +1406,112 @@ class ChaturbateStatus(Resource):
         # Add event stats if handler is available
         if event_handler and hasattr(event_handler, "get_stats"):
             status["event_stats"] = event_handler.get_stats()
+            status["dedup_stats"] = event_handler.dedup.get_stats()
+            status["pipeline_stats"] = event_handler.pipeline.get_stats()
+            status["send_queues"] = event_handler.send_queues.get_stats()
+            status["backplane"] = event_handler.backplane.get_stats()
 
         return status
 
 
+@api.route("/events/since")
+class ChaturbateEventsSince(Resource):
+    @api.param("seq", "Last sequence number seen; omit for recent events", type=int)
+    @api.param("streamer", "Streamer whose events to read", type=str)
+    @api.param(
+        "timeout",
+        "Seconds to wait for new events",
+        type=int,
+        default=EVENT_POLL_SECONDS,
+    )
+    def get(self):
+        """Long-poll for events newer than a sequence number.
+
+        Returns at once when newer events are kept, otherwise as soon as one
+        arrives or with no events after ``timeout`` seconds. Pass the
+        returned ``last_seq`` as the next ``seq``; after a burst the events
+        come oldest first, at most SNAPSHOT_EVENTS per call. Without ``seq``
+        the newest events are returned. Served from the recent-events rings,
+        without database queries.
+        """
+        if not event_handler:
+            return {"error": "Event handler not initialized"}, 503
+        try:
+            rooms = http_rooms()
+        except AuthError as e:
+            return e.error, e.status_code
+
+        seq = request.args.get("seq")
+        timeout = 0
+        if seq is not None:
+            timeout = min(
+                _parse_seq(request.args.get("timeout"), EVENT_POLL_SECONDS),
+                EVENT_POLL_SECONDS,
+            )
+        recent = event_handler.recent_events
+        since = _parse_seq(seq, 0)
+        deadline = time.monotonic() + timeout
+        while True:
+            events, last_seq = read_events(
+                recent, rooms, since, SNAPSHOT_EVENTS, resume=seq is not None
+            )
+            remaining = deadline - time.monotonic()
+            if events or remaining <= 0:
+                return events_body(events, last_seq)
+            recent.wait(last_seq, remaining)
+            since = last_seq
+
+
+@api.route("/events/stream")
+class ChaturbateEventStream(Resource):
+    @api.param("seq", "Last sequence number seen, if no Last-Event-ID", type=int)
+    @api.param("streamer", "Streamer whose events to read", type=str)
+    def get(self):
+        """Stream events as Server-Sent Events (text/event-stream).
+
+        Served from the recent-events rings, for clients that cannot keep a
+        Socket.IO connection.
+        """
+        if not event_handler:
+            return {"error": "Event handler not initialized"}, 503
+        try:
+            rooms = http_rooms()
+        except AuthError as e:
+            return e.error, e.status_code
+
+        since = request.headers.get("Last-Event-ID") or request.args.get("seq")
+        if since is not None:
+            since = _parse_seq(since, 0)
+        return Response(
+            stream_events(event_handler.recent_events, rooms, since),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+
+@api.route("/metrics")
+class ChaturbateMetrics(Resource):
+    def get(self):
+        """Get per-stage latency and error metrics of the event pipeline."""
+        if not event_handler:
+            return {"error": "Event handler not initialized"}, 503
+
+        return {
+            "pipeline": event_handler.pipeline.get_stats(),
+            "dedup": event_handler.dedup.get_stats(),
+            "events": event_handler.get_stats(),
+            "capture": event_handler.capture.stats if event_handler.capture else None,
+            "batching": event_handler.batcher.get_stats(),
+            "recent_events": event_handler.recent_events.get_stats(),
+            "encoding": event_handler.encoding_stats,
+        }
+
+
 @api.route("/start")
 class ChaturbateStart(Resource):
     def post(self):
         """Start Chaturbate client manually."""
-        start_demo_client()
+        request_demo_client("start")
         return {"message": "Demo Chaturbate client start requested"}
 
 
@@ -611,5 +1519,5 @@ class ChaturbateStart(Resource):
 class ChaturbateStop(Resource):
     def post(self):
         """Stop Chaturbate client manually."""
-        stop_demo_client()
+        request_demo_client("stop")
         return {"message": "Demo Chaturbate client stop requested"}
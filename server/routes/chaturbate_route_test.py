@@ -0,0 +1,417 @@
+import asyncio
+import json
+import time
+
+import pytest
+from flask import Flask
+from flask_restx import Api
+from flask_socketio import SocketIO
+
+import routes.chaturbate_route as chaturbate_route
+from client.load_generator import LoadProfile, MockChatObject, MockEvent, MockUser
+from services.message_search_index import MessageSearchIndex
+from utils.auth import AuthError
+
+RECIPIENT = "google-oauth2|101763761877997490084"
+
+
+@pytest.fixture(name="socketio")
+def socketio_fixture(monkeypatch):
+    """
+    Creates a SocketIO app with the chaturbate handlers, without the demo client.
+    """
+    monkeypatch.setattr(chaturbate_route, "start_demo_client", lambda: None)
+    monkeypatch.setattr(chaturbate_route, "stop_demo_client", lambda: None)
+
+    def fake_verify(token, config):
+        if token != "valid":
+            raise AuthError({"code": "invalid", "description": "bad token"}, 401)
+        return {"sub": RECIPIENT}
+
+    monkeypatch.setattr(chaturbate_route, "verify_decode_jwt", fake_verify)
+    # Keep indexed test messages out of the server's saved search index
+    search_index = MessageSearchIndex(path=None)
+    monkeypatch.setattr(
+        chaturbate_route, "get_message_search_index", lambda: search_index
+    )
+
+    app = Flask(__name__)
+    socket_io = SocketIO(app, async_mode="threading")
+    chaturbate_route.setup_socketio(app, socket_io)
+    chaturbate_route.event_handler.influx_client = None
+    yield app, socket_io
+    chaturbate_route.event_handler.batcher.close()
+    chaturbate_route.event_handler.send_queues.stop()
+    chaturbate_route.handler_loop.stop()
+    # Connections of this app must not leak into the next test
+    for registry in (
+        chaturbate_route.connected_clients,
+        chaturbate_route.clients,
+        chaturbate_route.room_members,
+        chaturbate_route.room_filters,
+        chaturbate_route.queued_members,
+    ):
+        registry.clear()
+
+
+@pytest.fixture(name="http")
+def http_fixture(socketio):
+    """
+    Serves the chaturbate REST namespace on the SocketIO app.
+    """
+    app, _ = socketio
+    Api(app).add_namespace(chaturbate_route.api)
+    return app.test_client()
+
+
+def connect(app, socket_io, auth=None, streamer=None):
+    query = f"?streamer={streamer}" if streamer else ""
+    client = socket_io.test_client(
+        app, namespace="/chaturbate", auth=auth, query_string=query
+    )
+    client.get_received("/chaturbate")
+    return client
+
+
+def received(client, name):
+    return [
+        message["args"][0]
+        for message in client.get_received("/chaturbate")
+        if message["name"] == name
+    ]
+
+
+def send(method, username, message):
+    handler = chaturbate_route.event_handler
+    event = MockEvent(object=MockChatObject(user=MockUser(username), message=message))
+    handle = {
+        "chatMessage": handler.handle_chat,
+        "privateMessage": handler.handle_private_message,
+    }[method]
+    asyncio.run(handle(event))
+
+
+def test_private_messages_reach_only_the_recipient(socketio):
+    app, socket_io = socketio
+    recipient = connect(app, socket_io, auth={"token": "valid"})
+    anonymous = connect(app, socket_io)
+
+    send("privateMessage", "SecretAdmirer", "psst")
+
+    assert [m["message"] for m in received(recipient, "private_message")] == ["psst"]
+    assert received(anonymous, "private_message") == []
+
+
+def test_unregistered_bang_words_are_ordinary_chat(socketio):
+    app, socket_io = socketio
+    client = connect(app, socket_io)
+
+    send("chatMessage", "Viewer1", "!lol")
+    send("chatMessage", "Viewer2", "!omg nice")
+
+    events = received(client, "chaturbate_event")
+    assert [(e["type"], e["message"]) for e in events] == [
+        ("chat", "!lol"),
+        ("chat", "!omg nice"),
+    ]
+
+
+def test_command_replies_reach_the_room(socketio):
+    app, socket_io = socketio
+    client = connect(app, socket_io)
+
+    send("chatMessage", "Viewer1", "!help")
+    send("chatMessage", "Viewer1", "!help me please")
+
+    events = received(client, "chaturbate_event")
+    assert [e["type"] for e in events] == ["chat", "command_reply", "command_reply"]
+    assert events[1]["message"] == "Commands: !help"
+    assert events[2]["message"].startswith("too many arguments. Usage: !help")
+
+
+def test_ingesting_a_private_message_invalidates_inbox_stats(socketio):
+    cache = chaturbate_route.get_inbox_stats_cache()
+    cache.set(RECIPIENT, 7, 2)
+
+    send("privateMessage", "SecretAdmirer", "new")
+
+    assert cache.get(RECIPIENT) is None
+
+
+def test_public_events_reach_only_the_streamer_room(socketio):
+    app, socket_io = socketio
+    default_room = connect(app, socket_io)
+    other_room = connect(app, socket_io, streamer="someone_else")
+
+    send("chatMessage", "Viewer2", "nice stream")
+
+    assert [m["message"] for m in received(default_room, "chaturbate_event")] == [
+        "nice stream"
+    ]
+    assert received(other_room, "chaturbate_event") == []
+    assert chaturbate_route.room_sizes()["streamer:someone_else"] == 1
+
+
+def test_invalid_token_is_refused(socketio):
+    app, socket_io = socketio
+    client = socket_io.test_client(
+        app, namespace="/chaturbate", auth={"token": "forged"}
+    )
+    assert not client.is_connected("/chaturbate")
+
+
+def test_batching_clients_receive_coalesced_frames(socketio):
+    app, socket_io = socketio
+    batched = connect(app, socket_io, auth={"batch": True})
+    single = connect(app, socket_io)
+
+    send("chatMessage", "Viewer2", "one")
+    send("chatMessage", "Viewer2", "two")
+    chaturbate_route.event_handler.batcher.flush()
+
+    frames = received(batched, "chaturbate_events")
+    assert [[m["message"] for m in frame] for frame in frames] == [["one", "two"]]
+    assert received(batched, "chaturbate_event") == []
+    assert len(received(single, "chaturbate_event")) == 2
+
+
+def test_encoded_clients_share_one_pre_encoded_buffer(socketio):
+    app, socket_io = socketio
+    first = connect(app, socket_io, auth={"encoding": "json"})
+    second = connect(app, socket_io, auth={"encoding": "json"})
+
+    send("chatMessage", "Viewer2", "hello")
+
+    [buffer] = received(first, "chaturbate_event")
+    assert json.loads(buffer)["message"] == "hello"
+    assert received(second, "chaturbate_event") == [buffer]
+    assert chaturbate_route.event_handler.encoding_stats["json"]["frames"] == 1
+
+
+def test_unknown_encoding_is_refused(socketio):
+    app, socket_io = socketio
+    client = socket_io.test_client(
+        app, namespace="/chaturbate", auth={"encoding": "xml"}
+    )
+    assert not client.is_connected("/chaturbate")
+
+
+def test_reconnecting_clients_get_a_snapshot_since_their_last_seq(socketio):
+    app, socket_io = socketio
+    send("chatMessage", "Viewer2", "one")
+    send("chatMessage", "Viewer2", "two")
+    send("chatMessage", "Viewer2", "three")
+
+    client = socket_io.test_client(
+        app, namespace="/chaturbate", query_string="?since=1"
+    )
+    [snapshot] = received(client, "event_snapshot")
+    assert [e["data"]["message"] for e in snapshot["events"]] == ["two", "three"]
+    assert snapshot["last_seq"] == 3
+
+    client.emit("request_snapshot", {"since": 2}, namespace="/chaturbate")
+    [snapshot] = received(client, "event_snapshot")
+    assert [e["seq"] for e in snapshot["events"]] == [3]
+
+
+def test_subscription_filters_drop_uninteresting_events(socketio):
+    app, socket_io = socketio
+    tips_only = connect(app, socket_io)
+    everything = connect(app, socket_io)
+
+    ack = tips_only.emit(
+        "subscribe", {"types": ["tip"]}, namespace="/chaturbate", callback=True
+    )
+    send("chatMessage", "Viewer2", "chatter")
+
+    assert ack["filter"]["types"] == ["tip"]
+    assert received(tips_only, "chaturbate_event") == []
+    assert len(received(everything, "chaturbate_event")) == 1
+
+    tips_only.emit("subscribe", {}, namespace="/chaturbate")
+    send("chatMessage", "Viewer2", "again")
+    assert [m["message"] for m in received(tips_only, "chaturbate_event")] == ["again"]
+    assert chaturbate_route.room_filters == {}
+
+
+def test_invalid_subscription_is_reported(socketio):
+    app, socket_io = socketio
+    client = connect(app, socket_io)
+
+    ack = client.emit(
+        "subscribe", {"min_tip": -5}, namespace="/chaturbate", callback=True
+    )
+
+    assert "error" in ack
+
+
+def test_acknowledging_clients_are_served_from_their_send_queue(socketio):
+    app, socket_io = socketio
+    client = connect(app, socket_io, auth={"ack": True})
+    sid = next(sid for sid, c in chaturbate_route.clients.items() if c.acked)
+
+    send("chatMessage", "Viewer2", "queued")
+
+    assert [m["message"] for m in received(client, "chaturbate_event")] == ["queued"]
+    stats = chaturbate_route.event_handler.send_queues.get_stats(sid)
+    assert stats["clients"][sid]["sent"] == 1
+
+    client.disconnect(namespace="/chaturbate")
+    assert sid not in chaturbate_route.event_handler.send_queues
+
+
+def test_shutdown_notifies_and_disconnects_every_client(socketio, monkeypatch):
+    app, socket_io = socketio
+    client = connect(app, socket_io)
+    seen = []
+    server_disconnect = socket_io.server.disconnect
+
+    def disconnect(sid, namespace=None, **kwargs):
+        # The test client cannot read its messages once disconnected
+        if client.is_connected("/chaturbate"):
+            seen.extend(received(client, "chaturbate_status"))
+        server_disconnect(sid, namespace=namespace, **kwargs)
+
+    monkeypatch.setattr(socket_io.server, "disconnect", disconnect)
+    chaturbate_route.shutdown_socketio("deploy")
+
+    assert seen[-1] == {"status": "shutting_down", "reason": "deploy"}
+    assert not client.is_connected("/chaturbate")
+    assert not chaturbate_route.connected_clients
+
+
+def test_demo_generator_runs_on_the_handler_loop(socketio):
+    app, socket_io = socketio
+    client = connect(app, socket_io)
+    generator = chaturbate_route.DemoEventGenerator(
+        chaturbate_route.event_handler, chaturbate_route.handler_loop
+    )
+    generator.profile = LoadProfile(rate=200, zipf_exponent=1.0)
+
+    async def start_inside_a_running_loop():
+        generator.start()
+
+    asyncio.run(start_inside_a_running_loop())
+    deadline = time.monotonic() + 5
+    while chaturbate_route.event_handler.recent_events.last_seq < 5:
+        assert time.monotonic() < deadline, "no demo events were delivered"
+        time.sleep(0.01)
+    generator.stop()
+
+    assert received(client, "chaturbate_event")
+    assert not generator.running
+
+
+def test_events_from_an_ingest_worker_reach_socket_worker_clients(socketio):
+    app, socket_io = socketio
+    client = connect(app, socket_io)
+    backplane = chaturbate_route.event_handler.backplane
+    ingest = chaturbate_route.WebSocketEventHandler(
+        socket_io, backplane=backplane, role=chaturbate_route.INGEST_ROLE
+    )
+    ingest.influx_client = None
+    event = MockEvent(object=MockChatObject(user=MockUser("Viewer3"), message="hi"))
+
+    asyncio.run(ingest.handle_chat(event))
+
+    events = received(client, "chaturbate_event")
+    assert [m["message"] for m in events] == ["hi"]
+    assert chaturbate_route.event_handler.recent_events.last_seq == events[0]["seq"]
+    ingest.batcher.close()
+    ingest.send_queues.stop()
+
+
+def test_workers_sharing_a_backplane_number_events_from_one_counter(socketio):
+    app, socket_io = socketio
+    backplane = chaturbate_route.event_handler.backplane
+    # A second worker serving sockets and ingesting on the same backplane
+    other = chaturbate_route.WebSocketEventHandler(socket_io, backplane=backplane)
+    other.influx_client = None
+
+    send("chatMessage", "Viewer2", "one")
+    event = MockEvent(object=MockChatObject(user=MockUser("Viewer3"), message="two"))
+    asyncio.run(other.handle_chat(event))
+    send("chatMessage", "Viewer2", "three")
+
+    room = other._streamer_room(event)
+    for handler in (chaturbate_route.event_handler, other):
+        events = handler.recent_events.snapshot([room], since=0)
+        assert [seq for seq, _, _ in events] == [1, 2, 3]
+        assert [p["message"] for _, _, p in events] == ["one", "two", "three"]
+    other.batcher.close()
+    other.send_queues.stop()
+
+
+def test_long_poll_returns_events_after_seq(http):
+    send("chatMessage", "Viewer1", "first")
+    send("chatMessage", "Viewer2", "second")
+
+    body = http.get("/chaturbate/events/since?seq=1").get_json()
+
+    assert [e["data"]["message"] for e in body["events"]] == ["second"]
+    assert body["last_seq"] == body["events"][0]["seq"] == 2
+
+
+def test_long_poll_resumes_through_a_burst_without_gaps(http, monkeypatch):
+    monkeypatch.setattr(chaturbate_route, "SNAPSHOT_EVENTS", 5)
+    for n in range(12):
+        send("chatMessage", "Viewer1", f"burst {n}")
+
+    seen, seq = [], 2
+    while True:
+        body = http.get(f"/chaturbate/events/since?seq={seq}&timeout=0").get_json()
+        if not body["events"]:
+            break
+        assert len(body["events"]) <= 5
+        seen += [e["seq"] for e in body["events"]]
+        seq = body["last_seq"]
+
+    assert seen == list(range(3, 13))
+    # Without a seq, readers start from the newest events
+    body = http.get("/chaturbate/events/since").get_json()
+    assert [e["seq"] for e in body["events"]] == list(range(8, 13))
+
+
+def test_event_stream_resumes_through_a_burst_without_gaps(http, monkeypatch):
+    monkeypatch.setattr(chaturbate_route, "SNAPSHOT_EVENTS", 5)
+    for n in range(12):
+        send("chatMessage", "Viewer1", f"burst {n}")
+
+    response = http.get("/chaturbate/events/stream", headers={"Last-Event-ID": "2"})
+    frames = response.iter_encoded()
+    next(frames)
+    ids = [int(next(frames).decode().split("\n", 1)[0][4:]) for _ in range(10)]
+    response.close()
+
+    assert ids == list(range(3, 13))
+
+
+def test_long_poll_times_out_without_new_events(http):
+    send("chatMessage", "Viewer1", "first")
+
+    body = http.get("/chaturbate/events/since?seq=1&timeout=0").get_json()
+
+    assert body == {"events": [], "last_seq": 1}
+    assert http.get("/chaturbate/events/since?seq=0").get_json()["last_seq"] == 1
+
+
+def test_long_poll_rejects_invalid_tokens(http):
+    response = http.get(
+        "/chaturbate/events/since", headers={"Authorization": "Bearer nope"}
+    )
+    assert response.status_code == 401
+
+
+def test_event_stream_resumes_from_last_event_id(http):
+    send("chatMessage", "Viewer1", "first")
+    send("chatMessage", "Viewer2", "second")
+
+    response = http.get("/chaturbate/events/stream", headers={"Last-Event-ID": "1"})
+    frames = response.iter_encoded()
+
+    assert response.mimetype == "text/event-stream"
+    assert next(frames) == b"retry: 3000\n\n"
+    frame = next(frames).decode()
+    assert frame.startswith("id: 2\nevent: chaturbate_event\ndata: ")
+    assert json.loads(frame.split("data: ", 1)[1])["message"] == "second"
+    response.close()
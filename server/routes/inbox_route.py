@@ -53,6 +53,22 @@ inbox_stats_model = api.model(
     },
 )
 
+search_result_model = api.model(
+    "SearchResult",
+    {
+        "doc_id": fields.Integer(required=True, description="Search index document ID"),
+        "id": fields.String(description="Message ID (private messages only)"),
+        "type": fields.String(
+            required=True, description="Message type (private_message or chat)"
+        ),
+        "from_user": fields.String(required=True, description="Sender username"),
+        "to_user": fields.String(description="Recipient username"),
+        "message": fields.String(required=True, description="Message content"),
+        "timestamp": fields.String(required=True, description="Message timestamp"),
+        "score": fields.Float(required=True, description="Relevance score"),
+    },
+)
+
 
 @api.route("/messages")
 class InboxMessages(Resource):
@@ -186,7 +202,30 @@ class MarkMessageRead(Resource):
 
 
 @api.route("/messages/<string:message_id>")
-class DeleteMessage(Resource):
+class InboxMessage(Resource):
+    @api.doc("get_message")
+    @api.marshal_with(message_model)
+    @requires_auth
+    def get(self, message_id):
+        """Get a single message by ID."""
+        try:
+            user = request.user
+            inbox_service = InboxService()
+            message = inbox_service.get_message(
+                username=user.auth0_id,
+                message_id=message_id,
+            )
+
+            if message is None:
+                raise NotFound("Message not found")
+            return message
+
+        except NotFound:
+            raise
+        except Exception as e:
+            logger.error(f"Error retrieving message: {e}")
+            api.abort(500, f"Failed to retrieve message: {str(e)}")
+
     @api.doc("delete_message")
     @requires_auth
     def delete(self, message_id):
@@ -238,6 +277,45 @@ class InboxStats(Resource):
             api.abort(500, f"Failed to retrieve inbox stats: {str(e)}")
 
 
+@api.route("/search")
+class InboxSearch(Resource):
+    @api.doc("search_messages")
+    @api.marshal_list_with(search_result_model)
+    @api.param("q", "Search query (the last word also matches by prefix)", type=str)
+    @api.param("type", "Restrict to 'private_message' or 'chat'", type=str)
+    @api.param("from_user", "Restrict to messages from this sender", type=str)
+    @api.param("limit", "Maximum number of results to return", type=int, default=20)
+    @requires_auth
+    def get(self):
+        """Full-text search over the user's private messages and room chat."""
+        try:
+            query = request.args.get("q", "").strip()
+            message_type = request.args.get("type")
+            from_user = request.args.get("from_user")
+            limit = request.args.get("limit", 20, type=int)
+
+            if not query:
+                raise BadRequest("Missing required parameter: q")
+            if message_type and message_type not in ("private_message", "chat"):
+                raise BadRequest(f"Invalid message type: {message_type}")
+
+            user = request.user
+            inbox_service = InboxService()
+            return inbox_service.search_messages(
+                username=user.auth0_id,
+                query=query,
+                message_type=message_type,
+                from_user=from_user,
+                limit=max(1, min(limit, 100)),
+            )
+
+        except BadRequest:
+            raise
+        except Exception as e:
+            logger.error(f"Error searching messages: {e}")
+            api.abort(500, f"Failed to search messages: {str(e)}")
+
+
 @api.route("/mark-all-read")
 class MarkAllRead(Resource):
     @api.doc("mark_all_read")
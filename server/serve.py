@@ -0,0 +1,79 @@
+"""Production entry point: serve the API and Socket.IO on gevent.
+
+Usage (from the server directory):
+    python serve.py
+    SERVER_PORT=8000 SERVER_SHUTDOWN_GRACE=15 python serve.py
+
+``python app.py`` runs the Werkzeug development server in threading mode,
+which spends an OS thread per socket and tops out at a few hundred
+/chaturbate connections. Here every connection is a greenlet, so one process
+holds thousands. SIGTERM or SIGINT stops accepting connections, tells
+clients to reconnect, disconnects them and drains queued event handlers
+before the process exits.
+"""
+
+# Patch the standard library before anything imports socket or threading
+from gevent import monkey
+
+monkey.patch_all()
+
+import logging  # noqa: E402
+import os  # noqa: E402
+import resource  # noqa: E402
+import signal  # noqa: E402
+
+import gevent  # noqa: E402
+
+from app import create_app  # noqa: E402
+from routes.chaturbate_route import shutdown_socketio  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+HOST = os.getenv("SERVER_HOST", "0.0.0.0")  # nosec B104 - container entry point
+PORT = int(os.getenv("SERVER_PORT", "5000"))
+# Seconds to let clients see the shutdown notice before the server stops
+SHUTDOWN_GRACE = float(os.getenv("SERVER_SHUTDOWN_GRACE", "5"))
+
+
+def raise_file_limit() -> int:
+    """Raise the open file limit to its hard maximum; every socket is a file.
+
+    Returns:
+        The new soft limit
+    """
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard != resource.RLIM_INFINITY and soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        soft = hard
+    return soft
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    file_limit = raise_file_limit()
+    app = create_app(async_mode="gevent")
+    socketio = app.socketio
+    stopping = False
+
+    def shutdown(signum: int) -> None:
+        nonlocal stopping
+        if stopping:
+            return
+        stopping = True
+        logger.info(f"Received signal {signum}, shutting down")
+        shutdown_socketio()
+        gevent.sleep(SHUTDOWN_GRACE)
+        socketio.stop()
+
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        # Run the shutdown in its own greenlet; it sleeps through the grace period
+        gevent.signal_handler(signum, gevent.spawn, shutdown, signum)
+
+    logger.info(f"Serving on {HOST}:{PORT} with gevent (open file limit {file_limit})")
+    socketio.run(app, host=HOST, port=PORT, log_output=False)
+    # atexit hooks then drain the handler loop and close the capture file
+    logger.info("Server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,22 @@
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 
 from influxdb_client import Point
 
 from client.influx_client import InfluxDBClient
+from services.inbox_stats_cache import get_inbox_stats_cache
+from services.message_ids import (
+    MessageLocation,
+    get_message_id_index,
+    is_message_id,
+    make_message_id,
+    message_id_time,
+    micros_to_datetime,
+    to_micros,
+)
+from services.message_search_index import PUBLIC_SCOPE, get_message_search_index
+from services.message_tombstones import Tombstone, get_tombstone_store
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +27,193 @@ class InboxService:
     def __init__(self):
         """Initialize the inbox service."""
         self.influx_client = InfluxDBClient()
+        self.tombstones = get_tombstone_store()
+        self.stats_cache = get_inbox_stats_cache()
+        self.message_ids = get_message_id_index()
+
+    def _locate(self, record) -> MessageLocation:
+        """
+        Compute the ID of a private message record and index its location.
+
+        Args:
+            record: An InfluxDB record for the object.message field
+
+        Returns:
+            The message location
+        """
+        from_user = record.values.get("from_user", "")
+        to_user = record.values.get("to_user", "")
+        time_us = to_micros(record.get_time())
+        location = MessageLocation(
+            message_id=make_message_id(
+                time_us, from_user, to_user, record.get_value() or ""
+            ),
+            time_us=time_us,
+            from_user=from_user,
+            to_user=to_user,
+        )
+        self.message_ids.register(location)
+        return location
+
+    def _query_at(
+        self, username: str, time_us: int, from_user: Optional[str] = None
+    ) -> List:
+        """
+        Fetch the private message records stored at an exact timestamp.
+
+        Args:
+            username: The recipient username
+            time_us: Message timestamp in microseconds since the epoch
+            from_user: Restrict to this sender's series
+
+        Returns:
+            Records for the object.message and read_update fields
+        """
+        start = micros_to_datetime(time_us).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        stop = micros_to_datetime(time_us + 1).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        sender_filter = (
+            f'|> filter(fn: (r) => r["from_user"] == "{from_user}")'
+            if from_user is not None
+            else ""
+        )
+        query = f"""
+            from(bucket: "{self.influx_client.bucket}")
+                |> range(start: {start}, stop: {stop})
+                |> filter(fn: (r) => r["_measurement"] == "chaturbate_events")
+                |> filter(fn: (r) => r["method"] == "privateMessage")
+                |> filter(fn: (r) => r["to_user"] == "{username}")
+                {sender_filter}
+                |> filter(fn: (r) =>
+                    r["_field"] == "object.message" or r["_field"] == "read_update"
+                )
+        """
+
+        result = self.influx_client.query_api.query(
+            org=self.influx_client.org, query=query
+        )
+        return [record for table in result for record in table.records]
+
+    def _resolve_message(
+        self, username: str, message_id: str
+    ) -> Optional[MessageLocation]:
+        """
+        Resolve a message ID to its storage location.
+
+        IDs are looked up in the in-memory index first. On a miss, the
+        timestamp encoded in the ID narrows the lookup to a single point.
+        Legacy "timestamp_sender" IDs are still accepted and resolved to the
+        stored message, so the location always carries the current ID.
+
+        Args:
+            username: The recipient username
+            message_id: The message ID
+
+        Returns:
+            The message location, or None if it does not belong to the user
+        """
+        if not is_message_id(message_id):
+            # Legacy format: "<timestamp>_<sender>"
+            parts = message_id.split("_", 1)
+            if len(parts) != 2:
+                return None
+            timestamp_str, from_user = parts
+            try:
+                message_time = datetime.fromisoformat(timestamp_str)
+            except ValueError:
+                return None
+            if message_time.tzinfo is None:
+                message_time = message_time.replace(tzinfo=timezone.utc)
+            records = self._query_at(username, to_micros(message_time), from_user)
+            for record in records:
+                if record.get_field() == "object.message":
+                    return self._locate(record)
+            return None
+
+        location = self.message_ids.lookup(message_id)
+        if location is not None:
+            return location if location.to_user == username else None
+
+        message_id = message_id.upper()
+        for record in self._query_at(username, message_id_time(message_id)):
+            if record.get_field() != "object.message":
+                continue
+            location = self._locate(record)
+            if location.message_id == message_id:
+                return location
+        return None
+
+    def _load_tombstones(self, username: str) -> List[Tombstone]:
+        """
+        Load a user's deletion markers from InfluxDB.
+
+        Args:
+            username: The recipient whose deleted messages to load
+
+        Markers written before message IDs were derived from the message
+        hold legacy "timestamp_sender" IDs; those are converted to the
+        current ID so they match what reads return.
+
+        Returns:
+            List of tombstones for the last 30 days
+        """
+        query = f"""
+            from(bucket: "{self.influx_client.bucket}")
+                |> range(start: -30d)
+                |> filter(fn: (r) => r["_measurement"] == "chaturbate_events")
+                |> filter(fn: (r) => r["method"] == "privateMessage_deleted")
+                |> filter(fn: (r) => r["to_user"] == "{username}")
+                |> pivot(
+                    rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value"
+                )
+        """
+
+        result = self.influx_client.query_api.query(
+            org=self.influx_client.org, query=query
+        )
+
+        tombstones = []
+        for table in result:
+            for record in table.records:
+                message_id = record.values.get("deleted_message_id")
+                if not message_id:
+                    continue
+                if not is_message_id(message_id):
+                    location = self._resolve_message(username, message_id)
+                    if location is None:
+                        continue
+                    message_id = location.message_id
+                tombstones.append(
+                    Tombstone(
+                        message_id=message_id,
+                        from_user=record.values.get("from_user", ""),
+                        message_time=record.get_time().timestamp(),
+                        was_unread=not record.values.get("was_read", False),
+                    )
+                )
+        return tombstones
+
+    def _ensure_tombstones(self, username: str) -> None:
+        """Make sure the user's deleted message IDs are in memory."""
+        try:
+            self.tombstones.ensure_loaded(username, self._load_tombstones)
+        except Exception as e:
+            logger.error(f"Error loading deleted messages for user {username}: {e}")
+
+    def _is_message_read(self, username: str, location: MessageLocation) -> bool:
+        """
+        Look up the read state of a single message by its exact timestamp.
+
+        Args:
+            username: The recipient username
+            location: The message location
+
+        Returns:
+            True if the message or a read update for it is marked as read
+        """
+        for record in self._query_at(username, location.time_us, location.from_user):
+            if record.values.get("is_read") == "true":
+                return True
+        return False
 
     def get_user_messages(
         self,
@@ -47,6 +246,11 @@ class InboxService:
             if not end_time:
                 end_time = datetime.utcnow()
 
+            # Over-fetch by the number of deleted messages so the page is still
+            # full after tombstoned messages are filtered out
+            self._ensure_tombstones(username)
+            fetch_limit = offset + limit + self.tombstones.count(username)
+
             # Build query for private messages where user is recipient
             start = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
             stop = end_time.strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -58,7 +262,7 @@ class InboxService:
                     |> filter(fn: (r) => r["_field"] == "object.message")
                     |> filter(fn: (r) => r["to_user"] == "{username}")
                     |> sort(columns: ["_time"], desc: true)
-                    |> limit(n: {limit}, offset: {offset})
+                    |> limit(n: {fetch_limit})
             """
 
             result = self.influx_client.query_api.query(
@@ -70,10 +274,7 @@ class InboxService:
                 for record in table.records:
                     # Extract message data from the record
                     message_data = {
-                        "id": (
-                            f"{record.get_time()}_"
-                            f"{record.values.get('from_user', '')}"
-                        ),
+                        "id": self._locate(record).message_id,
                         "from_user": record.values.get("from_user", "Unknown"),
                         "to_user": record.values.get("to_user", username),
                         "message": record.get_value() or "",  # The message content is now in _value
@@ -82,8 +283,12 @@ class InboxService:
                     }
                     messages.append(message_data)
 
+            found_messages = len(messages) > 0
+            messages = self.tombstones.filter_messages(username, messages)
+            messages = messages[offset : offset + limit]
+
             # If no messages found in InfluxDB, provide demo data for testing
-            if len(messages) == 0 and limit > 0:
+            if not found_messages and limit > 0:
                 logger.info(f"No messages found in InfluxDB for {username}, providing demo data")
                 demo_messages = [
                     {
@@ -131,6 +336,11 @@ class InboxService:
             List of conversation summaries with last message and unread count
         """
         try:
+            # Fetch enough of each sender's latest messages to skip past any
+            # that were deleted
+            self._ensure_tombstones(username)
+            per_sender = 1 + self.tombstones.max_per_sender(username)
+
             # Query to get unique senders and their last message
             # Fix: Only group by tag columns and select specific fields to avoid type conflicts
             query = f"""
@@ -142,7 +352,7 @@ class InboxService:
                     |> filter(fn: (r) => r["_field"] == "object.message")
                     |> group(columns: ["from_user"])
                     |> sort(columns: ["_time"], desc: true)
-                    |> first()
+                    |> limit(n: {per_sender})
                     |> group()
             """
 
@@ -151,9 +361,18 @@ class InboxService:
             )
 
             conversations = []
+            seen_senders = set()
+            found_messages = False
             for table in result:
                 for record in table.records:
+                    found_messages = True
                     from_user = record.values.get("from_user", "Unknown")
+                    message_id = self._locate(record).message_id
+                    if from_user in seen_senders or self.tombstones.is_deleted(
+                        username, message_id
+                    ):
+                        continue
+                    seen_senders.add(from_user)
 
                     # Get unread count for this sender
                     unread_count = self._get_unread_count(username, from_user)
@@ -167,7 +386,7 @@ class InboxService:
                     conversations.append(conversation)
 
             # If no conversations found, provide demo data
-            if len(conversations) == 0:
+            if not found_messages:
                 logger.info(f"No conversations found in InfluxDB for {username}, providing demo data")
                 conversations = [
                     {
@@ -236,7 +455,8 @@ class InboxService:
                     count = record.get_value() or 0
                     break
 
-            return count
+            deleted_unread = self.tombstones.deleted_unread_from(to_user, from_user)
+            return max(0, count - deleted_unread)
 
         except Exception as e:
             logger.error(f"Error getting unread count: {e}")
@@ -248,30 +468,27 @@ class InboxService:
 
         Args:
             username: The recipient username
-            message_id: The message ID (timestamp_sender format)
+            message_id: The message ID
 
         Returns:
             Success status
         """
         try:
-            # Parse message ID to get timestamp and sender
-            parts = message_id.split("_", 1)
-            if len(parts) != 2:
-                logger.error(f"Invalid message ID format: {message_id}")
+            location = self._resolve_message(username, message_id)
+            if location is None:
+                logger.error(f"Message {message_id} not found for user {username}")
                 return False
 
-            timestamp_str, from_user = parts
-
             # Since InfluxDB doesn't support updates, we'll write a new point
             # with the same timestamp but updated is_read status
             point = (
                 Point("chaturbate_events")
                 .tag("method", "privateMessage")
-                .tag("from_user", from_user)
+                .tag("from_user", location.from_user)
                 .tag("to_user", username)
                 .tag("is_read", "true")
                 .field("read_update", True)
-                .time(timestamp_str)
+                .time(location.time_us * 1000)
             )
 
             write_api = self.influx_client.write_api
@@ -280,6 +497,7 @@ class InboxService:
                 org=self.influx_client.org,
                 record=point,
             )
+            self.stats_cache.invalidate(username)
 
             logger.info(f"Marked message {message_id} as read for user {username}")
             return True
@@ -288,6 +506,87 @@ class InboxService:
             logger.error(f"Error marking message as read: {e}")
             return False
 
+    def get_message(self, username: str, message_id: str) -> Optional[Dict]:
+        """
+        Get a single message by ID.
+
+        Args:
+            username: The recipient username
+            message_id: The message ID
+
+        Returns:
+            The message dictionary, or None if not found or deleted
+        """
+        try:
+            location = self._resolve_message(username, message_id)
+            if location is None:
+                return None
+
+            self._ensure_tombstones(username)
+            if self.tombstones.is_deleted(username, location.message_id):
+                return None
+
+            message_data = None
+            is_read = False
+            records = self._query_at(username, location.time_us, location.from_user)
+            for record in records:
+                if record.values.get("is_read") == "true":
+                    is_read = True
+                if record.get_field() == "object.message":
+                    message_data = {
+                        "id": self._locate(record).message_id,
+                        "from_user": record.values.get("from_user", "Unknown"),
+                        "to_user": record.values.get("to_user", username),
+                        "message": record.get_value() or "",
+                        "timestamp": record.get_time().isoformat(),
+                    }
+
+            if message_data is None:
+                return None
+            message_data["is_read"] = is_read
+            return message_data
+
+        except Exception as e:
+            logger.error(f"Error retrieving message {message_id}: {e}")
+            return None
+
+    def search_messages(
+        self,
+        username: str,
+        query: str,
+        message_type: Optional[str] = None,
+        from_user: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict]:
+        """
+        Full-text search over the user's private messages and room chat.
+
+        Args:
+            username: The user searching
+            query: Search query (the last word also matches by prefix)
+            message_type: Restrict to "private_message" or "chat"
+            from_user: Restrict to messages from this sender
+            limit: Maximum number of results to return
+
+        Returns:
+            Ranked search results, excluding deleted messages
+        """
+        self._ensure_tombstones(username)
+        results = get_message_search_index().search(
+            query,
+            scopes=[username, PUBLIC_SCOPE],
+            kinds=[message_type] if message_type else None,
+            from_user=from_user,
+            limit=limit + self.tombstones.count(username),
+            prefix=False,
+        )
+        results = [
+            result
+            for result in results
+            if not self.tombstones.is_deleted(username, result["id"])
+        ]
+        return results[:limit]
+
     def get_conversation_messages(
         self,
         username: str,
@@ -312,6 +611,9 @@ class InboxService:
             logger.info(f"🔍   username: {username}")
             logger.info(f"🔍   other_user: {other_user}")
             logger.info(f"🔍   limit: {limit}, offset: {offset}")
+            self._ensure_tombstones(username)
+            fetch_limit = offset + limit + self.tombstones.count(username)
+
             # Query for messages between the two users (both directions)
             # Fix: Filter by specific field to avoid type conflicts
             query = f"""
@@ -327,7 +629,7 @@ class InboxService:
                          r["to_user"] == "{username}")
                     )
                     |> sort(columns: ["_time"], desc: false)
-                    |> limit(n: {limit}, offset: {offset})
+                    |> limit(n: {fetch_limit})
             """
 
             result = self.influx_client.query_api.query(
@@ -338,10 +640,7 @@ class InboxService:
             for table in result:
                 for record in table.records:
                     message_data = {
-                        "id": (
-                            f"{record.get_time()}_"
-                            f"{record.values.get('from_user', '')}"
-                        ),
+                        "id": self._locate(record).message_id,
                         "from_user": record.values.get("from_user", "Unknown"),
                         "to_user": record.values.get("to_user", "Unknown"),
                         "message": record.get_value() or "",  # The message content is now in _value
@@ -351,8 +650,12 @@ class InboxService:
                     }
                     messages.append(message_data)
 
+            found_messages = len(messages) > 0
+            messages = self.tombstones.filter_messages(username, messages)
+            messages = messages[offset : offset + limit]
+
             # If no messages found, provide demo conversation data
-            if len(messages) == 0 and limit > 0:
+            if not found_messages and limit > 0:
                 logger.info(f"No conversation found between {username} and {other_user}, providing demo data")
                 demo_messages = [
                     {
@@ -407,23 +710,28 @@ class InboxService:
             Success status
         """
         try:
-            # Parse message ID
-            parts = message_id.split("_", 1)
-            if len(parts) != 2:
-                logger.error(f"Invalid message ID format: {message_id}")
+            location = self._resolve_message(username, message_id)
+            if location is None:
+                logger.error(f"Message {message_id} not found for user {username}")
                 return False
 
-            timestamp_str, from_user = parts
+            self._ensure_tombstones(username)
+            if self.tombstones.is_deleted(username, location.message_id):
+                logger.info(f"Message {message_id} already deleted for user {username}")
+                return True
+
+            was_read = self._is_message_read(username, location)
 
             # Write a deletion marker
             point = (
                 Point("chaturbate_events")
                 .tag("method", "privateMessage_deleted")
-                .tag("from_user", from_user)
+                .tag("from_user", location.from_user)
                 .tag("to_user", username)
                 .tag("deleted_by", username)
-                .field("deleted_message_id", message_id)
-                .time(timestamp_str)
+                .field("deleted_message_id", location.message_id)
+                .field("was_read", was_read)
+                .time(location.time_us * 1000)
             )
 
             write_api = self.influx_client.write_api
@@ -433,6 +741,16 @@ class InboxService:
                 record=point,
             )
 
+            self.tombstones.add(
+                username,
+                Tombstone(
+                    message_id=location.message_id,
+                    from_user=location.from_user,
+                    message_time=location.time_us / 1_000_000,
+                    was_unread=not was_read,
+                ),
+            )
+
             logger.info(f"Deleted message {message_id} for user {username}")
             return True
 
@@ -440,6 +758,58 @@ class InboxService:
             logger.error(f"Error deleting message: {e}")
             return False
 
+    def _query_message_counts(self, username: str) -> Tuple[int, int]:
+        """
+        Count a user's total and unread messages in a single query.
+
+        Messages are ingested with is_read="false"; marking one as read writes a
+        read_update point at the same timestamp, which cancels it out of the
+        unread count. Only the field and tag columns are kept before grouping:
+        message values are strings and read_update values booleans, and Flux
+        refuses to merge tables whose _value types differ.
+
+        Args:
+            username: The recipient username
+
+        Returns:
+            Tuple of (total_count, unread_count) for the last 30 days
+        """
+        query = f"""
+            from(bucket: "{self.influx_client.bucket}")
+                |> range(start: -30d)
+                |> filter(fn: (r) => r["_measurement"] == "chaturbate_events")
+                |> filter(fn: (r) => r["method"] == "privateMessage")
+                |> filter(fn: (r) => r["to_user"] == "{username}")
+                |> filter(fn: (r) =>
+                    r["_field"] == "object.message" or r["_field"] == "read_update"
+                )
+                |> keep(columns: ["_field", "is_read"])
+                |> group()
+                |> reduce(
+                    identity: {{total: 0, unread: 0}},
+                    fn: (r, accumulator) => ({{
+                        total: accumulator.total
+                            + (if r["_field"] == "object.message" then 1 else 0),
+                        unread: accumulator.unread
+                            + (if r["_field"] == "read_update" then -1
+                               else if r["is_read"] == "false" then 1
+                               else 0),
+                    }}),
+                )
+        """
+
+        result = self.influx_client.query_api.query(
+            org=self.influx_client.org, query=query
+        )
+
+        for table in result:
+            for record in table.records:
+                total_count = record.values.get("total") or 0
+                unread_count = record.values.get("unread") or 0
+                return total_count, max(0, unread_count)
+
+        return 0, 0
+
     def get_inbox_stats(self, username: str) -> Dict:
         """
         Get inbox statistics for a user.
@@ -451,51 +821,24 @@ class InboxService:
             Dictionary with inbox statistics
         """
         try:
-            # Total messages query
-            total_query = f"""
-                from(bucket: "{self.influx_client.bucket}")
-                    |> range(start: -30d)
-                    |> filter(fn: (r) => r["_measurement"] == "chaturbate_events")
-                    |> filter(fn: (r) => r["method"] == "privateMessage")
-                    |> filter(fn: (r) => r["_field"] == "object.message")
-                    |> filter(fn: (r) => r["to_user"] == "{username}")
-                    |> count()
-            """
-
-            # Unread messages query
-            unread_query = f"""
-                from(bucket: "{self.influx_client.bucket}")
-                    |> range(start: -30d)
-                    |> filter(fn: (r) => r["_measurement"] == "chaturbate_events")
-                    |> filter(fn: (r) => r["method"] == "privateMessage")
-                    |> filter(fn: (r) => r["_field"] == "object.message")
-                    |> filter(fn: (r) => r["to_user"] == "{username}")
-                    |> filter(fn: (r) => r["is_read"] == "false")
-                    |> count()
-            """
-
-            total_result = self.influx_client.query_api.query(
-                org=self.influx_client.org, query=total_query
-            )
-            unread_result = self.influx_client.query_api.query(
-                org=self.influx_client.org, query=unread_query
-            )
-
-            total_count = 0
-            unread_count = 0
+            cached = self.stats_cache.get(username)
+            if cached is None:
+                total_count, unread_count = self._query_message_counts(username)
+                self.stats_cache.set(username, total_count, unread_count)
+            else:
+                total_count, unread_count = cached
 
-            for table in total_result:
-                for record in table.records:
-                    total_count = record.get_value() or 0
-                    break
+            found_messages = total_count > 0
 
-            for table in unread_result:
-                for record in table.records:
-                    unread_count = record.get_value() or 0
-                    break
+            # Deleted messages are subtracted from running counters instead
+            # of being excluded by another query
+            self._ensure_tombstones(username)
+            deleted_total, deleted_unread = self.tombstones.deleted_counts(username)
+            total_count = max(0, total_count - deleted_total)
+            unread_count = max(0, min(unread_count - deleted_unread, total_count))
 
             # If no data found, provide demo stats
-            if total_count == 0:
+            if not found_messages:
                 stats = {
                     "total_messages": 3,
                     "unread_messages": 2,
@@ -0,0 +1,153 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from services.inbox_service import InboxService
+from services.inbox_stats_cache import InboxStatsCache
+from services.message_ids import (
+    MessageIdIndex,
+    MessageLocation,
+    make_message_id,
+    to_micros,
+)
+from services.message_tombstones import MessageTombstoneStore
+
+SENT_AT = datetime(2026, 10, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+
+
+class FakeRecord:
+    def __init__(self, values, field=None, value=None, time=SENT_AT):
+        self.values = values
+        self._field = field
+        self._value = value
+        self._time = time
+
+    def get_field(self):
+        return self._field
+
+    def get_value(self):
+        return self._value
+
+    def get_time(self):
+        return self._time
+
+
+class FakeTable:
+    def __init__(self, records):
+        self.records = records
+
+
+class FakeInflux:
+    """Answers Flux queries with canned records and remembers every call."""
+
+    bucket = "events"
+    org = "org"
+
+    def __init__(self):
+        self.queries = []
+        self.writes = []
+        self.respond = lambda query: []
+        self.query_api = self
+        self.write_api = self
+
+    def query(self, org, query):
+        self.queries.append(query)
+        return [FakeTable(records) for records in [self.respond(query)] if records]
+
+    def write(self, bucket, org, record):
+        self.writes.append(record)
+
+
+@pytest.fixture(name="inbox")
+def inbox_fixture():
+    influx = FakeInflux()
+    with patch("services.inbox_service.InfluxDBClient", return_value=influx):
+        service = InboxService()
+    service.stats_cache = InboxStatsCache()
+    service.tombstones = MessageTombstoneStore()
+    service.message_ids = MessageIdIndex()
+    return service, influx
+
+
+def count_queries(influx):
+    return [query for query in influx.queries if "reduce(" in query]
+
+
+def test_message_counts_come_from_one_query_without_mixed_value_types(inbox):
+    service, influx = inbox
+    influx.respond = lambda query: (
+        [FakeRecord({"total": 5, "unread": 2})] if "reduce(" in query else []
+    )
+
+    assert service._query_message_counts("alice") == (5, 2)
+
+    (query,) = influx.queries
+    # String message and boolean read_update values cannot share a table
+    assert query.index('keep(columns: ["_field", "is_read"])') < query.index("group()")
+
+
+def test_inbox_stats_are_cached_until_a_message_is_marked_read(inbox):
+    service, influx = inbox
+    influx.respond = lambda query: (
+        [FakeRecord({"total": 3, "unread": 1})] if "reduce(" in query else []
+    )
+    time_us = to_micros(SENT_AT)
+    message_id = make_message_id(time_us, "VIPFan", "alice", "hi")
+    service.message_ids.register(
+        MessageLocation(
+            message_id=message_id, time_us=time_us, from_user="VIPFan", to_user="alice"
+        )
+    )
+
+    first = service.get_inbox_stats("alice")
+    assert service.get_inbox_stats("alice") == first
+    assert first == {"total_messages": 3, "unread_messages": 1, "read_messages": 2}
+    assert len(count_queries(influx)) == 1
+
+    assert service.mark_message_as_read("alice", message_id)
+    service.get_inbox_stats("alice")
+    assert len(count_queries(influx)) == 2
+
+
+LEGACY_ID = f"{SENT_AT.isoformat()}_VIPFan"
+CURRENT_ID = make_message_id(to_micros(SENT_AT), "VIPFan", "alice", "hi")
+
+
+def answer_with(marker_id=None):
+    """Respond with one stored message and optionally a deletion marker."""
+
+    def respond(query):
+        if "privateMessage_deleted" in query:
+            if marker_id is None:
+                return []
+            values = {"deleted_message_id": marker_id, "from_user": "VIPFan"}
+            return [FakeRecord({**values, "was_read": False})]
+        if '"object.message"' in query:
+            values = {"from_user": "VIPFan", "to_user": "alice", "is_read": "false"}
+            return [FakeRecord(values, field="object.message", value="hi")]
+        return []
+
+    return respond
+
+
+def test_legacy_deletion_markers_hide_messages_read_by_current_id(inbox):
+    service, influx = inbox
+    influx.respond = answer_with(marker_id=LEGACY_ID)
+
+    assert service.get_conversation_messages("alice", "VIPFan") == []
+    assert service.tombstones.is_deleted("alice", CURRENT_ID)
+    assert service.get_message("alice", CURRENT_ID) is None
+
+
+def test_deleting_by_legacy_id_records_the_current_id(inbox):
+    service, influx = inbox
+    influx.respond = answer_with()
+
+    assert service.delete_message("alice", LEGACY_ID)
+
+    (marker,) = influx.writes
+    assert CURRENT_ID in marker.to_line_protocol()
+    assert LEGACY_ID not in marker.to_line_protocol()
+    assert service.tombstones.is_deleted("alice", CURRENT_ID)
+    assert service.get_conversation_messages("alice", "VIPFan") == []
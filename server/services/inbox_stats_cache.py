@@ -0,0 +1,107 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on staleness for writes this process does not see (other workers)
+DEFAULT_TTL_SECONDS = 60.0
+
+
+class InboxStatsCache:
+    """Per-user cache of raw inbox message counts.
+
+    The extension polls the inbox badge constantly, so counts are cached until
+    the user receives a private message or marks one as read. Deletions are
+    applied on top of the cached counts from the tombstone store and do not
+    need to invalidate it.
+
+    With several workers, ``broadcast_invalidations`` makes ``invalidate``
+    reach every worker's cache; each worker applies them with ``discard``.
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            ttl_seconds: Maximum age of a cached entry
+        """
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, int, int]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._broadcast: Optional[Callable[[str], None]] = None
+
+    def get(self, username: str) -> Optional[Tuple[int, int]]:
+        """Get cached counts for a user.
+
+        Args:
+            username: The recipient username
+
+        Returns:
+            Tuple of (total, unread), or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def set(self, username: str, total: int, unread: int) -> None:
+        """Store counts for a user.
+
+        Args:
+            username: The recipient username
+            total: Total message count
+            unread: Unread message count
+        """
+        with self._lock:
+            self._entries[username] = (time.monotonic(), total, unread)
+
+    def invalidate(self, username: str) -> None:
+        """Drop the cached counts for a user on every worker.
+
+        Args:
+            username: The recipient username
+        """
+        self.discard(username)
+        if self._broadcast is not None:
+            try:
+                self._broadcast(username)
+            except Exception as e:
+                logger.warning(f"Failed to broadcast stats invalidation: {e}")
+
+    def discard(self, username: str) -> None:
+        """Drop the cached counts for a user in this process only.
+
+        Args:
+            username: The recipient username
+        """
+        with self._lock:
+            self._entries.pop(username, None)
+
+    def broadcast_invalidations(self, publish: Callable[[str], None]) -> None:
+        """Send every later invalidation to the other workers too.
+
+        Args:
+            publish: Called with the username of each invalidation
+        """
+        self._broadcast = publish
+
+
+_cache: Optional[InboxStatsCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_inbox_stats_cache() -> InboxStatsCache:
+    """Get the process-wide inbox stats cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = InboxStatsCache()
+    return _cache
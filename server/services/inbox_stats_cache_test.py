@@ -0,0 +1,39 @@
+from services import inbox_stats_cache
+from services.inbox_stats_cache import InboxStatsCache
+
+
+def test_counts_are_cached_until_invalidated():
+    cache = InboxStatsCache()
+    assert cache.get("alice") is None
+
+    cache.set("alice", 10, 4)
+    assert cache.get("alice") == (10, 4)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.invalidate("alice")
+    assert cache.get("alice") is None
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(inbox_stats_cache.time, "monotonic", lambda: now[0])
+    cache = InboxStatsCache(ttl_seconds=60)
+    cache.set("alice", 10, 4)
+
+    now[0] += 59
+    assert cache.get("alice") == (10, 4)
+    now[0] += 2
+    assert cache.get("alice") is None
+
+
+def test_invalidations_reach_other_workers():
+    worker_a, worker_b = InboxStatsCache(), InboxStatsCache()
+    # Stand-in for the backplane channel both workers subscribe to
+    worker_a.broadcast_invalidations(worker_b.discard)
+    worker_a.set("alice", 10, 4)
+    worker_b.set("alice", 10, 4)
+
+    worker_a.invalidate("alice")
+
+    assert worker_a.get("alice") is None
+    assert worker_b.get("alice") is None
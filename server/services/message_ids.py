@@ -0,0 +1,218 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+# Crockford base32: sortable, case-insensitive, no ambiguous characters
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODE = {char: value for value, char in enumerate(_ALPHABET)}
+_TIME_CHARS = 11  # 55 bits of microseconds since the epoch
+_HASH_CHARS = 7  # 35 bits, of which 32 carry the content hash
+
+MESSAGE_ID_LENGTH = _TIME_CHARS + _HASH_CHARS
+
+
+def _encode(value: int, width: int) -> str:
+    chars = []
+    for _ in range(width):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def to_micros(timestamp: datetime) -> int:
+    """Convert a datetime to microseconds since the epoch.
+
+    Args:
+        timestamp: The datetime (naive values are treated as local time)
+
+    Returns:
+        Microseconds since the epoch
+    """
+    if timestamp.tzinfo is None:
+        return int(round(timestamp.timestamp() * 1_000_000))
+    delta = timestamp - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def content_hash(from_user: str, to_user: str, message: str) -> int:
+    """Compute the 32-bit content hash embedded in a message ID.
+
+    Args:
+        from_user: Sender username
+        to_user: Recipient username
+        message: Message content
+
+    Returns:
+        The hash as an unsigned integer
+    """
+    digest = hashlib.blake2b(
+        f"{from_user}\x00{to_user}\x00{message}".encode("utf-8"), digest_size=4
+    ).digest()
+    return int.from_bytes(digest, "big")
+
+
+def make_message_id(time_us: int, from_user: str, to_user: str, message: str) -> str:
+    """Build a message ID from its timestamp and content.
+
+    IDs sort by time and can be recomputed from any stored private message
+    record, so legacy points without a stored ID get the same ID on read.
+
+    Args:
+        time_us: Message timestamp in microseconds since the epoch
+        from_user: Sender username
+        to_user: Recipient username
+        message: Message content
+
+    Returns:
+        An 18-character Crockford base32 ID
+    """
+    return _encode(time_us, _TIME_CHARS) + _encode(
+        content_hash(from_user, to_user, message), _HASH_CHARS
+    )
+
+
+def is_message_id(value: str) -> bool:
+    """Check whether a string is a message ID produced by make_message_id."""
+    return len(value) == MESSAGE_ID_LENGTH and all(
+        char in _DECODE for char in value.upper()
+    )
+
+
+def message_id_time(message_id: str) -> int:
+    """Extract the timestamp from a message ID.
+
+    Args:
+        message_id: A message ID
+
+    Returns:
+        The message timestamp in microseconds since the epoch
+
+    Raises:
+        ValueError: If the value is not a message ID
+    """
+    if not is_message_id(message_id):
+        raise ValueError(f"Invalid message ID: {message_id}")
+    value = 0
+    for char in message_id[:_TIME_CHARS].upper():
+        value = (value << 5) | _DECODE[char]
+    return value
+
+
+def micros_to_datetime(time_us: int) -> datetime:
+    """Convert microseconds since the epoch to an aware UTC datetime."""
+    seconds, micros = divmod(time_us, 1_000_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=micros)
+
+
+@dataclass(frozen=True)
+class MessageLocation:
+    """Where a private message is stored.
+
+    Attributes:
+        message_id: The message ID
+        time_us: Point timestamp in microseconds since the epoch
+        from_user: Sender username (series tag)
+        to_user: Recipient username (series tag)
+    """
+
+    message_id: str
+    time_us: int
+    from_user: str
+    to_user: str
+
+
+class MessageIdIndex:
+    """Bounded ID → (time, series) index for private messages.
+
+    IDs are assigned at ingest with strictly increasing timestamps, so two
+    messages from the same sender in the same microsecond no longer overwrite
+    each other in InfluxDB. Entries are also registered whenever inbox reads
+    return messages, so follow-up mark-read and delete calls resolve with a
+    dict lookup. The least recently used entries are evicted past
+    ``max_entries``; callers fall back to a point query at the timestamp
+    encoded in the ID.
+    """
+
+    def __init__(self, max_entries: int = 100_000) -> None:
+        """Initialize an empty index.
+
+        Args:
+            max_entries: Maximum number of locations to keep
+        """
+        self.max_entries = max_entries
+        self._locations: "OrderedDict[str, MessageLocation]" = OrderedDict()
+        self._last_time_us = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def assign(
+        self, timestamp: datetime, from_user: str, to_user: str, message: str
+    ) -> MessageLocation:
+        """Assign an ID to a newly ingested private message.
+
+        Args:
+            timestamp: The event timestamp
+            from_user: Sender username
+            to_user: Recipient username
+            message: Message content
+
+        Returns:
+            The location to write the point at, including its ID
+        """
+        with self._lock:
+            time_us = max(to_micros(timestamp), self._last_time_us + 1)
+            self._last_time_us = time_us
+        location = MessageLocation(
+            message_id=make_message_id(time_us, from_user, to_user, message),
+            time_us=time_us,
+            from_user=from_user,
+            to_user=to_user,
+        )
+        self.register(location)
+        return location
+
+    def register(self, location: MessageLocation) -> None:
+        """Record the location of a message.
+
+        Args:
+            location: The message location
+        """
+        with self._lock:
+            self._locations[location.message_id] = location
+            self._locations.move_to_end(location.message_id)
+            while len(self._locations) > self.max_entries:
+                self._locations.popitem(last=False)
+
+    def lookup(self, message_id: str) -> Optional[MessageLocation]:
+        """Look up the location of a message.
+
+        Args:
+            message_id: The message ID
+
+        Returns:
+            The location, or None if the ID is not indexed
+        """
+        with self._lock:
+            location = self._locations.get(message_id.upper())
+            if location is not None:
+                self._locations.move_to_end(location.message_id)
+            return location
+
+
+_index: Optional[MessageIdIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_message_id_index() -> MessageIdIndex:
+    """Get the process-wide message ID index."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = MessageIdIndex()
+    return _index
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+from server.services.message_ids import (
+    MessageIdIndex,
+    is_message_id,
+    make_message_id,
+    message_id_time,
+    micros_to_datetime,
+    to_micros,
+)
+
+
+def test_message_id_round_trips_time() -> None:
+    message_id = make_message_id(
+        1_700_000_000_123_456, "user_with_underscores", "me", "hi"
+    )
+
+    assert is_message_id(message_id)
+    assert "_" not in message_id
+    assert message_id_time(message_id) == 1_700_000_000_123_456
+    assert message_id_time(message_id.lower()) == 1_700_000_000_123_456
+
+
+def test_message_id_is_content_addressed() -> None:
+    first = make_message_id(1, "VIPFan", "me", "hello")
+    assert first == make_message_id(1, "VIPFan", "me", "hello")
+    assert first != make_message_id(1, "VIPFan", "me", "hello!")
+    assert first < make_message_id(2, "VIPFan", "me", "hello")
+
+
+def test_legacy_ids_are_not_message_ids() -> None:
+    assert not is_message_id("2024-01-01 12:00:00+00:00_VIPFan")
+
+
+def test_micros_conversion_round_trips() -> None:
+    timestamp = datetime(2024, 5, 1, 12, 30, 15, 654321, tzinfo=timezone.utc)
+    assert micros_to_datetime(to_micros(timestamp)) == timestamp
+
+
+def test_assign_is_strictly_monotonic_and_indexed() -> None:
+    index = MessageIdIndex()
+    timestamp = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+    first = index.assign(timestamp, "VIPFan", "me", "hello")
+    second = index.assign(timestamp, "VIPFan", "me", "hello")
+
+    assert second.time_us == first.time_us + 1
+    assert first.message_id != second.message_id
+    assert index.lookup(second.message_id) == second
+
+
+def test_index_evicts_least_recently_used() -> None:
+    index = MessageIdIndex(max_entries=2)
+    timestamp = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    first = index.assign(timestamp, "a", "me", "1")
+    second = index.assign(timestamp, "b", "me", "2")
+
+    index.lookup(first.message_id)
+    index.assign(timestamp, "c", "me", "3")
+
+    assert index.lookup(first.message_id) == first
+    assert index.lookup(second.message_id) is None
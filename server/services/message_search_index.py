@@ -0,0 +1,532 @@
+import json
+import logging
+import math
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Scope used for public chat messages, which are visible to every user of the room
+PUBLIC_SCOPE = ""
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "message_index.bin",
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_FILE_MAGIC = b"WCPIDX1\n"
+_MIN_PREFIX_LENGTH = 2
+_PREFIX_WEIGHT = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercased word tokens.
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        List of tokens in order of appearance
+    """
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def encode_postings(doc_ids: Iterable[int]) -> bytes:
+    """Encode an ascending list of document IDs as varint deltas.
+
+    Args:
+        doc_ids: Strictly ascending document IDs
+
+    Returns:
+        The compact byte representation of the posting list
+    """
+    out = bytearray()
+    previous = 0
+    for doc_id in doc_ids:
+        delta = doc_id - previous
+        previous = doc_id
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(data: bytes) -> array:
+    """Decode a varint delta posting list produced by encode_postings.
+
+    Args:
+        data: The encoded posting list
+
+    Returns:
+        Array of ascending document IDs
+    """
+    doc_ids = array("I")
+    current = 0
+    delta = 0
+    shift = 0
+    for byte in data:
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        current += delta
+        doc_ids.append(current)
+        delta = 0
+        shift = 0
+    return doc_ids
+
+
+@dataclass
+class IndexedMessage:
+    """A message stored in the search index.
+
+    Attributes:
+        kind: Either "private_message" or "chat"
+        scope: Owner of the message (recipient for PMs, PUBLIC_SCOPE for chat)
+        from_user: Sender username
+        to_user: Recipient username (empty for chat)
+        message: Message content
+        timestamp: Unix timestamp of the message
+        message_id: Inbox message ID (private messages only)
+    """
+
+    kind: str
+    scope: str
+    from_user: str
+    to_user: str
+    message: str
+    timestamp: float
+    message_id: str = ""
+
+    def to_row(self) -> list:
+        return [
+            self.kind,
+            self.scope,
+            self.from_user,
+            self.to_user,
+            self.message,
+            self.timestamp,
+            self.message_id,
+        ]
+
+    @classmethod
+    def from_row(cls, row: list) -> "IndexedMessage":
+        return cls(*row[:7])
+
+
+class MessageSearchIndex:
+    """Incrementally maintained inverted index over private and chat messages.
+
+    Documents are numbered in ingest order, so every posting list stays sorted
+    by appending. Posting lists are held as ``array('I')`` in memory and written
+    to disk as varint-delta encoded bytes. Prefix queries are answered from a
+    sorted vocabulary with bisection.
+
+    Automatic snapshots are written by a background thread, so ingest never
+    waits for disk I/O. Once ``max_documents`` is reached the oldest quarter
+    of the documents is dropped and the rest are renumbered.
+
+    Attributes:
+        path: File the index is persisted to (None disables persistence)
+        autosave_every: Number of new documents between automatic snapshots
+        max_documents: Number of documents kept before compacting (0 keeps all)
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        autosave_every: int = 500,
+        max_documents: int = 500_000,
+    ) -> None:
+        """Initialize the index, loading an existing snapshot if present.
+
+        Args:
+            path: File to persist the index to (None keeps it in memory only)
+            autosave_every: Snapshot after this many new documents (0 disables)
+            max_documents: Compact once this many documents are indexed
+                (0 disables)
+        """
+        self.path = path
+        self.autosave_every = autosave_every
+        self.max_documents = max_documents
+        self._documents: List[IndexedMessage] = []
+        self._postings: Dict[str, array] = {}
+        self._vocabulary: List[str] = []
+        self._unsaved = 0
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._save_requested = threading.Event()
+        self._saver: Optional[threading.Thread] = None
+
+        if self.path and os.path.exists(self.path):
+            try:
+                self.load()
+            except Exception as e:
+                logger.error(f"Failed to load message search index: {e}")
+                self._reset()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _reset(self) -> None:
+        self._documents = []
+        self._postings = {}
+        self._vocabulary = []
+        self._unsaved = 0
+
+    def add_message(
+        self,
+        kind: str,
+        from_user: str,
+        message: str,
+        to_user: str = "",
+        scope: Optional[str] = None,
+        timestamp: Optional[float] = None,
+        message_id: str = "",
+    ) -> Optional[int]:
+        """Add a message to the index.
+
+        Args:
+            kind: Either "private_message" or "chat"
+            from_user: Sender username
+            message: Message content
+            to_user: Recipient username (private messages only)
+            scope: Owner of the message (defaults to to_user, or PUBLIC_SCOPE)
+            timestamp: Unix timestamp (defaults to now)
+            message_id: Inbox message ID (private messages only)
+
+        Returns:
+            The document ID, or None if the message has no searchable tokens
+        """
+        tokens = set(tokenize(message))
+        if not tokens:
+            return None
+
+        if scope is None:
+            scope = to_user or PUBLIC_SCOPE
+
+        document = IndexedMessage(
+            kind=kind,
+            scope=scope,
+            from_user=from_user,
+            to_user=to_user,
+            message=message,
+            timestamp=timestamp if timestamp is not None else time.time(),
+            message_id=message_id,
+        )
+
+        with self._lock:
+            if 0 < self.max_documents <= len(self._documents):
+                self._compact_locked()
+            doc_id = len(self._documents)
+            self._documents.append(document)
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = array("I")
+                    insort(self._vocabulary, token)
+                postings.append(doc_id)
+
+            self._unsaved += 1
+            if self.path and 0 < self.autosave_every <= self._unsaved:
+                self._request_save()
+
+        return doc_id
+
+    def _compact_locked(self) -> None:
+        """Drop the oldest documents and renumber the rest from zero."""
+        drop = len(self._documents) - self.max_documents * 3 // 4
+        self._documents = self._documents[drop:]
+
+        # Build new arrays; a snapshot in progress may still read the old ones
+        postings: Dict[str, array] = {}
+        for term, doc_ids in self._postings.items():
+            start = bisect_left(doc_ids, drop)
+            if start < len(doc_ids):
+                postings[term] = array("I", (d - drop for d in doc_ids[start:]))
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+        self._unsaved += drop
+
+        logger.info(f"Compacted message search index: dropped {drop} oldest documents")
+
+    def _request_save(self) -> None:
+        """Wake the background saver, starting it on first use."""
+        if self._saver is None:
+            self._saver = threading.Thread(
+                target=self._run_saver, name="message-index-saver", daemon=True
+            )
+            self._saver.start()
+        self._save_requested.set()
+
+    def _run_saver(self) -> None:
+        while True:
+            self._save_requested.wait()
+            self._save_requested.clear()
+            try:
+                self.save()
+            except Exception as e:
+                logger.error(f"Failed to save message search index: {e}")
+
+    def _matching_terms(self, token: str, prefix: bool) -> List[Tuple[str, float]]:
+        """Find vocabulary terms matching a query token.
+
+        Args:
+            token: The query token
+            prefix: Whether to also match terms starting with the token
+
+        Returns:
+            List of (term, weight) pairs
+        """
+        matches = []
+        if token in self._postings:
+            matches.append((token, 1.0))
+        if prefix and len(token) >= _MIN_PREFIX_LENGTH:
+            position = bisect_left(self._vocabulary, token)
+            while position < len(self._vocabulary):
+                term = self._vocabulary[position]
+                if not term.startswith(token):
+                    break
+                if term != token:
+                    matches.append((term, _PREFIX_WEIGHT))
+                position += 1
+        return matches
+
+    def search(
+        self,
+        query: str,
+        scopes: Iterable[str],
+        kinds: Optional[Iterable[str]] = None,
+        from_user: Optional[str] = None,
+        limit: int = 20,
+        prefix: bool = True,
+    ) -> List[Dict]:
+        """Search indexed messages.
+
+        Every query token must match (AND semantics). The last token, or every
+        token when ``prefix`` is True, also matches longer terms by prefix.
+        Results are ranked by summed IDF of matching terms, exact matches
+        outweighing prefix matches, with newer messages first on ties.
+
+        Args:
+            query: Free-text query
+            scopes: Scopes the caller may see (e.g. their user ID and PUBLIC_SCOPE)
+            kinds: Restrict results to these message kinds
+            from_user: Restrict results to this sender
+            limit: Maximum number of results
+            prefix: Whether query tokens match by prefix
+
+        Returns:
+            List of result dictionaries ordered by descending score
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or limit <= 0:
+            return []
+
+        allowed_scopes: Set[str] = set(scopes)
+        allowed_kinds: Optional[Set[str]] = set(kinds) if kinds else None
+
+        with self._lock:
+            total_docs = len(self._documents)
+            scores: Optional[Dict[int, float]] = None
+
+            # Rarest tokens first so the candidate set shrinks quickly
+            token_terms = [
+                self._matching_terms(token, prefix or index == len(tokens) - 1)
+                for index, token in enumerate(tokens)
+            ]
+            token_terms.sort(
+                key=lambda terms: sum(len(self._postings[t]) for t, _ in terms)
+            )
+
+            for terms in token_terms:
+                if not terms:
+                    return []
+                token_scores: Dict[int, float] = {}
+                for term, weight in terms:
+                    postings = self._postings[term]
+                    idf = math.log(1 + total_docs / len(postings))
+                    for doc_id in postings:
+                        if scores is not None and doc_id not in scores:
+                            continue
+                        score = idf * weight
+                        if score > token_scores.get(doc_id, 0.0):
+                            token_scores[doc_id] = score
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {
+                        doc_id: scores[doc_id] + score
+                        for doc_id, score in token_scores.items()
+                    }
+                if not scores:
+                    return []
+
+            results = []
+            for doc_id, score in scores.items():
+                document = self._documents[doc_id]
+                if document.scope not in allowed_scopes:
+                    continue
+                if allowed_kinds is not None and document.kind not in allowed_kinds:
+                    continue
+                if from_user is not None and document.from_user != from_user:
+                    continue
+                results.append((score, document.timestamp, doc_id, document))
+
+        results.sort(key=lambda item: (item[0], item[1]), reverse=True)
+
+        return [
+            {
+                "doc_id": doc_id,
+                "id": document.message_id,
+                "type": document.kind,
+                "from_user": document.from_user,
+                "to_user": document.to_user,
+                "message": document.message,
+                "timestamp": datetime.utcfromtimestamp(document.timestamp).isoformat(),
+                "score": round(score, 4),
+            }
+            for score, _, doc_id, document in results[:limit]
+        ]
+
+    def save(self) -> None:
+        """Persist the index to disk atomically.
+
+        The index lock is held only while the current state is captured;
+        encoding and writing the snapshot happen outside it.
+        """
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                documents = self._documents[:]
+                vocabulary = self._vocabulary[:]
+                postings = dict(self._postings)
+                unsaved, self._unsaved = self._unsaved, 0
+            try:
+                self._write_snapshot(documents, vocabulary, postings)
+            except Exception:
+                with self._lock:
+                    self._unsaved += unsaved
+                raise
+
+    def _write_snapshot(
+        self,
+        documents: List[IndexedMessage],
+        vocabulary: List[str],
+        postings: Dict[str, array],
+    ) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Posting arrays keep growing during the write; cut them at the snapshot
+        count = len(documents)
+        encoded_documents = zlib.compress(
+            json.dumps(
+                [doc.to_row() for doc in documents], separators=(",", ":")
+            ).encode("utf-8")
+        )
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_FILE_MAGIC)
+            f.write(struct.pack(">I", len(encoded_documents)))
+            f.write(encoded_documents)
+            f.write(struct.pack(">I", len(vocabulary)))
+            for term in vocabulary:
+                doc_ids = postings[term]
+                encoded_term = term.encode("utf-8")
+                encoded_postings = encode_postings(
+                    doc_ids[: bisect_left(doc_ids, count)]
+                )
+                f.write(struct.pack(">H", len(encoded_term)))
+                f.write(encoded_term)
+                f.write(struct.pack(">I", len(encoded_postings)))
+                f.write(encoded_postings)
+        os.replace(temp_path, self.path)
+
+        logger.debug(
+            f"Saved message search index: {count} documents, "
+            f"{len(vocabulary)} terms"
+        )
+
+    def load(self) -> None:
+        """Load the index from disk, replacing the in-memory contents.
+
+        Raises:
+            ValueError: If the file is not a valid index snapshot
+        """
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        if not data.startswith(_FILE_MAGIC):
+            raise ValueError(f"Not a message search index: {self.path}")
+
+        offset = len(_FILE_MAGIC)
+        (doc_length,) = struct.unpack_from(">I", data, offset)
+        offset += 4
+        rows = json.loads(zlib.decompress(data[offset : offset + doc_length]))
+        offset += doc_length
+
+        postings: Dict[str, array] = {}
+        (term_count,) = struct.unpack_from(">I", data, offset)
+        offset += 4
+        for _ in range(term_count):
+            (term_length,) = struct.unpack_from(">H", data, offset)
+            offset += 2
+            term = data[offset : offset + term_length].decode("utf-8")
+            offset += term_length
+            (postings_length,) = struct.unpack_from(">I", data, offset)
+            offset += 4
+            postings[term] = decode_postings(data[offset : offset + postings_length])
+            offset += postings_length
+
+        with self._lock:
+            self._documents = [IndexedMessage.from_row(row) for row in rows]
+            self._postings = postings
+            self._vocabulary = sorted(postings)
+            self._unsaved = 0
+
+        logger.info(
+            f"Loaded message search index: {len(self._documents)} documents, "
+            f"{len(self._vocabulary)} terms"
+        )
+
+
+_index: Optional[MessageSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_message_search_index() -> MessageSearchIndex:
+    """Get the process-wide message search index.
+
+    The snapshot location can be overridden with MESSAGE_SEARCH_INDEX_PATH and
+    the number of documents kept with MESSAGE_SEARCH_INDEX_MAX_DOCUMENTS.
+
+    Returns:
+        The shared MessageSearchIndex instance
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = MessageSearchIndex(
+                    path=os.getenv("MESSAGE_SEARCH_INDEX_PATH", DEFAULT_INDEX_PATH),
+                    max_documents=int(
+                        os.getenv("MESSAGE_SEARCH_INDEX_MAX_DOCUMENTS", "500000")
+                    ),
+                )
+    return _index
@@ -0,0 +1,153 @@
+import threading
+import time
+
+import pytest
+
+from server.services.message_search_index import (
+    PUBLIC_SCOPE,
+    MessageSearchIndex,
+    decode_postings,
+    encode_postings,
+    tokenize,
+)
+
+
+@pytest.fixture(name="index")
+def index_fixture() -> MessageSearchIndex:
+    index = MessageSearchIndex()
+    index.add_message("chat", "LoyalFan", "Great stream tonight!", timestamp=1.0)
+    index.add_message("chat", "Viewer2", "When is the next stream?", timestamp=2.0)
+    index.add_message(
+        "private_message",
+        "VIPFan",
+        "Are you available for a private show?",
+        to_user="alice",
+        timestamp=3.0,
+    )
+    index.add_message(
+        "private_message",
+        "SecretAdmirer",
+        "Can we chat privately?",
+        to_user="bob",
+        timestamp=4.0,
+    )
+    return index
+
+
+def test_tokenize_lowercases_and_strips_punctuation() -> None:
+    assert tokenize("Hello, World! 😍 it's") == ["hello", "world", "it", "s"]
+
+
+def test_postings_round_trip() -> None:
+    doc_ids = [0, 1, 5, 200, 70000, 70001]
+    encoded = encode_postings(doc_ids)
+    assert len(encoded) < len(doc_ids) * 4
+    assert list(decode_postings(encoded)) == doc_ids
+
+
+def test_search_requires_all_tokens(index: MessageSearchIndex) -> None:
+    results = index.search("next stream", scopes=[PUBLIC_SCOPE])
+    assert [r["from_user"] for r in results] == ["Viewer2"]
+
+
+def test_search_prefix_matches_last_token(index: MessageSearchIndex) -> None:
+    results = index.search("privat", scopes=["alice", "bob"], prefix=False)
+    assert {r["from_user"] for r in results} == {"VIPFan", "SecretAdmirer"}
+
+    assert index.search("privat show", scopes=["alice"], prefix=False) == []
+
+
+def test_search_is_scoped_per_user(index: MessageSearchIndex) -> None:
+    results = index.search("private", scopes=["alice", PUBLIC_SCOPE])
+    assert [r["from_user"] for r in results] == ["VIPFan"]
+
+
+def test_search_ranks_exact_above_prefix(index: MessageSearchIndex) -> None:
+    index.add_message("chat", "Fan", "stream", timestamp=0.5)
+    index.add_message("chat", "Fan", "streaming now", timestamp=10.0)
+    results = index.search("stream", scopes=[PUBLIC_SCOPE])
+    assert results[-1]["message"] == "streaming now"
+    assert results[0]["timestamp"] > results[1]["timestamp"]
+
+
+def test_search_filters_kind_and_sender(index: MessageSearchIndex) -> None:
+    scopes = ["alice", "bob", PUBLIC_SCOPE]
+    assert index.search("chat", scopes=scopes, kinds=["chat"]) == []
+    results = index.search("chat", scopes=scopes, from_user="SecretAdmirer")
+    assert len(results) == 1
+
+
+def test_save_and_load(tmp_path, index: MessageSearchIndex) -> None:
+    index.path = str(tmp_path / "index.bin")
+    index.save()
+
+    reloaded = MessageSearchIndex(path=index.path)
+    assert len(reloaded) == len(index)
+    assert reloaded.search("stream", scopes=[PUBLIC_SCOPE]) == index.search(
+        "stream", scopes=[PUBLIC_SCOPE]
+    )
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_autosave(tmp_path) -> None:
+    path = tmp_path / "index.bin"
+    index = MessageSearchIndex(path=str(path), autosave_every=2)
+    index.add_message("chat", "Fan", "hello")
+    time.sleep(0.05)
+    assert not path.exists()
+    index.add_message("chat", "Fan", "hello again")
+    assert wait_for(path.exists)
+    assert len(MessageSearchIndex(path=str(path))) == 2
+
+
+def test_snapshots_do_not_block_ingest(tmp_path) -> None:
+    index = MessageSearchIndex(path=str(tmp_path / "index.bin"), autosave_every=1)
+    writing, release = threading.Event(), threading.Event()
+    write_snapshot = index._write_snapshot
+
+    def slow_write(*args) -> None:
+        writing.set()
+        release.wait(5)
+        write_snapshot(*args)
+
+    index._write_snapshot = slow_write
+    index.add_message("chat", "Fan", "first")
+    assert writing.wait(2)
+
+    # The saver is mid-write; ingest and search still go through
+    for n in range(10):
+        index.add_message("chat", "Fan", f"message {n}")
+    assert len(index.search("message", scopes=[PUBLIC_SCOPE], limit=50)) == 10
+
+    release.set()
+    assert wait_for(lambda: index._unsaved == 0 and not index._save_requested.is_set())
+    index.save()
+    assert len(MessageSearchIndex(path=index.path)) == 11
+
+
+def test_oldest_documents_are_compacted_away(tmp_path) -> None:
+    index = MessageSearchIndex(max_documents=4)
+    for n in range(6):
+        index.add_message("chat", "Fan", f"word{n} common", timestamp=float(n))
+
+    assert len(index) == 4
+    assert index.search("word0", scopes=[PUBLIC_SCOPE], prefix=False) == []
+    assert "word0" not in index._vocabulary
+    results = index.search("common", scopes=[PUBLIC_SCOPE])
+    assert [r["message"] for r in results] == [f"word{n} common" for n in (5, 4, 3, 2)]
+    assert sorted(r["doc_id"] for r in results) == [0, 1, 2, 3]
+
+    index.path = str(tmp_path / "index.bin")
+    index.save()
+    reloaded = MessageSearchIndex(path=index.path)
+    assert reloaded.search("word5", scopes=[PUBLIC_SCOPE]) == index.search(
+        "word5", scopes=[PUBLIC_SCOPE]
+    )
@@ -0,0 +1,228 @@
+import logging
+import threading
+import time
+from bisect import insort
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Inbox reads only look back this far, so older tombstones no longer affect stats
+STATS_WINDOW_SECONDS = 30 * 24 * 3600
+
+# Upper bound on staleness for deletes made by other workers
+RELOAD_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class Tombstone:
+    """A deleted private message.
+
+    Attributes:
+        message_id: The deleted message ID
+        from_user: Sender of the deleted message
+        message_time: Unix timestamp of the deleted message
+        was_unread: Whether the message was still unread when deleted
+    """
+
+    message_id: str
+    from_user: str
+    message_time: float
+    was_unread: bool
+
+
+@dataclass
+class _UserTombstones:
+    by_id: Dict[str, Tombstone] = field(default_factory=dict)
+    by_time: List[Tuple[float, str]] = field(default_factory=list)
+    unread_by_sender: Dict[str, int] = field(default_factory=dict)
+    deleted_total: int = 0
+    deleted_unread: int = 0
+    loaded_at: Optional[float] = None
+
+
+class MessageTombstoneStore:
+    """In-memory set of deleted message IDs per user.
+
+    The durable copy lives in InfluxDB as ``privateMessage_deleted`` markers;
+    each user's set is warmed from those markers through a loader callable
+    the first time that user is read, and merged with them again once it is
+    ``reload_seconds`` old, so deletes made by other workers show up. In
+    between, every membership check is a dict lookup and the deleted/unread
+    counters used to correct inbox stats are updated incrementally on each
+    delete.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int = STATS_WINDOW_SECONDS,
+        reload_seconds: float = RELOAD_SECONDS,
+    ) -> None:
+        """Initialize an empty tombstone store.
+
+        Args:
+            window_seconds: Age after which tombstones stop adjusting stats
+            reload_seconds: Age after which a user's set is reloaded
+        """
+        self.window_seconds = window_seconds
+        self.reload_seconds = reload_seconds
+        self._users: Dict[str, _UserTombstones] = {}
+        self._lock = threading.Lock()
+
+    def ensure_loaded(
+        self, username: str, loader: Callable[[str], Iterable[Tombstone]]
+    ) -> None:
+        """Load a user's tombstones from durable storage if not fresh.
+
+        Deletes are permanent, so loaded tombstones are merged into the set
+        rather than replacing it; deletes recorded here meanwhile are kept.
+
+        Args:
+            username: The recipient whose tombstones to load
+            loader: Callable returning the user's persisted tombstones
+        """
+        entry = self._users.get(username)
+        if entry is not None and self._is_fresh(entry):
+            return
+
+        tombstones = list(loader(username))
+        with self._lock:
+            entry = self._users.setdefault(username, _UserTombstones())
+            for tombstone in tombstones:
+                self._add_locked(entry, tombstone)
+            entry.loaded_at = time.monotonic()
+
+        logger.debug(f"Loaded {len(tombstones)} tombstones for user {username}")
+
+    def _is_fresh(self, entry: _UserTombstones) -> bool:
+        return (
+            entry.loaded_at is not None
+            and time.monotonic() - entry.loaded_at < self.reload_seconds
+        )
+
+    def add(self, username: str, tombstone: Tombstone) -> bool:
+        """Record a deleted message.
+
+        Args:
+            username: The recipient who deleted the message
+            tombstone: The deleted message
+
+        Returns:
+            False if the message was already deleted
+        """
+        with self._lock:
+            entry = self._users.setdefault(username, _UserTombstones())
+            return self._add_locked(entry, tombstone)
+
+    def _add_locked(self, entry: _UserTombstones, tombstone: Tombstone) -> bool:
+        if tombstone.message_id in entry.by_id:
+            return False
+
+        entry.by_id[tombstone.message_id] = tombstone
+        insort(entry.by_time, (tombstone.message_time, tombstone.message_id))
+        entry.deleted_total += 1
+        if tombstone.was_unread:
+            entry.deleted_unread += 1
+            entry.unread_by_sender[tombstone.from_user] = (
+                entry.unread_by_sender.get(tombstone.from_user, 0) + 1
+            )
+        return True
+
+    def _expire_locked(self, entry: _UserTombstones) -> None:
+        """Drop tombstones whose messages fell out of the stats window."""
+        cutoff = time.time() - self.window_seconds
+        expired = 0
+        for message_time, message_id in entry.by_time:
+            if message_time >= cutoff:
+                break
+            tombstone = entry.by_id.pop(message_id)
+            entry.deleted_total -= 1
+            if tombstone.was_unread:
+                entry.deleted_unread -= 1
+                entry.unread_by_sender[tombstone.from_user] -= 1
+            expired += 1
+        if expired:
+            del entry.by_time[:expired]
+
+    def is_deleted(self, username: str, message_id: str) -> bool:
+        """Check whether a message has been deleted by a user.
+
+        Args:
+            username: The recipient
+            message_id: The message ID
+
+        Returns:
+            True if the message is tombstoned
+        """
+        entry = self._users.get(username)
+        return entry is not None and message_id in entry.by_id
+
+    def count(self, username: str) -> int:
+        """Number of tombstones currently held for a user."""
+        entry = self._users.get(username)
+        return len(entry.by_id) if entry else 0
+
+    def max_per_sender(self, username: str) -> int:
+        """Largest number of deleted messages from any single sender."""
+        entry = self._users.get(username)
+        if not entry or not entry.by_id:
+            return 0
+        per_sender: Dict[str, int] = {}
+        for tombstone in entry.by_id.values():
+            per_sender[tombstone.from_user] = per_sender.get(tombstone.from_user, 0) + 1
+        return max(per_sender.values())
+
+    def filter_messages(self, username: str, messages: List[Dict]) -> List[Dict]:
+        """Remove deleted messages from a list of message dictionaries.
+
+        Args:
+            username: The recipient
+            messages: Messages with an "id" key
+
+        Returns:
+            The messages that have not been deleted
+        """
+        entry = self._users.get(username)
+        if not entry or not entry.by_id:
+            return messages
+        deleted = entry.by_id
+        return [message for message in messages if message["id"] not in deleted]
+
+    def deleted_counts(self, username: str) -> Tuple[int, int]:
+        """Deleted message counts within the stats window.
+
+        Args:
+            username: The recipient
+
+        Returns:
+            Tuple of (deleted_total, deleted_unread)
+        """
+        with self._lock:
+            entry = self._users.get(username)
+            if not entry:
+                return 0, 0
+            self._expire_locked(entry)
+            return entry.deleted_total, entry.deleted_unread
+
+    def deleted_unread_from(self, username: str, from_user: str) -> int:
+        """Number of unread messages from a sender that the user deleted."""
+        with self._lock:
+            entry = self._users.get(username)
+            if not entry:
+                return 0
+            self._expire_locked(entry)
+            return entry.unread_by_sender.get(from_user, 0)
+
+
+_store: Optional[MessageTombstoneStore] = None
+_store_lock = threading.Lock()
+
+
+def get_tombstone_store() -> MessageTombstoneStore:
+    """Get the process-wide message tombstone store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = MessageTombstoneStore()
+    return _store
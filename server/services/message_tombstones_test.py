@@ -0,0 +1,93 @@
+import time
+
+from server.services import message_tombstones
+from server.services.message_tombstones import MessageTombstoneStore, Tombstone
+
+
+def make_tombstone(message_id: str, from_user: str = "VIPFan", **kwargs) -> Tombstone:
+    return Tombstone(
+        message_id=message_id,
+        from_user=from_user,
+        message_time=kwargs.get("message_time", time.time()),
+        was_unread=kwargs.get("was_unread", True),
+    )
+
+
+def test_filter_messages_drops_deleted() -> None:
+    store = MessageTombstoneStore()
+    store.add("alice", make_tombstone("t1_VIPFan"))
+
+    messages = [{"id": "t1_VIPFan"}, {"id": "t2_VIPFan"}]
+    assert store.filter_messages("alice", messages) == [{"id": "t2_VIPFan"}]
+    assert store.filter_messages("bob", messages) == messages
+
+
+def test_counts_are_incremental_and_idempotent() -> None:
+    store = MessageTombstoneStore()
+    assert store.add("alice", make_tombstone("t1_VIPFan"))
+    assert not store.add("alice", make_tombstone("t1_VIPFan"))
+    store.add("alice", make_tombstone("t2_WhaleKing", "WhaleKing", was_unread=False))
+
+    assert store.deleted_counts("alice") == (2, 1)
+    assert store.deleted_unread_from("alice", "VIPFan") == 1
+    assert store.deleted_unread_from("alice", "WhaleKing") == 0
+    assert store.max_per_sender("alice") == 1
+
+
+def test_tombstones_expire_from_stats_window() -> None:
+    store = MessageTombstoneStore(window_seconds=60)
+    store.add("alice", make_tombstone("old_VIPFan", message_time=time.time() - 120))
+    store.add("alice", make_tombstone("new_VIPFan"))
+
+    assert store.deleted_counts("alice") == (1, 1)
+    assert not store.is_deleted("alice", "old_VIPFan")
+    assert store.is_deleted("alice", "new_VIPFan")
+
+
+def test_ensure_loaded_calls_loader_once() -> None:
+    store = MessageTombstoneStore()
+    calls = []
+
+    def loader(username):
+        calls.append(username)
+        return [make_tombstone("t1_VIPFan")]
+
+    store.ensure_loaded("alice", loader)
+    store.ensure_loaded("alice", loader)
+
+    assert calls == ["alice"]
+    assert store.is_deleted("alice", "t1_VIPFan")
+
+
+def test_deletes_by_another_worker_show_up_after_a_reload(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(message_tombstones.time, "monotonic", lambda: now[0])
+    # The InfluxDB markers both workers load from
+    markers = []
+    worker_a = MessageTombstoneStore(reload_seconds=30)
+    worker_b = MessageTombstoneStore(reload_seconds=30)
+    for store in (worker_a, worker_b):
+        store.ensure_loaded("alice", lambda username: list(markers))
+
+    tombstone = make_tombstone("t1_VIPFan")
+    markers.append(tombstone)
+    worker_a.add("alice", tombstone)
+
+    worker_b.ensure_loaded("alice", lambda username: list(markers))
+    assert not worker_b.is_deleted("alice", "t1_VIPFan")
+
+    now[0] += 31
+    worker_b.add("alice", make_tombstone("t2_VIPFan"))
+    worker_b.ensure_loaded("alice", lambda username: list(markers))
+    assert worker_b.is_deleted("alice", "t1_VIPFan")
+    assert worker_b.is_deleted("alice", "t2_VIPFan")
+    assert worker_b.deleted_counts("alice") == (2, 2)
+
+
+def test_tombstones_added_before_the_first_load_do_not_skip_it() -> None:
+    store = MessageTombstoneStore()
+    store.add("alice", make_tombstone("t2_VIPFan"))
+    store.ensure_loaded("alice", lambda username: [make_tombstone("t1_VIPFan")])
+
+    assert store.is_deleted("alice", "t1_VIPFan")
+    assert store.deleted_counts("alice") == (2, 2)
@@ -51,6 +51,7 @@ document.addEventListener('DOMContentLoaded', function() {
         loadingUserInfo: false,
         websocket: null,
         refreshDebounceTimer: null,
+        lastEventSeq: 0,
         activeTab: 'messages',
         onlineUsers: 0,
         currentRank: null,
@@ -347,17 +348,40 @@ document.addEventListener('DOMContentLoaded', function() {
 
           // Create SocketIO connection to our backend
           const serverUrl = `${window.location.protocol}//${window.location.hostname}:5000`;
-          this.websocket = window.io(`${serverUrl}/chaturbate`);
+          // Authenticated clients also join their own room for private messages;
+          // public events arrive as micro-batched chaturbate_events frames,
+          // pre-encoded once on the server as binary JSON, and are acknowledged
+          // so the server can hold back (and drop chat) if we fall behind
+          const token = await this.getAuthToken();
+          const auth = { batch: true, encoding: 'json', ack: true };
+          if (token) {
+            auth.token = token;
+          }
+          // Reconnects resume from the last event seen via the server's snapshot
+          this.websocket = window.io(`${serverUrl}/chaturbate`, {
+            auth: (cb) => cb({ ...auth, since: this.lastEventSeq })
+          });
+          const textDecoder = new TextDecoder();
+          const decode = (buffer) => JSON.parse(textDecoder.decode(buffer));
           
           this.websocket.on('connect', () => {
             this.isAttached = true;
             this.addEvent('system', 'Connected to Chaturbate');
             console.log('Connected to Chaturbate WebSocket');
-            // Load initial data from InfluxDB
-            this.refreshInfluxData();
+            // Load initial data from InfluxDB; reconnects are caught up by the snapshot
+            if (!this.lastEventSeq) {
+              this.refreshInfluxData();
+            }
           });
           
-          this.websocket.on('chaturbate_event', (data) => {
+          const trackSeq = (data) => {
+            if (data.seq > this.lastEventSeq) {
+              this.lastEventSeq = data.seq;
+            }
+          };
+
+          const onChaturbateEvent = (data) => {
+            trackSeq(data);
             this.handleChaturbateEvent(data);
             // Refresh InfluxDB data periodically when receiving tip events (but not chat to avoid spam)
             if (this.isAttached && data.type === 'tip') {
@@ -367,6 +391,16 @@ document.addEventListener('DOMContentLoaded', function() {
                 this.refreshInfluxData();
               }, 2000);
             }
+          };
+
+          this.websocket.on('chaturbate_event', (buffer, ack) => {
+            onChaturbateEvent(decode(buffer));
+            if (ack) ack();
+          });
+
+          this.websocket.on('chaturbate_events', (buffer, ack) => {
+            decode(buffer).forEach(onChaturbateEvent);
+            if (ack) ack();
           });
 
           this.websocket.on('chaturbate_status', (data) => {
@@ -377,8 +411,23 @@ document.addEventListener('DOMContentLoaded', function() {
             this.addEvent('error', `Chaturbate error: ${data.error}`);
           });
 
-          this.websocket.on('private_message', (data) => {
+          this.websocket.on('private_message', (buffer, ack) => {
+            const data = decode(buffer);
+            trackSeq(data);
             this.handlePrivateMessage(data);
+            if (ack) ack();
+          });
+
+          this.websocket.on('event_snapshot', (buffer) => {
+            const snapshot = decode(buffer);
+            snapshot.events.forEach((event) => {
+              if (event.name === 'private_message') {
+                this.handlePrivateMessage(event.data);
+              } else {
+                this.handleChaturbateEvent(event.data);
+              }
+            });
+            this.lastEventSeq = snapshot.last_seq;
           });
           
           this.websocket.on('disconnect', () => {